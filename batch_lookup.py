@@ -0,0 +1,119 @@
+"""Headless batch lookup of UniProt accessions in MongoDB and Neo4j.
+
+Reads accessions from files or stdin ("-"), one per line or separated by
+spaces, commas or semicolons; "#" starts a comment. They are upper-cased and
+grouped into batches of ``--batch-size``. protein_query.lookup_batch resolves
+each batch with one ``find({"Entry": {"$in": [...]}})`` on MongoDB and one
+``UNWIND $ids`` query on Neo4j. ``--workers`` batches are in flight at once
+over the pooled clients from connections.py.
+
+Results are streamed as JSON lines in input order, one per accession:
+
+    {"entry": "P12345", "found": true, "mongo": {...} or null, "neo4j": {...} or null}
+
+Progress and the final records/sec go to stderr, so stdout can be piped.
+
+Usage:
+    python batch_lookup.py accessions.txt --output annotated.jsonl
+    cut -f1 hits.tsv | python batch_lookup.py - --batch-size 500 --workers 8 --neighbours 10
+    python batch_lookup.py accessions.txt --backends mongo --mongomock data/cleaned_mongodb.csv
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import connections
+from protein_query import BACKEND_NAMES, lookup_batch
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_WORKERS = 4
+PROGRESS_SECONDS = 5.0
+SEPARATORS = re.compile(r"[\s,;]+")
+
+
+def read_accessions(paths):
+    """Yield upper-cased accessions from the given files, "-" meaning stdin."""
+    for path in paths:
+        file = sys.stdin if path == "-" else open(path)
+        try:
+            for line in file:
+                for token in SEPARATORS.split(line.split("#", 1)[0]):
+                    if token:
+                        yield token.upper()
+        finally:
+            if file is not sys.stdin:
+                file.close()
+
+
+def batched(items, batch_size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def run_batches(batches, lookup, workers):
+    """Yield each batch's records in input order, with up to 2 * workers batches in flight."""
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lookup") as pool:
+        for batch in batches:
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+            pending.append(pool.submit(lookup, batch))
+        while pending:
+            yield pending.popleft().result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Look up many accessions in MongoDB and Neo4j.")
+    parser.add_argument("inputs", nargs="*", default=["-"], help="accession files, '-' for stdin (default)")
+    parser.add_argument("--output", help="JSON-lines output file (default stdout)")
+    parser.add_argument("--backends", nargs="+", choices=BACKEND_NAMES, default=list(BACKEND_NAMES))
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="batches in flight")
+    parser.add_argument("--neighbours", type=int, default=0,
+                        help="also return each protein's top-N neighbours from Neo4j")
+    parser.add_argument("--mongomock", metavar="CSV",
+                        help="load this cleaned CSV into mongomock instead of using the server")
+    args = parser.parse_args()
+
+    collection = None
+    if args.mongomock:
+        import mongomock
+        from mongo_loader import load
+        collection = mongomock.MongoClient()["NoSQLProj"]["MoodleDB"]
+        load(collection, args.mongomock, writers=1)
+    lookup = partial(lookup_batch, backends=args.backends, neighbours=args.neighbours, collection=collection)
+
+    output = open(args.output, "w") if args.output else sys.stdout
+    records = found = 0
+    start = last_report = time.perf_counter()
+    try:
+        for batch in run_batches(batched(read_accessions(args.inputs), args.batch_size), lookup, args.workers):
+            output.write("".join(json.dumps(record, default=str) + "\n" for record in batch))
+            records += len(batch)
+            found += sum(record["found"] for record in batch)
+            now = time.perf_counter()
+            if now - last_report >= PROGRESS_SECONDS:
+                print(f"{records} records, {records / (now - start):.0f}/sec", file=sys.stderr)
+                last_report = now
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        connections.close_all()
+    elapsed = time.perf_counter() - start
+    print(f"{records} records ({found} found) in {elapsed:.2f}s, {records / max(elapsed, 1e-9):.0f} records/sec",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Latency of a repeated-query workload with per-call vs pooled connections.
+
+"per-call" reproduces the old GUI behaviour: a new MongoClient and a new Neo4j
+driver for every query. "pooled" goes through connections.py. Needs the
+MongoDB and Neo4j servers configured in connections.py.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_connections --queries 50 --entry A0A075F5C6
+"""
+import argparse
+import statistics
+import time
+
+from neo4j import GraphDatabase
+from pymongo import MongoClient
+
+import connections
+
+NEO4J_QUERY = "MATCH (n {entry: $query}) RETURN n LIMIT 1"
+
+
+def mongo_per_call(entry):
+    client = MongoClient(connections.MONGO_URI)
+    client[connections.MONGO_DATABASE][connections.MONGO_COLLECTION].find_one({"Entry": entry})
+    client.close()
+
+
+def mongo_pooled(entry):
+    connections.get_mongo_collection().find_one({"Entry": entry})
+
+
+def neo4j_per_call(entry):
+    driver = GraphDatabase.driver(connections.NEO4J_URI, auth=connections.NEO4J_AUTH)
+    with driver.session() as session:
+        session.run(NEO4J_QUERY, query=entry).consume()
+    driver.close()
+
+
+def neo4j_pooled(entry):
+    with connections.get_neo4j_driver().session() as session:
+        session.run(NEO4J_QUERY, query=entry).consume()
+
+
+def measure(function, entry, queries):
+    """Return per-query latencies in milliseconds."""
+    latencies = []
+    for _ in range(queries):
+        start = time.perf_counter()
+        function(entry)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-call and pooled connection latency.")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--entry", default="A0A075F5C6")
+    args = parser.parse_args()
+
+    print(connections.warm_up())
+    print(f"{'workload':>16} {'mean ms':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    for name, function in [("mongo per-call", mongo_per_call), ("mongo pooled", mongo_pooled),
+                           ("neo4j per-call", neo4j_per_call), ("neo4j pooled", neo4j_pooled)]:
+        try:
+            latencies = sorted(measure(function, args.entry, args.queries))
+        except Exception as e:
+            print(f"{name:>16} failed - {e}")
+            continue
+        p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+        print(f"{name:>16} {statistics.mean(latencies):>9.2f} {statistics.median(latencies):>8.2f} {p95:>8.2f}")
+    connections.close_all()
+
+
+if __name__ == "__main__":
+    main()
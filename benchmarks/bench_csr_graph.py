@@ -0,0 +1,100 @@
+"""Ego-network latency of the embedded CSR graph, optionally against Neo4j.
+
+Opens a graph built by ``csr_graph.py build`` and times, over a random sample
+of proteins:
+
+* top-k neighbours (a slice of the weight-sorted row)
+* a weight-range lookup (two binary searches)
+* the 1-hop and 2-hop ego networks the graph panel draws
+
+It also reports resident memory after opening and after the queries. With
+``--neo4j``, the same ego networks are fetched through
+neo4j_search.fetch_neighbourhood from the server configured in
+connections.py.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_csr_graph data/edges2.csr --samples 200 --top-k 50
+    python -m benchmarks.bench_csr_graph data/edges2.csr --neo4j
+"""
+import argparse
+import mmap
+import random
+import statistics
+import time
+
+from csr_graph import CSRGraph
+from preprocess import peak_memory_mb
+
+
+def resident_mb():
+    """Current resident set size, falling back to the peak where /proc is missing.
+
+    Returns None where neither is available (see preprocess.peak_memory_mb).
+    """
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * mmap.PAGESIZE / 1e6
+    except OSError:
+        return peak_memory_mb()
+
+
+def resident_growth(before):
+    after = resident_mb()
+    return f"+{after - before:.1f} MB" if before is not None and after is not None else "n/a"
+
+
+def timed(function, entries):
+    latencies = []
+    for entry in entries:
+        start = time.perf_counter()
+        function(entry)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    return sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ego-network queries on the CSR graph.")
+    parser.add_argument("graph")
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=50)
+    parser.add_argument("--min-weight", type=float, default=0.0)
+    parser.add_argument("--max-edges", type=int, default=500)
+    parser.add_argument("--neo4j", action="store_true", help="also time the same queries on Neo4j")
+    args = parser.parse_args()
+
+    before = resident_mb()
+    start = time.perf_counter()
+    graph = CSRGraph(args.graph)
+    print(f"Opened {len(graph)} proteins in {(time.perf_counter() - start) * 1000:.1f} ms, "
+          f"resident {resident_growth(before)}")
+
+    random.seed(0)
+    ids = random.sample(range(len(graph)), min(args.samples, len(graph)))
+    entries = [graph.entry(i) for i in ids]
+    runs = [
+        ("top-k neighbours", lambda e: graph.neighbours(graph.node_id(e), top_k=args.top_k)),
+        ("weight range", lambda e: graph.neighbours(graph.node_id(e), args.min_weight, 0.95)),
+        ("ego 1 hop", lambda e: graph.ego_network(e, args.min_weight, args.top_k, 1, args.max_edges)),
+        ("ego 2 hops", lambda e: graph.ego_network(e, args.min_weight, args.top_k, 2, args.max_edges)),
+    ]
+    if args.neo4j:
+        import connections
+        from neo4j_search import fetch_neighbourhood
+        session = connections.get_neo4j_driver().session()
+        for hops in (1, 2):
+            runs.append((f"neo4j ego {hops} hop", lambda e, hops=hops: fetch_neighbourhood(
+                session, e, args.min_weight, args.top_k, hops, args.max_edges)))
+
+    print(f"{'query':>18} {'mean us':>10} {'p50 us':>10} {'p95 us':>10}")
+    for name, function in runs:
+        latencies = timed(function, entries)
+        p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+        print(f"{name:>18} {statistics.mean(latencies):>10.0f} {statistics.median(latencies):>10.0f} {p95:>10.0f}")
+    print(f"Resident after queries: {resident_growth(before)}")
+    if args.neo4j:
+        session.close()
+        connections.close_all()
+
+
+if __name__ == "__main__":
+    main()
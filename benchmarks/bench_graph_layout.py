@@ -0,0 +1,94 @@
+"""Layout and render time of the graph panel for 50, 500 and 5,000 edges.
+
+Compares the old draw_graph path (networkx Kamada-Kawai, networkx drawing
+with a text artist per node and edge label) against graph_layout.py
+(vectorised force layout, collections and level-of-detail labels). Rendering
+goes to an off-screen Agg canvas, so no display is needed.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_graph_layout --edges 50 500 5000 --legacy-max-nodes 1000
+"""
+import argparse
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import networkx as nx
+import numpy as np
+
+from graph_layout import GraphRenderer, compute_layout, graph_arrays
+
+
+def synthetic_graph(n_edges, seed=0):
+    """A connected random graph with about three edges per node, as GUI tuples."""
+    rng = np.random.default_rng(seed)
+    n_nodes = max(10, n_edges // 3)
+    pairs = {(int(rng.integers(i)), i) for i in range(1, n_nodes)}
+    while len(pairs) < n_edges:
+        a, b = sorted(rng.integers(n_nodes, size=2).tolist())
+        if a != b:
+            pairs.add((a, b))
+    nodes = {(f"P{i:05d}", f"P{i:05d}_HUMAN") for i in range(n_nodes)}
+    edges = [(f"P{a:05d}", f"P{b:05d}", round(float(rng.uniform(0.8, 1.0)), 3)) for a, b in sorted(pairs)]
+    return nodes, edges
+
+
+def legacy(nodes, edges):
+    """The previous draw_graph: returns (layout seconds, render seconds)."""
+    G = nx.DiGraph()
+    for node in nodes:
+        G.add_node(node[0], label=node[1])
+    for edge in edges:
+        G.add_edge(edge[0], edge[1], weight=edge[2])
+    start = time.perf_counter()
+    pos = nx.kamada_kawai_layout(G)
+    layout_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fig, ax = plt.subplots(figsize=(8, 6))
+    nx.draw_networkx_nodes(G, pos, ax=ax, node_size=500, node_color="skyblue", alpha=0.8)
+    nx.draw_networkx_edges(G, pos, ax=ax, arrowstyle="->", arrowsize=10, edge_color="gray", alpha=0.7)
+    nx.draw_networkx_labels(G, pos, ax=ax, labels={n: n for n in G.nodes}, font_size=8)
+    nx.draw_networkx_edge_labels(G, pos, edge_labels=nx.get_edge_attributes(G, "weight"), ax=ax, font_size=6)
+    ax.axis("off")
+    fig.canvas.draw()
+    plt.close(fig)
+    return layout_seconds, time.perf_counter() - start
+
+
+def current(nodes, edges):
+    """graph_layout.py: returns (layout seconds, render seconds)."""
+    start = time.perf_counter()
+    entries, sources, targets, weights = graph_arrays(nodes, edges)
+    positions = compute_layout(len(entries), sources, targets, weights)
+    layout_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fig, ax = plt.subplots(figsize=(8, 6))
+    GraphRenderer(ax).draw(entries, positions, sources, targets, weights)
+    fig.canvas.draw()
+    plt.close(fig)
+    return layout_seconds, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark graph layout and rendering.")
+    parser.add_argument("--edges", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--legacy-max-nodes", type=int, default=1000,
+                        help="skip the Kamada-Kawai path above this many nodes")
+    args = parser.parse_args()
+
+    print(f"{'edges':>6} {'nodes':>6} {'path':>8} {'layout s':>9} {'render s':>9}")
+    for n_edges in args.edges:
+        nodes, edges = synthetic_graph(n_edges)
+        runs = [("current", current)]
+        if len(nodes) <= args.legacy_max_nodes:
+            runs.insert(0, ("legacy", legacy))
+        for name, function in runs:
+            layout_seconds, render_seconds = function(nodes, edges)
+            print(f"{len(edges):>6} {len(nodes):>6} {name:>8} {layout_seconds:>9.3f} {render_seconds:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
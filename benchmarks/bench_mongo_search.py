@@ -0,0 +1,79 @@
+"""Per-tier latency of mongo_search against the legacy regex query.
+
+Samples proteins from the collection and builds one query per tier from each:
+the accession (exact), the first letters of the entry name (prefix), a word of
+the protein name (text) and a lower-case substring of the entry name that the
+legacy regex needs a scan for. Every tier and the legacy ``$or`` regex are timed
+on the same queries.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_mongo_search --samples 200
+    python -m benchmarks.bench_mongo_search --mongomock data/cleaned_mongodb.csv
+"""
+import argparse
+import random
+import statistics
+import time
+
+import connections
+from mongo_search import run_tier
+
+
+def sample_queries(collection, samples, seed=0):
+    """Return {tier: [query, ...]} built from random documents."""
+    documents = list(collection.find({}, {"Entry": 1, "Entry Name": 1, "Protein names": 1}))
+    random.Random(seed).shuffle(documents)
+    queries = {"exact": [], "prefix": [], "text": [], "scan": []}
+    for document in documents[:samples]:
+        entry_name = document.get("Entry Name", "")
+        queries["exact"].append(document["Entry"])
+        queries["prefix"].append(entry_name[:max(3, len(entry_name) // 2)].lower())
+        words = [w for w in str(document.get("Protein names", "")).split() if len(w) > 3]
+        queries["text"].append(words[0] if words else entry_name)
+        queries["scan"].append(entry_name[2:-2].lower())
+    return queries
+
+
+def time_tier(collection, tier, queries):
+    latencies, hits = [], 0
+    for query in queries:
+        start = time.perf_counter()
+        hits += run_tier(collection, tier, query) is not None
+        latencies.append((time.perf_counter() - start) * 1000)
+    return sorted(latencies), hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Mongo search tiers.")
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--mongomock", metavar="CSV",
+                        help="load this cleaned CSV into mongomock instead of using the server "
+                             "(mongomock has no $text support, so that tier is skipped)")
+    args = parser.parse_args()
+
+    if args.mongomock:
+        import mongomock
+        from mongo_loader import load
+        collection = mongomock.MongoClient()["NoSQLProj"]["MoodleDB"]
+        load(collection, args.mongomock, writers=1)
+    else:
+        collection = connections.get_mongo_collection()
+
+    queries = sample_queries(collection, args.samples)
+    print(f"{collection.estimated_document_count()} documents, {args.samples} queries per tier")
+    print(f"{'tier':>8} {'query set':>10} {'hits':>6} {'mean ms':>9} {'p50 ms':>8} {'p95 ms':>8}")
+    runs = [(tier, tier) for tier in queries] + [("scan", tier) for tier in ("exact", "prefix", "text")]
+    for tier, query_set in runs:
+        try:
+            latencies, hits = time_tier(collection, tier, queries[query_set])
+        except Exception as e:
+            print(f"{tier:>8} {query_set:>10} failed - {str(e).splitlines()[0]}")
+            continue
+        p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+        print(f"{tier:>8} {query_set:>10} {hits:>6} {statistics.mean(latencies):>9.2f} "
+              f"{statistics.median(latencies):>8.2f} {p95:>8.2f}")
+    connections.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Latency of the indexed Neo4j lookups against the old regex queries.
+
+For a random sample of proteins, times:
+
+* legacy text lookup: the unlabelled ``=~ '(?i).*q.*'`` query query_neo4j used
+* exact lookup by entry and full-text lookup by gene name (neo4j_search.find_node)
+* legacy neighbourhood query (unlabelled ``MATCH (n) WHERE n.entry = $query``)
+  and the same query with labels (NEIGHBOURHOOD_QUERY)
+
+Needs the Neo4j server configured in connections.py, loaded by neo4j_loader.py.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_neo4j_search --samples 50
+"""
+import argparse
+import statistics
+import time
+
+import connections
+from neo4j_search import LABEL, find_node
+
+LEGACY_QUERY = """
+MATCH (n)
+WHERE n.entry =~ '(?i).*' + $query + '.*'
+      OR n.entryName =~ '(?i).*' + $query + '.*'
+      OR n.geneName =~ '(?i).*' + $query + '.*'
+      OR n.proteinNames =~ '(?i).*' + $query + '.*'
+RETURN n LIMIT 1
+"""
+LEGACY_GRAPH_QUERY = """
+MATCH (n)
+WHERE n.entry = $query
+WITH n
+MATCH (n)-[r1]-(b)
+WITH n, COLLECT(b) AS neighbors
+UNWIND neighbors AS b
+MATCH (b)-[r]-(c)
+WHERE c IN neighbors OR c = n
+RETURN DISTINCT n, r, b, c LIMIT 500
+"""
+NEIGHBOURHOOD_QUERY = f"""
+MATCH (n:{LABEL} {{entry: $entry}})
+MATCH (n)-[]-(b:{LABEL})
+WITH n, COLLECT(DISTINCT b) AS neighbors
+UNWIND neighbors AS b
+MATCH (b)-[r]-(c:{LABEL})
+WHERE c IN neighbors OR c = n
+RETURN DISTINCT n, r, b, c LIMIT 500
+"""
+SAMPLE_QUERY = f"""
+MATCH (p:{LABEL})
+WITH p, rand() AS r ORDER BY r LIMIT $samples
+RETURN p.entry AS entry, p.geneName AS gene
+"""
+
+
+def timed(function, queries):
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        function(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare indexed and regex Neo4j lookups.")
+    parser.add_argument("--samples", type=int, default=50)
+    args = parser.parse_args()
+
+    with connections.get_neo4j_driver().session() as session:
+        sample = session.run(SAMPLE_QUERY, samples=args.samples).data()
+        entries = [row["entry"] for row in sample]
+        genes = [row["gene"] for row in sample if row["gene"] and row["gene"] != "Unknown"]
+
+        runs = [
+            ("legacy regex (entry)", lambda q: session.run(LEGACY_QUERY, query=q).consume(), entries),
+            ("legacy regex (gene)", lambda q: session.run(LEGACY_QUERY, query=q).consume(), genes),
+            ("exact entry", lambda q: find_node(session, q), entries),
+            ("full-text (gene)", lambda q: find_node(session, q), genes),
+            ("legacy neighbourhood", lambda q: session.run(LEGACY_GRAPH_QUERY, query=q).consume(), entries),
+            ("labelled neighbourhood", lambda q: session.run(NEIGHBOURHOOD_QUERY, entry=q).consume(), entries),
+        ]
+        print(f"{'lookup':>24} {'mean ms':>9} {'p50 ms':>8} {'p95 ms':>8}")
+        for name, function, queries in runs:
+            latencies = timed(function, queries)
+            if not latencies:
+                continue
+            p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+            print(f"{name:>24} {statistics.mean(latencies):>9.2f} "
+                  f"{statistics.median(latencies):>8.2f} {p95:>8.2f}")
+    connections.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Scaling benchmark for parallel_edges at 1/2/4/8/N workers.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_parallel_edges --proteins 20000 --threshold 0.8
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import synthetic_interpro
+from edge_builder import build_incidence, split_interpro
+from parallel_edges import build_partitions
+
+
+def worker_counts(maximum):
+    counts = [w for w in (1, 2, 4, 8) if w <= maximum]
+    return counts if maximum in counts else counts + [maximum]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parallel_edges scaling.")
+    parser.add_argument("--proteins", type=int, default=20000)
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    _, interpro = synthetic_interpro(args.proteins)
+    matrix, _ = build_incidence([split_interpro(v) for v in interpro])
+    pairs = args.proteins * (args.proteins - 1) // 2
+
+    print(f"{args.proteins} proteins, {pairs} pairs, threshold {args.threshold}")
+    print(f"{'workers':>8} {'seconds':>9} {'Mpairs/s':>9} {'speedup':>8}")
+    baseline = None
+    for workers in worker_counts(args.max_workers):
+        with tempfile.TemporaryDirectory() as partition_dir:
+            start = time.perf_counter()
+            build_partitions(matrix, partition_dir, args.threshold, workers)
+            elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>8} {elapsed:>9.2f} {pairs / elapsed / 1e6:>9.1f} {baseline / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
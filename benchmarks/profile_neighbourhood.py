@@ -0,0 +1,80 @@
+"""Server-side cost of the neighbourhood queries: PROFILE db hits and rows.
+
+Profiles, for each sampled protein (highest-degree proteins first, since hubs
+are where the old query hurts):
+
+* the original GUI query (unlabelled match, unordered ``LIMIT 500``)
+* bench_neo4j_search.NEIGHBOURHOOD_QUERY (labelled, same shape)
+* neo4j_search.neighbourhood_query with top-k pruning, for 1 and 2 hops
+
+``--explain`` prints the EXPLAIN plan of each query instead of running it.
+Needs the Neo4j server configured in connections.py, loaded by neo4j_loader.py.
+
+Usage (from the repository root):
+    python -m benchmarks.profile_neighbourhood --samples 5 --top-k 50
+    python -m benchmarks.profile_neighbourhood --explain
+"""
+import argparse
+
+import connections
+from benchmarks.bench_neo4j_search import LEGACY_GRAPH_QUERY, NEIGHBOURHOOD_QUERY
+from neo4j_search import DEFAULT_MIN_WEIGHT, DEFAULT_PAGE_SIZE, LABEL, RELATIONSHIP, neighbourhood_query
+
+HUB_QUERY = f"""
+MATCH (p:{LABEL})
+RETURN p.entry AS entry, COUNT {{ (p)-[:{RELATIONSHIP}]-() }} AS degree
+ORDER BY degree DESC LIMIT $samples
+"""
+
+
+def total_db_hits(plan):
+    """Sum dbHits over a PROFILE plan tree."""
+    return plan.get("dbHits", 0) + sum(total_db_hits(child) for child in plan.get("children", []))
+
+
+def print_plan(plan, depth=0):
+    print(f"{'  ' * depth}{plan['operatorType']} {plan.get('args', {}).get('Details', '')}")
+    for child in plan.get("children", []):
+        print_plan(child, depth + 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PROFILE the old and new neighbourhood queries.")
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--top-k", type=int, default=50)
+    parser.add_argument("--min-weight", type=float, default=DEFAULT_MIN_WEIGHT)
+    parser.add_argument("--explain", action="store_true", help="print EXPLAIN plans instead")
+    args = parser.parse_args()
+
+    queries = [
+        ("legacy", LEGACY_GRAPH_QUERY, "query"),
+        ("labelled", NEIGHBOURHOOD_QUERY, "entry"),
+        (f"top-{args.top_k}, 1 hop", neighbourhood_query(1), "entry"),
+        (f"top-{args.top_k}, 2 hops", neighbourhood_query(2), "entry"),
+    ]
+    extra = {"min_weight": args.min_weight, "top_k": args.top_k, "page_size": DEFAULT_PAGE_SIZE,
+             "after_weight": None, "after_source": None, "after_target": None}
+
+    with connections.get_neo4j_driver().session() as session:
+        hubs = session.run(HUB_QUERY, samples=args.samples).data()
+        if args.explain:
+            for name, cypher, key in queries:
+                print(f"--- {name}")
+                print_plan(session.run("EXPLAIN " + cypher, {key: hubs[0]["entry"], **extra}).consume().plan)
+            connections.close_all()
+            return
+
+        print(f"{'entry':>12} {'degree':>7} {'query':>16} {'rows':>6} {'db hits':>10} {'ms':>8}")
+        for hub in hubs:
+            for name, cypher, key in queries:
+                result = session.run("PROFILE " + cypher, {key: hub["entry"], **extra})
+                rows = len(list(result))
+                summary = result.consume()
+                elapsed = summary.result_available_after + summary.result_consumed_after
+                print(f"{hub['entry']:>12} {hub['degree']:>7} {name:>16} {rows:>6} "
+                      f"{total_db_hits(summary.profile):>10} {elapsed:>8}")
+    connections.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""Offline benchmark suite with a JSON report and a baseline comparison.
+
+Runs without MongoDB, Neo4j or a display. For each scale (1k, 10k and 100k
+synthetic proteins from benchmarks/synthetic.py) it times:
+
+``edges.*``
+    The Jaccard edge build at 0.8 through edge_builder.build_edges, with the
+    prefix join and, up to ``SPARSE_MAX_PROTEINS``, the sparse builder.
+``mongo.*``
+    mongo_loader.load into mongomock (or a local mongod with ``--mongo-uri``),
+    then find_protein on accessions (exact tier) and entry name prefixes, the
+    lookups query_mongo makes.
+``graph.*``
+    The in-memory stand-ins for the Neo4j queries: building the CSR graph
+    (csr_graph.py) and the search index (search_index.py), resolving a
+    query to a node like query_neo4j, and the 1- and 2-hop ego networks
+    query_neo4j_graph draws.
+
+Independent of scale, ``render.*`` times draw_graph's layout and an Agg
+render on graphs of ``GRAPH_SIZES`` edges.
+
+Each result is the median of ``--repeats`` runs (a single run for steps
+slower than ``MIN_REPEAT_SECONDS``); lookups report the median per-query
+latency. The report is written as JSON to ``--output``. With ``--baseline``,
+every result is compared against the stored report. The script exits with
+status 1 if any result is slower than the baseline by more than
+``--threshold`` (relative) and ``--noise-floor`` seconds (absolute).
+Baselines are machine-specific; save one per machine with
+``--save-baseline``.
+
+Usage (from the repository root):
+    python -m benchmarks.run_benchmarks --scales 1k 10k --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --scales 1k 10k --baseline benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --scales 100k --only edges graph
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from benchmarks.bench_graph_layout import synthetic_graph
+from benchmarks.synthetic import synthetic_proteins
+from csr_graph import CSRGraph, build_graph
+from edge_builder import build_edges
+from graph_layout import GraphRenderer, compute_layout, graph_arrays
+from mongo_loader import load
+from mongo_search import find_protein
+from search_index import SearchIndex
+
+REPORT_VERSION = 1
+SCALES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+DEFAULT_SCALES = ("1k", "10k")
+SUITES = ("edges", "mongo", "graph", "render")
+GRAPH_SIZES = (50, 500, 2000)
+SPARSE_MAX_PROTEINS = 10_000
+THRESHOLD = 0.8
+TOP_K = 50
+MIN_REPEAT_SECONDS = 1.0
+DEFAULT_REPEATS = 3
+DEFAULT_SAMPLES = 100
+DEFAULT_REGRESSION = 0.25
+DEFAULT_NOISE_FLOOR = 0.001
+
+
+def measure(function, repeats):
+    """Median seconds of ``function()`` and its last return value."""
+    times = []
+    while True:
+        start = time.perf_counter()
+        value = function()
+        times.append(time.perf_counter() - start)
+        if len(times) >= repeats or times[0] >= MIN_REPEAT_SECONDS:
+            return statistics.median(times), value
+
+
+def latency(function, queries):
+    """Median and 95th percentile per-query seconds, and the number of hits."""
+    times, hits = [], 0
+    for query in queries:
+        start = time.perf_counter()
+        hits += bool(function(query))
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return {"seconds": statistics.median(times), "p95": times[min(len(times) - 1, int(0.95 * len(times)))],
+            "queries": len(times), "hits": hits}
+
+
+def edge_suite(frame, work_dir, repeats):
+    results = {}
+    methods = ["prefix"] + (["sparse"] if len(frame) <= SPARSE_MAX_PROTEINS else [])
+    for method in methods:
+        path = os.path.join(work_dir, f"edges_{method}.csv")
+        seconds, edges = measure(lambda: build_edges(frame["Entry"].tolist(), frame["InterPro"].tolist(),
+                                                     path, THRESHOLD, method=method), repeats)
+        results[method] = {"seconds": seconds, "edges": edges}
+    return results
+
+
+def mongo_suite(frame, csv_path, samples, repeats, mongo_uri=None):
+    if mongo_uri:
+        from pymongo import MongoClient
+        client = MongoClient(mongo_uri)
+    else:
+        import mongomock
+        client = mongomock.MongoClient()
+    collection = client["benchmark"]["MoodleDB"]
+    seconds, _ = measure(lambda: load(collection, csv_path, writers=1, drop=True), repeats)
+    rows = random.Random(0).sample(range(len(frame)), min(samples, len(frame)))
+    names = frame["Entry Name"].to_numpy()
+    results = {
+        "load": {"seconds": seconds, "documents": len(frame)},
+        "exact": latency(lambda q: find_protein(collection, q)[0], frame["Entry"].to_numpy()[rows]),
+        "prefix": latency(lambda q: find_protein(collection, q)[0], [n[:-3].lower() for n in names[rows]]),
+    }
+    if mongo_uri:
+        client.drop_database("benchmark")
+    client.close()
+    return results
+
+
+def graph_suite(frame, csv_path, edges_path, work_dir, samples, repeats):
+    graph_path = os.path.join(work_dir, "graph.csr")
+    seconds, _ = measure(lambda: build_graph(edges_path, graph_path, csv_path), repeats)
+    results = {"build": {"seconds": seconds}}
+    seconds, index = measure(lambda: SearchIndex.from_csv(csv_path), repeats)
+    results["index"] = {"seconds": seconds}
+
+    graph = CSRGraph(graph_path)
+    rows = random.Random(1).sample(range(len(frame)), min(samples, len(frame)))
+    entries = frame["Entry"].to_numpy()[rows]
+    genes = frame["Gene Names"].to_numpy()[rows]
+    results["resolve"] = latency(index.resolve, genes)
+    for hops in (1, 2):
+        results[f"ego{hops}"] = latency(lambda e, hops=hops: graph.ego_network(e, 0.0, TOP_K, hops, 500)[1],
+                                        entries)
+    return results
+
+
+def render_suite(repeats):
+    figure = Figure(figsize=(8, 6))
+    canvas = FigureCanvasAgg(figure)
+    renderer = GraphRenderer(figure.add_subplot())
+    results = {}
+    compute_layout(3, np.array([0, 1]), np.array([1, 2]), np.ones(2))  # imports scipy, not part of the timing
+    for n_edges in GRAPH_SIZES:
+        entries, sources, targets, weights = graph_arrays(*synthetic_graph(n_edges))
+        seconds, positions = measure(lambda: compute_layout(len(entries), sources, targets, weights), repeats)
+        results[f"layout.{n_edges}"] = {"seconds": seconds, "nodes": len(entries)}
+
+        def render():
+            renderer.draw(entries, positions, sources, targets, weights)
+            canvas.draw()
+        seconds, _ = measure(render, repeats)
+        results[f"draw.{n_edges}"] = {"seconds": seconds, "nodes": len(entries)}
+    return results
+
+
+def flatten(prefix, results):
+    return {f"{prefix}.{name}": value for name, value in results.items()}
+
+
+def run(scales, suites, repeats, samples, mongo_uri=None, log=print):
+    results = {}
+    for scale in scales:
+        work_dir = tempfile.mkdtemp(prefix=f"bench_{scale}_")
+        try:
+            frame = synthetic_proteins(SCALES[scale])
+            csv_path = os.path.join(work_dir, "cleaned_mongodb.csv")
+            frame.to_csv(csv_path, index=False)
+            if "edges" in suites or "graph" in suites:
+                log(f"[{scale}] edge build")
+                edges = edge_suite(frame, work_dir, repeats)
+                if "edges" in suites:
+                    results.update(flatten(f"edges.{scale}", edges))
+            if "mongo" in suites:
+                log(f"[{scale}] mongo lookups")
+                results.update(flatten(f"mongo.{scale}", mongo_suite(frame, csv_path, samples, repeats,
+                                                                     mongo_uri)))
+            if "graph" in suites:
+                log(f"[{scale}] graph lookups")
+                results.update(flatten(f"graph.{scale}", graph_suite(
+                    frame, csv_path, os.path.join(work_dir, "edges_prefix.csv"), work_dir, samples, repeats)))
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    if "render" in suites:
+        log("render")
+        results.update(flatten("render", render_suite(repeats)))
+    return results
+
+
+def environment():
+    return {"python": platform.python_version(), "numpy": np.__version__, "platform": platform.platform(),
+            "machine": platform.machine(), "cpus": os.cpu_count()}
+
+
+def compare(results, baseline, threshold=DEFAULT_REGRESSION, noise_floor=DEFAULT_NOISE_FLOOR):
+    """Rows of (name, baseline seconds, current seconds, ratio, status) for results in both reports."""
+    rows = []
+    for name, result in sorted(results.items()):
+        if name not in baseline:
+            rows.append((name, None, result["seconds"], None, "new"))
+            continue
+        before, after = baseline[name]["seconds"], result["seconds"]
+        ratio = after / before if before > 0 else float("inf")
+        if ratio > 1 + threshold and after - before > noise_floor:
+            status = "REGRESSION"
+        elif ratio < 1 / (1 + threshold) and before - after > noise_floor:
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append((name, before, after, ratio, status))
+    return rows
+
+
+def print_comparison(rows):
+    print(f"{'benchmark':<28} {'baseline s':>11} {'current s':>11} {'ratio':>7}  status")
+    for name, before, after, ratio, status in rows:
+        before = f"{before:>11.4f}" if before is not None else f"{'-':>11}"
+        ratio = f"{ratio:>7.2f}" if ratio is not None else f"{'-':>7}"
+        print(f"{name:<28} {before} {after:>11.4f} {ratio}  {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite.")
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=list(DEFAULT_SCALES))
+    parser.add_argument("--only", nargs="+", choices=SUITES, default=list(SUITES), help="suites to run")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="queries per lookup benchmark")
+    parser.add_argument("--mongo-uri", help="use this MongoDB server instead of mongomock")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON report path")
+    parser.add_argument("--baseline", help="report to compare against")
+    parser.add_argument("--save-baseline", help="also write the report here as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION,
+                        help="relative slowdown that counts as a regression")
+    parser.add_argument("--noise-floor", type=float, default=DEFAULT_NOISE_FLOOR,
+                        help="ignore slowdowns smaller than this many seconds")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = run(args.scales, args.only, args.repeats, args.samples, args.mongo_uri)
+    report = {"version": REPORT_VERSION, "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+              "environment": environment(),
+              "config": {"scales": args.scales, "suites": args.only, "repeats": args.repeats,
+                         "samples": args.samples, "backend": "mongod" if args.mongo_uri else "mongomock"},
+              "results": results}
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w") as file:
+            json.dump(report, file, indent=2)
+    print(f"Wrote {len(results)} results to {args.output} in {time.perf_counter() - start:.0f}s")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if baseline.get("environment", {}).get("machine") != report["environment"]["machine"]:
+            print("Warning: the baseline was recorded on a different machine type")
+        rows = compare(results, baseline["results"], args.threshold, args.noise_floor)
+        print_comparison(rows)
+        regressions = [row for row in rows if row[4] == "REGRESSION"]
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+            sys.exit(1)
+    else:
+        print_comparison(compare(results, {}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Memory soak test for the graph panel: many redraws on one persistent figure.
+
+Replays the GUI's redraw pattern (new query result, then a few zoom steps)
+on an off-screen Agg canvas, using the same GraphRenderer and persistent
+Figure as python_tkinter_gui.py. Traced Python memory is sampled every
+``--every`` redraws. The script fails (exit status 1) if memory after the
+warm-up grows by more than ``--max-growth-mb``.
+
+``--legacy`` runs the old pattern instead: a new ``plt.subplots`` figure per
+redraw that is never closed. Its memory grows without bound.
+
+Usage (from the repository root):
+    python -m benchmarks.soak_graph_redraw --redraws 1000
+    python -m benchmarks.soak_graph_redraw --redraws 200 --legacy
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from benchmarks.bench_graph_layout import synthetic_graph
+from graph_layout import GraphRenderer, compute_layout, graph_arrays
+from preprocess import peak_memory_mb
+
+GRAPH_SIZES = (20, 50, 120, 300, 500)
+ZOOM_STEPS = (1.0, 1.5, 2.5, 4.0)
+
+
+def layouts():
+    result = []
+    for seed, n_edges in enumerate(GRAPH_SIZES):
+        entries, sources, targets, weights = graph_arrays(*synthetic_graph(n_edges, seed))
+        result.append((entries, compute_layout(len(entries), sources, targets, weights),
+                       sources, targets, weights))
+    return result
+
+
+def zoom(ax, factor, limits):
+    (x0, x1), (y0, y1) = limits
+    ax.set_xlim(x0 / factor, x1 / factor)
+    ax.set_ylim(y0 / factor, y1 / factor)
+
+
+def persistent_redraws(graphs):
+    """The GUI's pattern: one figure whose artists are updated in place."""
+    figure = Figure(figsize=(8, 6))
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot()
+    renderer = GraphRenderer(ax)
+    limits = (ax.get_xlim(), ax.get_ylim())
+    redraw = 0
+    while True:
+        for graph in graphs:
+            renderer.draw(*graph)
+            for factor in ZOOM_STEPS:
+                zoom(ax, factor, limits)
+                figure.canvas.draw()
+                redraw += 1
+                yield redraw
+
+
+def legacy_redraws(graphs):
+    """The old pattern: a new pyplot figure per redraw, never closed."""
+    redraw = 0
+    while True:
+        for graph in graphs:
+            for factor in ZOOM_STEPS:
+                fig, ax = plt.subplots(figsize=(8, 6))
+                GraphRenderer(ax).draw(*graph)
+                zoom(ax, factor, (ax.get_xlim(), ax.get_ylim()))
+                fig.canvas.draw()
+                redraw += 1
+                yield redraw
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that graph redraws do not leak memory.")
+    parser.add_argument("--redraws", type=int, default=1000)
+    parser.add_argument("--every", type=int, default=100, help="sample memory every N redraws")
+    parser.add_argument("--warmup", type=int, default=100, help="redraws before the baseline sample")
+    parser.add_argument("--max-growth-mb", type=float, default=5.0)
+    parser.add_argument("--legacy", action="store_true", help="run the old new-figure-per-redraw pattern")
+    args = parser.parse_args()
+
+    graphs = layouts()
+    redraws = legacy_redraws(graphs) if args.legacy else persistent_redraws(graphs)
+    tracemalloc.start()
+    baseline = None
+    start = time.perf_counter()
+    print(f"{'redraw':>7} {'traced MB':>10} {'max RSS MB':>11} {'ms/redraw':>10}")
+    for redraw in redraws:
+        if redraw == args.warmup:
+            baseline = tracemalloc.get_traced_memory()[0]
+        if redraw % args.every == 0:
+            traced = tracemalloc.get_traced_memory()[0] / 1e6
+            max_rss = peak_memory_mb()
+            max_rss = f"{max_rss:>11.1f}" if max_rss is not None else f"{'n/a':>11}"
+            per_redraw = (time.perf_counter() - start) * 1000 / redraw
+            print(f"{redraw:>7} {traced:>10.1f} {max_rss} {per_redraw:>10.1f}")
+        if redraw >= args.redraws:
+            break
+
+    growth = (tracemalloc.get_traced_memory()[0] - (baseline or 0)) / 1e6
+    tracemalloc.stop()
+    print(f"Growth after warm-up: {growth:.2f} MB (limit {args.max_growth_mb} MB)")
+    if growth > args.max_growth_mb:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Synthetic InterPro-annotated proteins for offline benchmarks.
+
+Proteins are drawn from domain "families" whose sizes follow a power law, so
+the data has the same shape as the mouse proteome: a few huge families of
+near-identical proteins (olfactory receptors, zinc fingers) and a long tail
+of rare domain combinations.
+"""
+import numpy as np
+import pandas as pd
+
+DOMAIN_COUNT = 20000
+
+
+def synthetic_interpro(n_proteins, seed=0, family_size=4, exponent=1.1):
+    """Return (entries, interpro) lists with raw UniProt-style InterPro fields.
+
+    ``family_size`` is the mean number of proteins per family and ``exponent``
+    the power law of the family sizes; a flatter law (smaller exponent) keeps
+    the edge count roughly linear in ``n_proteins``.
+    """
+    rng = np.random.default_rng(seed)
+    family_count = max(1, n_proteins // family_size)
+    family_weights = 1.0 / np.arange(1, family_count + 1) ** exponent
+    family_weights /= family_weights.sum()
+    families = [rng.choice(DOMAIN_COUNT, size=rng.integers(1, 8), replace=False)
+                for _ in range(family_count)]
+
+    entries, interpro = [], []
+    for i, family in enumerate(rng.choice(family_count, size=n_proteins, p=family_weights)):
+        domains = list(families[family])
+        if rng.random() < 0.3:
+            domains.append(rng.integers(DOMAIN_COUNT))
+        entries.append(f"S{i:07d}")
+        interpro.append("".join(f"IPR{d:06d};" for d in dict.fromkeys(domains)))
+    return entries, interpro
+
+
+ORGANISMS = ("Mus musculus (Mouse)", "Homo sapiens (Human)", "Rattus norvegicus (Rat)")
+NAME_WORDS = ("kinase", "receptor", "transporter", "zinc finger", "ligase", "protease", "channel")
+AMINO_ACIDS = np.array(list("ACDEFGHIKLMNPQRSTVWY"))
+
+
+def synthetic_proteins(n_proteins, seed=0, family_size=10, exponent=0.5):
+    """A DataFrame in the cleaned_mongodb.csv format, for loader and lookup benchmarks.
+
+    The defaults give a few to a few dozen edges per protein at 0.8, like the
+    real data, at every scale.
+    """
+    entries, interpro = synthetic_interpro(n_proteins, seed, family_size, exponent)
+    rng = np.random.default_rng(seed + 1)
+    species = rng.integers(len(ORGANISMS), size=n_proteins)
+    words = rng.integers(len(NAME_WORDS), size=n_proteins)
+    has_ec = rng.random(n_proteins) < 0.4
+    ec = rng.integers(1, 8, size=(n_proteins, 4))
+    return pd.DataFrame({
+        "Entry": entries,
+        "Entry Name": [f"{e}_{ORGANISMS[s].split('(')[1][:-1].upper()}" for e, s in zip(entries, species)],
+        "Protein names": [f"Synthetic {NAME_WORDS[w]} {i}" for i, w in enumerate(words)],
+        "Gene Names": [f"Syn{i}" for i in range(n_proteins)],
+        "Organism": [ORGANISMS[s] for s in species],
+        "Sequence": ["".join(row) for row in rng.choice(AMINO_ACIDS, size=(n_proteins, 30))],
+        "EC number": [".".join(map(str, row)) if keep else "Not Available" for row, keep in zip(ec.tolist(), has_ec)],
+        "InterPro": [str(v.split(";")) for v in interpro],
+        "Domains": [",".join(v.split(";")) for v in interpro],
+    })
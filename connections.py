@@ -0,0 +1,107 @@
+"""Process-wide MongoDB client and Neo4j driver shared by the GUI scripts.
+
+Both clients keep their own connection pools, so each process should create
+them once and reuse them for every query, not once per Search click.
+``get_mongo_collection`` and ``get_neo4j_driver`` create them lazily on first
+use (or during ``warm_up``), ``health_check`` pings both, and ``close_all``
+releases the pools. It is registered with atexit and should also be called
+when the Tk window closes.
+"""
+import atexit
+import threading
+
+from neo4j import GraphDatabase
+from pymongo import MongoClient
+
+# MongoDB and Neo4j connection details
+MONGO_URI = "mongodb://localhost:27017"
+MONGO_DATABASE = "NoSQLProj"
+MONGO_COLLECTION = "MoodleDB"
+NEO4J_URI = "bolt://localhost:7687"
+NEO4J_AUTH = ("neo4j", "12341234")
+
+# Pool sizes and timeouts (seconds); change before the first query to apply
+MONGO_MAX_POOL_SIZE = 10
+MONGO_MIN_POOL_SIZE = 1
+NEO4J_MAX_POOL_SIZE = 10
+CONNECT_TIMEOUT = 5
+QUERY_TIMEOUT = 30
+
+_lock = threading.Lock()
+_mongo_client = None
+_neo4j_driver = None
+
+
+def get_mongo_client():
+    """Return the shared MongoClient, creating it on first use."""
+    global _mongo_client
+    with _lock:
+        if _mongo_client is None:
+            _mongo_client = MongoClient(
+                MONGO_URI,
+                maxPoolSize=MONGO_MAX_POOL_SIZE,
+                minPoolSize=MONGO_MIN_POOL_SIZE,
+                connectTimeoutMS=CONNECT_TIMEOUT * 1000,
+                serverSelectionTimeoutMS=CONNECT_TIMEOUT * 1000,
+                socketTimeoutMS=QUERY_TIMEOUT * 1000,
+            )
+        return _mongo_client
+
+
+def get_mongo_collection():
+    """Return the MoodleDB collection on the shared client."""
+    return get_mongo_client()[MONGO_DATABASE][MONGO_COLLECTION]
+
+
+def get_neo4j_driver():
+    """Return the shared Neo4j driver, creating it on first use."""
+    global _neo4j_driver
+    with _lock:
+        if _neo4j_driver is None:
+            _neo4j_driver = GraphDatabase.driver(
+                NEO4J_URI,
+                auth=NEO4J_AUTH,
+                max_connection_pool_size=NEO4J_MAX_POOL_SIZE,
+                connection_timeout=CONNECT_TIMEOUT,
+                connection_acquisition_timeout=QUERY_TIMEOUT,
+            )
+        return _neo4j_driver
+
+
+def health_check():
+    """Ping both databases and return {"mongo": error-or-None, "neo4j": error-or-None}."""
+    status = {}
+    try:
+        get_mongo_client().admin.command("ping")
+        status["mongo"] = None
+    except Exception as e:
+        status["mongo"] = str(e)
+    try:
+        get_neo4j_driver().verify_connectivity()
+        status["neo4j"] = None
+    except Exception as e:
+        status["neo4j"] = str(e)
+    return status
+
+
+def warm_up():
+    """Open the pools now so the first search does not pay for the handshakes."""
+    status = health_check()
+    for name, error in status.items():
+        print(f"{name}: {'connected' if error is None else 'unavailable - ' + error}")
+    return status
+
+
+def close_all():
+    """Close the shared client and driver; they are recreated if used again."""
+    global _mongo_client, _neo4j_driver
+    with _lock:
+        if _mongo_client is not None:
+            _mongo_client.close()
+            _mongo_client = None
+        if _neo4j_driver is not None:
+            _neo4j_driver.close()
+            _neo4j_driver = None
+
+
+atexit.register(close_all)
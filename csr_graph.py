@@ -0,0 +1,215 @@
+"""Embedded, memory-mapped CSR graph for ego-network queries without Neo4j.
+
+The similarity graph is static and already on disk as edges2.csv (or an
+edge store, see edge_store.py). ``build_graph`` turns it into a compressed
+sparse row adjacency directory:
+
+    manifest.json   format version, protein and edge counts
+    proteins.npy    sorted accession table (fixed-width ASCII), node id = row
+    names.npy       Entry Name per node (optional, from cleaned_mongodb.csv)
+    indptr.npy      int64, neighbours of node i are indices[indptr[i]:indptr[i + 1]]
+    indices.npy     int32 neighbour ids, every undirected edge stored both ways
+    weights.npy     float32 Jaccard weights, sorted descending within each node
+
+``CSRGraph`` opens the arrays with ``mmap_mode="r"``. Because each node's
+neighbours are sorted by weight, top-k is a slice and a weight range is two
+binary searches. ``ego_network`` answers the same question as
+neo4j_search.fetch_neighbourhood (top-k neighbours above a weight for up to
+two hops, plus the edges among them, strongest first) and returns the
+GUI's (nodes, edges) format.
+
+Usage:
+    python csr_graph.py build data/edges2.csv data/edges2.csr --names data/cleaned_mongodb.csv
+    python csr_graph.py query data/edges2.csr A0A075F5C6 --top-k 50 --hops 1
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from edge_store import EdgeStore, csv_to_store
+
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+MAX_HOPS = 2
+
+
+class CSRGraph:
+    """Read-only view of a CSR graph directory."""
+
+    def __init__(self, path, mmap_mode="r"):
+        with open(os.path.join(path, MANIFEST)) as file:
+            self.manifest = json.load(file)
+        if self.manifest.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path} has CSR graph version {self.manifest.get('version')}, "
+                             f"expected {FORMAT_VERSION}")
+        self.path = path
+        self.proteins = np.load(os.path.join(path, "proteins.npy"), mmap_mode=mmap_mode)
+        self.indptr = np.load(os.path.join(path, "indptr.npy"), mmap_mode=mmap_mode)
+        self.indices = np.load(os.path.join(path, "indices.npy"), mmap_mode=mmap_mode)
+        self.weights = np.load(os.path.join(path, "weights.npy"), mmap_mode=mmap_mode)
+        names_path = os.path.join(path, "names.npy")
+        self.names = np.load(names_path, mmap_mode=mmap_mode) if os.path.exists(names_path) else None
+
+    def __len__(self):
+        return len(self.proteins)
+
+    def node_id(self, entry):
+        """Node id of an accession, or None if it has no edges."""
+        key = entry.strip().upper().encode("ascii", "ignore")
+        i = int(np.searchsorted(self.proteins, key))
+        return i if i < len(self.proteins) and self.proteins[i] == key else None
+
+    def entry(self, node):
+        return self.proteins[node].decode("ascii")
+
+    def name(self, node):
+        return self.names[node].decode("utf-8") if self.names is not None else "Unknown"
+
+    def neighbours(self, node, min_weight=None, max_weight=None, top_k=None):
+        """(ids, weights) of neighbours with min_weight < weight <= max_weight, strongest first."""
+        start, stop = int(self.indptr[node]), int(self.indptr[node + 1])
+        weights = self.weights[start:stop]
+        lo, hi = 0, stop - start
+        if max_weight is not None:
+            lo = int(np.searchsorted(-weights, -max_weight, side="left"))
+        if min_weight is not None:
+            hi = int(np.searchsorted(-weights, -min_weight, side="left"))
+        if top_k is not None:
+            hi = min(hi, lo + top_k)
+        return self.indices[start + lo:start + hi], weights[lo:hi]
+
+    def gather(self, nodes, top_k=None):
+        """(sources, positions) of the adjacency entries of ``nodes``, at most top_k per node."""
+        starts = np.asarray(self.indptr[nodes])
+        lengths = np.asarray(self.indptr[nodes + 1]) - starts
+        if top_k is not None:
+            lengths = np.minimum(lengths, top_k)
+        offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        return np.repeat(nodes, lengths), offsets + np.arange(int(lengths.sum()))
+
+    def ego_members(self, node, min_weight=0.0, top_k=None, hops=1):
+        """Node ids in the ego network: the centre plus the top-k neighbours of each hop."""
+        if not 1 <= hops <= MAX_HOPS:
+            raise ValueError(f"hops must be between 1 and {MAX_HOPS}, got {hops}")
+        members = frontier = np.array([node], dtype=np.int64)
+        for _ in range(hops):
+            # Rows are sorted by weight, so the first top_k entries above min_weight are the top-k
+            _, positions = self.gather(frontier, top_k)
+            ring = np.unique(self.indices[positions[self.weights[positions] > min_weight]])
+            frontier = np.setdiff1d(ring, members, assume_unique=True)
+            members = np.union1d(members, frontier)
+        return members
+
+    def ego_network(self, entry, min_weight=0.0, top_k=None, hops=1, max_edges=None):
+        """(nodes, edges) around ``entry`` in the GUI's format, strongest edges first.
+
+        nodes are (entry, entry name) and edges (entry, entry, weight), each
+        undirected edge once. Returns (set(), []) for an unknown entry.
+        """
+        node = self.node_id(entry)
+        if node is None:
+            return set(), []
+        members = self.ego_members(node, min_weight, top_k, hops)
+        in_members = np.zeros(len(self), dtype=bool)
+        in_members[members] = True
+        sources, positions = self.gather(members)
+        targets, weights = self.indices[positions], self.weights[positions]
+        keep = in_members[targets] & (targets > sources) & (weights > min_weight)
+        sources, targets, weights = sources[keep], targets[keep], weights[keep]
+        order = np.lexsort((targets, sources, -weights))[:max_edges]
+        sources, targets, weights = sources[order], targets[order], weights[order]
+
+        shown = np.unique(np.concatenate([sources, targets]))
+        entries = dict(zip(shown.tolist(), self.proteins[shown].astype(str).tolist()))
+        names = (np.char.decode(self.names[shown], "utf-8").tolist() if self.names is not None
+                 else ["Unknown"] * len(shown))
+        nodes = set(zip(entries.values(), names))
+        edges = [(entries[s], entries[t], w)
+                 for s, t, w in zip(sources.tolist(), targets.tolist(), weights.astype(float).tolist())]
+        return nodes, edges
+
+
+def read_names(nodes_csv, proteins):
+    """Entry Name for every accession in ``proteins`` (str array), "Unknown" if missing."""
+    frame = pd.read_csv(nodes_csv, usecols=["Entry", "Entry Name"], dtype=str, keep_default_na=False)
+    names = dict(zip(frame["Entry"], frame["Entry Name"]))
+    return np.char.encode(np.array([names.get(p, "Unknown") for p in proteins], dtype=str), "utf-8")
+
+
+def build_graph(edges_path, path, nodes_csv=None):
+    """Build a CSR graph directory from an edge CSV or edge store; return (proteins, edges)."""
+    if os.path.isdir(edges_path):
+        return build_from_store(EdgeStore(edges_path), path, nodes_csv, edges_path)
+    with tempfile.TemporaryDirectory() as store_path:
+        csv_to_store(edges_path, store_path)
+        return build_from_store(EdgeStore(store_path), path, nodes_csv, edges_path)
+
+
+def build_from_store(store, path, nodes_csv, source_file):
+    os.makedirs(path, exist_ok=True)
+    proteins = np.asarray(store.proteins)
+    order = np.argsort(proteins)
+    rank = np.empty(len(proteins), dtype=np.int32)
+    rank[order] = np.arange(len(proteins), dtype=np.int32)
+
+    source, target = rank[store.source], rank[store.target]
+    rows = np.concatenate([source, target])
+    cols = np.concatenate([target, source])
+    weights = np.concatenate([store.weight, store.weight])
+    del source, target
+    by_row = np.lexsort((cols, -weights, rows))
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=len(proteins)))]).astype(np.int64)
+
+    sorted_proteins = proteins[order]
+    np.save(os.path.join(path, "proteins.npy"), sorted_proteins)
+    np.save(os.path.join(path, "indptr.npy"), indptr)
+    np.save(os.path.join(path, "indices.npy"), cols[by_row].astype(np.int32))
+    np.save(os.path.join(path, "weights.npy"), weights[by_row].astype(np.float32))
+    if nodes_csv:
+        np.save(os.path.join(path, "names.npy"), read_names(nodes_csv, np.char.decode(sorted_proteins, "ascii")))
+    manifest = {"format": "csr-graph", "version": FORMAT_VERSION, "proteins": len(proteins),
+                "edges": len(store), "source_file": os.path.basename(source_file.rstrip("/"))}
+    with open(os.path.join(path, MANIFEST), "w") as file:
+        json.dump(manifest, file, indent=2)
+    return len(proteins), len(store)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query an embedded CSR similarity graph.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="build a CSR graph from an edge CSV or edge store")
+    build.add_argument("edges", help="data/edges2.csv or an edge store directory")
+    build.add_argument("graph", help="output directory")
+    build.add_argument("--names", help="data/cleaned_mongodb.csv, for Entry Names")
+    query = commands.add_parser("query", help="print the ego network of one protein")
+    query.add_argument("graph")
+    query.add_argument("entry")
+    query.add_argument("--min-weight", type=float, default=0.0)
+    query.add_argument("--top-k", type=int, default=50)
+    query.add_argument("--hops", type=int, default=1)
+    query.add_argument("--max-edges", type=int, default=500)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        proteins, edges = build_graph(args.edges, args.graph, args.names)
+        size = sum(os.path.getsize(os.path.join(args.graph, name)) for name in os.listdir(args.graph))
+        print(f"Built {args.graph}: {proteins} proteins, {edges} edges, {size / 1e6:.1f} MB on disk "
+              f"in {time.perf_counter() - start:.1f}s")
+    else:
+        graph = CSRGraph(args.graph)
+        start = time.perf_counter()
+        nodes, edges = graph.ego_network(args.entry, args.min_weight, args.top_k, args.hops, args.max_edges)
+        elapsed = (time.perf_counter() - start) * 1e6
+        for source, target, weight in edges[:20]:
+            print(f"{source} {target} {weight:.3f}")
+        print(f"{len(nodes)} nodes, {len(edges)} edges in {elapsed:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
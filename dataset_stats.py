@@ -0,0 +1,268 @@
+"""Dataset statistics for the GUI's statistics panel, kept as a small snapshot.
+
+The numbers used to be computed by hand in dataset_prep.ipynb (value_counts
+on Protein1/Protein2, a concat and a row-by-row search for the top degree)
+and pasted into the GUI. ``refresh`` computes them in one vectorised pass
+per input file:
+
+* edges (edges2.csv or an edge store, see edge_store.py): degree and
+  strength per protein with ``np.bincount``, a weight histogram, the mean
+  weight and the highest-degree proteins
+* nodes (cleaned_mongodb.csv): protein count, top organisms and top EC
+  numbers (multi-valued EC fields are split on ";")
+
+The result is written as ``dataset_stats.json`` (versioned, a few KB) plus
+``dataset_stats.npz`` holding the protein lists needed to combine the two
+parts (isolated proteins, average degree). Each part records the size and
+mtime of the file it came from; on the next refresh only the part whose file
+changed is recomputed, and nothing at all if neither did.
+
+Usage:
+    python dataset_stats.py data/cleaned_mongodb.csv data/edges2.csv
+    python dataset_stats.py data/cleaned_mongodb.csv data/edges2.store --threshold 0.8 --force
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from edge_store import EdgeStore
+
+SNAPSHOT_VERSION = 1
+DEFAULT_SNAPSHOT = "data/dataset_stats.json"
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_CHUNK_SIZE = 1_000_000
+HISTOGRAM_BINS = 20
+TOP_N = 10
+MAX_HUBS_SHOWN = 5
+MISSING_EC = "Not Available"
+
+
+def fingerprint(path):
+    """Size and mtime of a file, or of all files in an edge store directory."""
+    if os.path.isdir(path):
+        stats = [os.stat(os.path.join(path, name)) for name in sorted(os.listdir(path))]
+    else:
+        stats = [os.stat(path)]
+    return {"path": os.path.abspath(path), "size": sum(s.st_size for s in stats),
+            "mtime_ns": max(s.st_mtime_ns for s in stats)}
+
+
+def add_counts(total, counts):
+    return counts if total is None else total.add(counts, fill_value=0)
+
+
+def top_counts(counts, n=TOP_N):
+    if counts is None or counts.empty:
+        return []
+    counts = counts.sort_values(ascending=False, kind="stable")[:n]
+    return [[str(key), int(value)] for key, value in counts.items()]
+
+
+def node_stats(nodes_csv, chunk_size=DEFAULT_CHUNK_SIZE):
+    """(section, entries): protein count, top organisms and top EC numbers."""
+    entries, organisms, ec_numbers = [], None, None
+    for chunk in pd.read_csv(nodes_csv, usecols=["Entry", "Organism", "EC number"], dtype=str,
+                             keep_default_na=False, chunksize=chunk_size):
+        entries.append(chunk["Entry"].to_numpy(dtype=str))
+        organisms = add_counts(organisms, chunk["Organism"].value_counts())
+        ec = chunk["EC number"].str.split(";").explode().str.strip()
+        ec_numbers = add_counts(ec_numbers, ec[(ec != "") & (ec != MISSING_EC)].value_counts())
+    entries = np.unique(np.concatenate(entries)) if entries else np.empty(0, dtype=str)
+    section = {
+        "proteins": len(entries),
+        "top_organisms": top_counts(organisms),
+        "top_ec_numbers": top_counts(ec_numbers),
+    }
+    return section, entries
+
+
+def edge_arrays(edges_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield (protein ids, protein table, weights) chunks from an edge CSV or store."""
+    if os.path.isdir(edges_path):
+        store = EdgeStore(edges_path)
+        proteins = np.char.decode(np.asarray(store.proteins), "ascii")
+        for start in range(0, len(store), chunk_size):
+            stop = start + chunk_size
+            ids = np.concatenate([store.source[start:stop], store.target[start:stop]])
+            yield ids, proteins, np.asarray(store.weight[start:stop], dtype=np.float64)
+        return
+    for chunk in pd.read_csv(edges_path, chunksize=chunk_size, dtype={"Protein1": str, "Protein2": str}):
+        ids, proteins = pd.factorize(pd.concat([chunk["Protein1"], chunk["Protein2"]], ignore_index=True))
+        yield ids, proteins.to_numpy(dtype=str), chunk["Weight"].to_numpy(dtype=np.float64)
+
+
+def edge_stats(edges_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """(section, entries, degree): degrees, weight histogram and hub proteins."""
+    bins = np.linspace(0.0, 1.0, HISTOGRAM_BINS + 1)
+    histogram = np.zeros(HISTOGRAM_BINS, dtype=np.int64)
+    edges, weight_sum = 0, 0.0
+    min_weight, max_weight = np.inf, -np.inf
+    degree = strength = None
+    for ids, proteins, weights in edge_arrays(edges_path, chunk_size):
+        both = np.concatenate([weights, weights])
+        chunk_degree = pd.Series(np.bincount(ids, minlength=len(proteins)), index=proteins)
+        chunk_strength = pd.Series(np.bincount(ids, weights=both, minlength=len(proteins)), index=proteins)
+        degree = add_counts(degree, chunk_degree[chunk_degree > 0])
+        strength = add_counts(strength, chunk_strength[chunk_degree > 0])
+        histogram += np.histogram(np.clip(weights, 0.0, 1.0), bins)[0]
+        edges += len(weights)
+        weight_sum += float(weights.sum())
+        if len(weights):
+            min_weight = min(min_weight, float(weights.min()))
+            max_weight = max(max_weight, float(weights.max()))
+
+    if degree is None:
+        degree = strength = pd.Series(dtype=np.int64)
+    degree = degree.sort_index()
+    strength = strength.reindex(degree.index)
+    max_degree = int(degree.max()) if len(degree) else 0
+    hubs = degree.index[degree.to_numpy() == max_degree].tolist() if len(degree) else []
+    section = {
+        "edges": edges,
+        "connected_proteins": len(degree),
+        "mean_weight": weight_sum / edges if edges else None,
+        "min_weight": min_weight if edges else None,
+        "max_weight": max_weight if edges else None,
+        "max_degree": max_degree,
+        "hubs": hubs,
+        "top_degrees": top_counts(degree),
+        "top_strengths": [[str(key), round(float(value), 4)] for key, value in
+                          strength.sort_values(ascending=False, kind="stable")[:TOP_N].items()],
+        "histogram": {"bins": bins.round(6).tolist(), "counts": histogram.tolist()},
+    }
+    return section, degree.index.to_numpy(dtype=str), degree.to_numpy(dtype=np.int64)
+
+
+def combine(edges, node_entries, edge_entries, degree):
+    """Statistics that need both parts: average degree and isolated proteins."""
+    positions = np.searchsorted(edge_entries, node_entries)
+    positions[positions == len(edge_entries)] = 0
+    found = (edge_entries[positions] == node_entries) if len(edge_entries) else np.zeros(len(node_entries), bool)
+    node_degree = np.where(found, degree[positions] if len(degree) else 0, 0)
+    return {
+        "average_degree": float(node_degree.mean()) if len(node_degree) else 0.0,
+        "isolated_proteins": int((node_degree == 0).sum()),
+        "proteins_without_node_row": int(edges["connected_proteins"] - found.sum()),
+    }
+
+
+def sidecar_path(path):
+    return os.path.splitext(path)[0] + ".npz"
+
+
+def load_snapshot(path=DEFAULT_SNAPSHOT):
+    """The snapshot as a dict, or None if it is missing or from another version."""
+    try:
+        with open(path) as file:
+            snapshot = json.load(file)
+    except (OSError, ValueError):
+        return None
+    return snapshot if snapshot.get("version") == SNAPSHOT_VERSION else None
+
+
+def save_snapshot(snapshot, arrays, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as file:
+        json.dump(snapshot, file, indent=2)
+    sidecar = sidecar_path(path)
+    with open(sidecar + ".tmp", "wb") as file:
+        np.savez(file, **{key: np.char.encode(value, "utf-8") if value.dtype.kind == "U" else value
+                          for key, value in arrays.items()})
+    os.replace(sidecar + ".tmp", sidecar)
+    os.replace(tmp_path, path)
+
+
+def load_arrays(path):
+    try:
+        with np.load(sidecar_path(path)) as data:
+            return {key: np.char.decode(data[key], "utf-8") if data[key].dtype.kind == "S" else data[key]
+                    for key in data.files}
+    except (OSError, ValueError):
+        return None
+
+
+def refresh(nodes_csv, edges_path, path=DEFAULT_SNAPSHOT, threshold=DEFAULT_THRESHOLD, force=False,
+            chunk_size=DEFAULT_CHUNK_SIZE):
+    """Bring the snapshot up to date; return (snapshot, names of the recomputed parts)."""
+    old = None if force else load_snapshot(path)
+    arrays = None if old is None else load_arrays(path)
+    if arrays is None:
+        old, arrays = None, {}
+    snapshot = {"version": SNAPSHOT_VERSION, "threshold": threshold}
+    recomputed = []
+
+    nodes_print = fingerprint(nodes_csv)
+    if old and old["nodes"]["source"] == nodes_print:
+        snapshot["nodes"] = old["nodes"]
+    else:
+        section, arrays["node_entries"] = node_stats(nodes_csv, chunk_size)
+        snapshot["nodes"] = {"source": nodes_print, **section}
+        recomputed.append("nodes")
+
+    edges_print = fingerprint(edges_path)
+    if old and old["edges"]["source"] == edges_print and old.get("threshold") == threshold:
+        snapshot["edges"] = old["edges"]
+    else:
+        section, arrays["edge_entries"], arrays["degree"] = edge_stats(edges_path, chunk_size)
+        snapshot["edges"] = {"source": edges_print, **section}
+        recomputed.append("edges")
+
+    if recomputed:
+        snapshot["summary"] = combine(snapshot["edges"], arrays["node_entries"], arrays["edge_entries"],
+                                      arrays["degree"])
+        snapshot["updated"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        save_snapshot(snapshot, arrays, path)
+    else:
+        snapshot = old
+    return snapshot, recomputed
+
+
+def format_statistics(snapshot):
+    """Lines for the GUI's statistics panel."""
+    nodes, edges, summary = snapshot["nodes"], snapshot["edges"], snapshot["summary"]
+    threshold = snapshot["threshold"]
+    hubs = ", ".join(edges["hubs"][:MAX_HUBS_SHOWN])
+    if len(edges["hubs"]) > MAX_HUBS_SHOWN:
+        hubs += f" and {len(edges['hubs']) - MAX_HUBS_SHOWN} more"
+    lines = [
+        f"Proteins: {nodes['proteins']}, relationships with similarity > {threshold}: {edges['edges']}",
+        f"Average interactions per protein with similarity > {threshold}: {summary['average_degree']:.2f}",
+        f"Most relationships of one protein with similarity > {threshold}: {edges['max_degree']}",
+        f"Protein with highest interactions with similarity > {threshold}: {hubs}",
+        "5 Most frequent EC number: " + ", ".join(f"{ec} - {count}" for ec, count in nodes["top_ec_numbers"][:5]),
+    ]
+    if nodes["top_organisms"]:
+        organism, count = nodes["top_organisms"][0]
+        lines.append(f"Top organism in dataset: {organism} ({count} proteins)")
+    lines.append(f"Proteins with no relationships with similarity > {threshold}: {summary['isolated_proteins']}")
+    if edges["mean_weight"] is not None:
+        lines.append(f"Mean similarity > {threshold}: {edges['mean_weight']:.2f}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute or refresh the dataset statistics snapshot.")
+    parser.add_argument("nodes", help="data/cleaned_mongodb.csv")
+    parser.add_argument("edges", help="data/edges2.csv or an edge store directory")
+    parser.add_argument("--snapshot", default=DEFAULT_SNAPSHOT)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="similarity threshold the edge file was built with (for the labels)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--force", action="store_true", help="recompute both parts")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    snapshot, recomputed = refresh(args.nodes, args.edges, args.snapshot, args.threshold, args.force,
+                                   args.chunk_size)
+    print("\n".join(format_statistics(snapshot)))
+    print(f"Recomputed: {', '.join(recomputed) or 'nothing, snapshot is current'} "
+          f"in {time.perf_counter() - start:.2f}s -> {args.snapshot}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""Per-protein degree, strength and strongest neighbour, stored on the proteins.
+
+"Which proteins have the most relationships" used to need a value_counts
+scan of edges2.csv, or a ``COUNT { (p)--() }`` per node in Neo4j at query
+time. ``compute`` streams the edge store (see edge_store.py) once and, for
+every threshold in ``thresholds``, counts each protein's edges with weight
+above it (degree) and sums their weights (strength) with ``np.bincount``.
+The strongest neighbour and its weight are tracked in the same pass; they do
+not depend on the threshold.
+
+The results are written back in bulk:
+
+``write_neo4j``
+    ``UNWIND $rows ... SET p += row.props`` batches over concurrent
+    sessions, plus a range index per degree property.
+``write_mongo``
+    Unordered ``UpdateOne`` ``$set`` bulk writes on the MoodleDB documents,
+    plus a descending index per degree field.
+
+Every write is stamped with a run id. Proteins that the run did not touch
+(no edges in the file) are then set to zero, so values from an older edge
+file do not linger. ``top_connected_neo4j`` / ``top_connected_mongo`` rank
+hubs from the indexed properties.
+
+Property names carry the threshold in hundredths: ``degree80`` and
+``strength80`` in Neo4j (camelCase, like ``entryName``), ``degree_80`` and
+``strength_80`` in MongoDB.
+
+Usage:
+    python degree_stats.py data/edges2.store --thresholds 0.8 0.9 0.95
+    python degree_stats.py data/edges2.csv --neo4j --mongo
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+from pymongo import DESCENDING, UpdateOne
+
+from edge_store import WEIGHT_DTYPE, EdgeStore, csv_to_store
+from neo4j_search import LABEL
+
+DEFAULT_THRESHOLDS = (0.8, 0.9, 0.95)
+DEFAULT_CHUNK_SIZE = 1_000_000
+DEFAULT_BATCH_SIZE = 10000
+DEFAULT_WRITERS = 4
+TOP_N = 10
+
+NEO4J_UPDATE = f"""
+UNWIND $rows AS row
+MATCH (p:{LABEL} {{entry: row.entry}})
+SET p += row.props
+"""
+NEO4J_ZERO_FILL = f"""
+MATCH (p:{LABEL})
+WHERE p.degreeRun IS NULL OR p.degreeRun <> $run
+CALL {{ WITH p SET p += $props }} IN TRANSACTIONS OF 10000 ROWS
+"""
+
+
+def suffix(threshold):
+    """0.8 -> "80", the threshold in hundredths used in property names."""
+    return str(round(threshold * 100))
+
+
+def neo4j_names(threshold):
+    return {"degree": f"degree{suffix(threshold)}", "strength": f"strength{suffix(threshold)}",
+            "neighbour": "topNeighbour", "weight": "topNeighbourWeight", "run": "degreeRun"}
+
+
+def mongo_names(threshold):
+    return {"degree": f"degree_{suffix(threshold)}", "strength": f"strength_{suffix(threshold)}",
+            "neighbour": "top_neighbour", "weight": "top_neighbour_weight", "run": "degree_run"}
+
+
+class DegreeStats:
+    """Per-protein results of ``compute``; arrays are indexed like ``proteins``."""
+
+    def __init__(self, proteins, thresholds, degree, strength, neighbour, weight):
+        self.proteins = proteins
+        self.thresholds = thresholds
+        self.degree = degree        # {threshold: int64 array}
+        self.strength = strength    # {threshold: float64 array}
+        self.neighbour = neighbour  # int64 protein id, -1 without edges
+        self.weight = weight        # weight of the edge to that neighbour
+
+    def __len__(self):
+        return len(self.proteins)
+
+    def top(self, threshold, n=TOP_N):
+        """(entry, degree) of the n highest-degree proteins, ties by entry."""
+        degree = self.degree[threshold]
+        order = np.lexsort((self.proteins, -degree))[:n]
+        return list(zip(self.proteins[order].tolist(), degree[order].tolist()))
+
+    def records(self, names):
+        """Yield (entry, {property: value}) using the given naming function."""
+        has_neighbour = self.neighbour >= 0
+        neighbours = np.where(has_neighbour, self.proteins[np.maximum(self.neighbour, 0)], "")
+        columns = []
+        for threshold in self.thresholds:
+            field = names(threshold)
+            columns.append((field["degree"], self.degree[threshold].tolist()))
+            columns.append((field["strength"], np.round(self.strength[threshold], 6).tolist()))
+        field = names(self.thresholds[0])
+        columns.append((field["neighbour"], [n or None for n in neighbours.tolist()]))
+        columns.append((field["weight"], np.where(has_neighbour, self.weight, 0.0).astype(float).tolist()))
+        keys = [key for key, _ in columns]
+        for entry, values in zip(self.proteins.tolist(), zip(*(values for _, values in columns))):
+            yield entry, dict(zip(keys, values))
+
+
+def compute(edges_path, thresholds=DEFAULT_THRESHOLDS, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Stream an edge CSV or edge store once; return DegreeStats."""
+    if not os.path.isdir(edges_path):
+        with tempfile.TemporaryDirectory() as store_path:
+            csv_to_store(edges_path, store_path)
+            return compute_from_store(EdgeStore(store_path), thresholds, chunk_size)
+    return compute_from_store(EdgeStore(edges_path), thresholds, chunk_size)
+
+
+def compute_from_store(store, thresholds=DEFAULT_THRESHOLDS, chunk_size=DEFAULT_CHUNK_SIZE):
+    thresholds = tuple(sorted(thresholds))
+    n = len(store.proteins)
+    degree = {t: np.zeros(n, dtype=np.int64) for t in thresholds}
+    strength = {t: np.zeros(n, dtype=np.float64) for t in thresholds}
+    neighbour = np.full(n, -1, dtype=np.int64)
+    best = np.full(n, -np.inf)
+
+    for start in range(0, len(store), chunk_size):
+        stop = start + chunk_size
+        source = np.asarray(store.source[start:stop], dtype=np.int64)
+        target = np.asarray(store.target[start:stop], dtype=np.int64)
+        weight = np.asarray(store.weight[start:stop], dtype=np.float64)
+        # Each undirected edge counts for both of its proteins
+        nodes = np.concatenate([source, target])
+        others = np.concatenate([target, source])
+        weights = np.concatenate([weight, weight])
+        for t in thresholds:
+            # Compare at the store's float32 precision, like EdgeStore.select and CSRGraph, so an
+            # edge of exactly 0.8 (stored as 0.80000001) is not counted as above 0.8
+            above = weights > float(WEIGHT_DTYPE(t))
+            degree[t] += np.bincount(nodes[above], minlength=n)
+            strength[t] += np.bincount(nodes[above], weights=weights[above], minlength=n)
+
+        # Strongest edge per protein in this chunk, then keep it if it beats the running best
+        order = np.lexsort((others, -weights, nodes))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = nodes[order][1:] != nodes[order][:-1]
+        chunk_nodes, chunk_others, chunk_weights = nodes[order][first], others[order][first], weights[order][first]
+        better = chunk_weights > best[chunk_nodes]
+        best[chunk_nodes[better]] = chunk_weights[better]
+        neighbour[chunk_nodes[better]] = chunk_others[better]
+
+    proteins = np.char.decode(np.asarray(store.proteins), "ascii")
+    return DegreeStats(proteins, thresholds, degree, strength, neighbour, np.where(neighbour >= 0, best, 0.0))
+
+
+def batched(records, batch_size):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def zero_values(stats, names):
+    values = {}
+    for threshold in stats.thresholds:
+        field = names(threshold)
+        values[field["degree"]] = 0
+        values[field["strength"]] = 0.0
+    field = names(stats.thresholds[0])
+    values[field["neighbour"]] = None
+    values[field["weight"]] = 0.0
+    return values
+
+
+def write_neo4j(driver, stats, batch_size=DEFAULT_BATCH_SIZE, sessions=DEFAULT_WRITERS):
+    """Set the properties on the Protein nodes; return (rows, seconds)."""
+    from neo4j_loader import run_batches
+
+    run = time.strftime("%Y%m%d%H%M%S")
+    rows = ({"entry": entry, "props": {**props, "degreeRun": run}}
+            for entry, props in stats.records(neo4j_names))
+    written = run_batches(driver, NEO4J_UPDATE, batched(rows, batch_size), sessions)
+    with driver.session() as session:
+        session.run(NEO4J_ZERO_FILL, run=run,
+                    props={**zero_values(stats, neo4j_names), "degreeRun": run}).consume()
+        for threshold in stats.thresholds:
+            prop = neo4j_names(threshold)["degree"]
+            session.run(f"CREATE INDEX protein_{prop} IF NOT EXISTS FOR (p:{LABEL}) ON (p.{prop})").consume()
+    return written
+
+
+def write_mongo_batch(collection, rows):
+    collection.bulk_write([UpdateOne({"Entry": entry}, {"$set": fields}) for entry, fields in rows],
+                          ordered=False)
+    return len(rows)
+
+
+def write_mongo(collection, stats, batch_size=DEFAULT_BATCH_SIZE, writers=DEFAULT_WRITERS):
+    """Set the fields on the MoodleDB documents; return (rows, seconds)."""
+    run = time.strftime("%Y%m%d%H%M%S")
+    start = time.perf_counter()
+    written = 0
+    pending = set()
+    rows = ((entry, {**fields, "degree_run": run}) for entry, fields in stats.records(mongo_names))
+    with ThreadPoolExecutor(max_workers=writers) as pool:
+        for batch in batched(rows, batch_size):
+            if len(pending) >= 2 * writers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                written += sum(future.result() for future in done)
+            pending.add(pool.submit(write_mongo_batch, collection, batch))
+        written += sum(future.result() for future in pending)
+
+    collection.update_many({"degree_run": {"$ne": run}},
+                           {"$set": {**zero_values(stats, mongo_names), "degree_run": run}})
+    for threshold in stats.thresholds:
+        field = mongo_names(threshold)["degree"]
+        collection.create_index([(field, DESCENDING)], name=field)
+    return written, time.perf_counter() - start
+
+
+def top_connected_neo4j(session, threshold=DEFAULT_THRESHOLDS[0], limit=TOP_N):
+    """(entry, degree) of the best-connected proteins, read through the degree index."""
+    prop = neo4j_names(threshold)["degree"]
+    result = session.run(f"MATCH (p:{LABEL}) WHERE p.{prop} IS NOT NULL "
+                         f"RETURN p.entry AS entry, p.{prop} AS degree "
+                         f"ORDER BY degree DESC, entry LIMIT $limit", limit=limit)
+    return [(record["entry"], record["degree"]) for record in result]
+
+
+def top_connected_mongo(collection, threshold=DEFAULT_THRESHOLDS[0], limit=TOP_N):
+    """(entry, degree) of the best-connected proteins, read through the degree index."""
+    field = mongo_names(threshold)["degree"]
+    cursor = collection.find({field: {"$gt": 0}}, {"Entry": 1, field: 1, "_id": 0})
+    return [(d["Entry"], d[field]) for d in cursor.sort([(field, DESCENDING), ("Entry", 1)]).limit(limit)]
+
+
+def format_degree(record, names, threshold=DEFAULT_THRESHOLDS[0]):
+    """One result-panel line from a stored document or node, or "" if it has no degree fields."""
+    field = names(threshold)
+    if record.get(field["degree"]) is None:
+        return ""
+    line = f"Similar proteins (> {threshold}): {record[field['degree']]}"
+    if record.get(field["neighbour"]):
+        line += f", strongest {record[field['neighbour']]} ({record[field['weight']]:.2f})"
+    return line
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute per-protein degree and strength.")
+    parser.add_argument("edges", help="data/edges2.csv or an edge store directory")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=list(DEFAULT_THRESHOLDS))
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--writers", type=int, default=DEFAULT_WRITERS, help="concurrent writers")
+    parser.add_argument("--neo4j", action="store_true", help="write Protein node properties")
+    parser.add_argument("--mongo", action="store_true", help="write MoodleDB document fields")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = compute(args.edges, args.thresholds, args.chunk_size)
+    print(f"Computed {len(stats)} proteins in {time.perf_counter() - start:.1f}s")
+    for threshold in stats.thresholds:
+        top = ", ".join(f"{entry} ({degree})" for entry, degree in stats.top(threshold, 5))
+        print(f"  > {threshold}: top degree {top}")
+
+    if args.neo4j or args.mongo:
+        import connections
+        from query_cache import clear_disk_cache
+        try:
+            if args.neo4j:
+                count, seconds = write_neo4j(connections.get_neo4j_driver(), stats, args.batch_size,
+                                             args.writers)
+                print(f"Neo4j: {count} proteins in {seconds:.1f}s")
+            if args.mongo:
+                count, seconds = write_mongo(connections.get_mongo_collection(), stats, args.batch_size,
+                                             args.writers)
+                print(f"MongoDB: {count} documents in {seconds:.1f}s")
+            clear_disk_cache()  # cached result panels predate the new fields
+        finally:
+            connections.close_all()
+
+
+if __name__ == "__main__":
+    main()
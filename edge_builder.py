@@ -0,0 +1,187 @@
+"""Build Jaccard similarity edges between proteins from their InterPro domains.
+
+This replaces the ``combinations(df.iterrows(), 2)`` loops in
+dataset_prep.ipynb. Every protein becomes a row of a sparse protein x domain
+incidence matrix, intersections come from a blocked sparse product and unions
+from the row sizes, so no Python code runs per candidate pair.
+
+For high thresholds the ``prefix`` method (see similarity_join.py) only
+verifies candidate pairs that can still pass the threshold. For datasets too
+large for any exact method, ``minhash`` (see minhash_lsh.py) finds the edges
+approximately with MinHash signatures and banded LSH.
+
+The output is the same ``Protein1,Protein2,Weight`` CSV as edges.csv /
+edges2.csv: one row per pair with Protein1 listed before Protein2 in the
+input, and a weight strictly above the threshold.
+
+Usage:
+    python edge_builder.py data/cleaned_mongodb.csv data/edges2.csv --threshold 0.8
+    python edge_builder.py data/cleaned_mongodb.csv data/edges2.csv --threshold 0.8 --method prefix
+    python edge_builder.py uniprot.tsv edges2.csv --threshold 0.8 --method minhash --verify --recall-sample 500
+"""
+import argparse
+import ast
+import csv
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from minhash_lsh import DEFAULT_BANDS, DEFAULT_ROWS, estimate_recall, lsh_threshold, minhash_join
+from similarity_join import prefix_join
+
+EDGE_HEADER = ["Protein1", "Protein2", "Weight"]
+DEFAULT_BLOCK_SIZE = 1000
+METHODS = ("sparse", "prefix", "minhash")
+
+
+def split_interpro(value):
+    """Split an InterPro field into tokens exactly like the notebook does."""
+    if isinstance(value, (list, tuple, set)):
+        return list(value)
+    if not isinstance(value, str):
+        return []
+    if value.startswith("["):
+        # cleaned_mongodb.csv stores the list repr written by pandas
+        return ast.literal_eval(value)
+    # Raw UniProt fields end with ';', which leaves an empty token that every
+    # protein shares. It is kept on purpose so weights match edges2.csv.
+    return value.split(";")
+
+
+def load_proteins(path):
+    """Read Entry and InterPro tokens from the raw TSV or cleaned_mongodb.csv."""
+    sep = "\t" if path.endswith(".tsv") else ","
+    df = pd.read_csv(path, sep=sep, usecols=["Entry", "InterPro"])
+    df = df.dropna(subset=["InterPro"]).drop_duplicates(subset=["Entry"])
+    return df["Entry"].tolist(), [split_interpro(v) for v in df["InterPro"]]
+
+
+def build_incidence(token_lists):
+    """Encode token lists as a binary CSR protein x domain matrix."""
+    vocabulary = {}
+    indptr = [0]
+    indices = []
+    for tokens in token_lists:
+        columns = {vocabulary.setdefault(t, len(vocabulary)) for t in tokens}
+        indices.extend(sorted(columns))
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.int32)
+    matrix = sparse.csr_matrix(
+        (data, np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(token_lists), len(vocabulary)),
+    )
+    return matrix, vocabulary
+
+
+def jaccard_block(matrix, sizes, row_start, row_stop, col_start, col_stop, threshold):
+    """Return (rows, cols, weights) for pairs i < j of one block above the threshold."""
+    product = (matrix[row_start:row_stop] @ matrix[col_start:col_stop].T).tocoo()
+    rows = product.row.astype(np.int64) + row_start
+    cols = product.col.astype(np.int64) + col_start
+    keep = cols > rows
+    rows, cols, intersection = rows[keep], cols[keep], product.data[keep]
+
+    union = sizes[rows] + sizes[cols] - intersection
+    weights = intersection / union
+    keep = weights > threshold
+    rows, cols, weights = rows[keep], cols[keep], weights[keep]
+
+    order = np.lexsort((cols, rows))
+    return rows[order], cols[order], weights[order]
+
+
+def iter_jaccard_edges(matrix, threshold=0.0, block_size=DEFAULT_BLOCK_SIZE):
+    """Yield (rows, cols, weights) blocks covering every pair i < j in row order."""
+    if threshold < 0:
+        raise ValueError("threshold must be >= 0")
+    matrix = sparse.csr_matrix(matrix)
+    sizes = np.diff(matrix.indptr).astype(np.int64)
+    n = matrix.shape[0]
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        yield jaccard_block(matrix, sizes, start, stop, start, n, threshold)
+
+
+def write_edges(path, entries, blocks):
+    """Write edge blocks as a Protein1,Protein2,Weight CSV and return the row count."""
+    entries = np.asarray(entries, dtype=object)
+    count = 0
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(EDGE_HEADER)
+        for rows, cols, weights in blocks:
+            writer.writerows(zip(entries[rows], entries[cols], weights.tolist()))
+            count += len(weights)
+    return count
+
+
+def build_edges(entries, interpro, path, threshold=0.0, block_size=DEFAULT_BLOCK_SIZE,
+                method="sparse", **minhash_options):
+    """Compute all Jaccard edges above the threshold and write them to path.
+
+    ``minhash_options`` (bands, rows, verify, seed) are passed to
+    minhash_lsh.minhash_join when ``method="minhash"``.
+    """
+    token_lists = [split_interpro(v) for v in interpro]
+    if method == "prefix":
+        blocks = [prefix_join(token_lists, threshold)]
+    elif method == "minhash":
+        matrix, _ = build_incidence(token_lists)
+        blocks = [minhash_join(matrix, threshold, **minhash_options)]
+    elif method == "sparse":
+        matrix, _ = build_incidence(token_lists)
+        blocks = iter_jaccard_edges(matrix, threshold, block_size)
+    else:
+        raise ValueError(f"Unknown method {method!r}, expected one of {METHODS}")
+    return write_edges(path, entries, blocks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build Jaccard similarity edges from InterPro domains.")
+    parser.add_argument("input", help="raw UniProt TSV or data/cleaned_mongodb.csv")
+    parser.add_argument("output", help="edge CSV to write (Protein1,Protein2,Weight)")
+    parser.add_argument("--threshold", type=float, default=0.0,
+                        help="keep pairs with similarity strictly above this value")
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE,
+                        help="proteins per row block of the sparse product")
+    parser.add_argument("--method", choices=METHODS, default="sparse",
+                        help="sparse: blocked sparse product over all pairs; "
+                             "prefix: inverted-index join with length/prefix filtering; "
+                             "minhash: approximate MinHash-LSH")
+    parser.add_argument("--bands", type=int, default=DEFAULT_BANDS, help="LSH bands (minhash)")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="rows per LSH band (minhash)")
+    parser.add_argument("--verify", action="store_true",
+                        help="re-score MinHash candidates with exact Jaccard (minhash)")
+    parser.add_argument("--recall-sample", type=int, default=0,
+                        help="estimate recall against exact edges for this many proteins (minhash)")
+    parser.add_argument("--seed", type=int, default=0, help="hash seed (minhash)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    entries, interpro = load_proteins(args.input)
+    if args.method != "minhash":
+        count = build_edges(entries, interpro, args.output, args.threshold, args.block_size,
+                            args.method)
+        print(f"Wrote {count} edges for {len(entries)} proteins to {args.output} "
+              f"in {time.perf_counter() - start:.1f}s")
+        return
+
+    print(f"MinHash-LSH with {args.bands} bands x {args.rows} rows, "
+          f"S-curve threshold ~{lsh_threshold(args.bands, args.rows):.2f}")
+    matrix, _ = build_incidence([split_interpro(v) for v in interpro])
+    rows, cols, weights = minhash_join(matrix, args.threshold, args.bands, args.rows,
+                                       args.verify, args.seed)
+    count = write_edges(args.output, entries, [(rows, cols, weights)])
+    print(f"Wrote {count} edges for {len(entries)} proteins to {args.output} "
+          f"in {time.perf_counter() - start:.1f}s")
+    if args.recall_sample:
+        recall, exact = estimate_recall(matrix, rows, cols, args.threshold,
+                                        args.recall_sample, args.seed)
+        print(f"Estimated recall {recall:.3f} over {exact} exact edges "
+              f"touching {args.recall_sample} sampled proteins")
+
+
+if __name__ == "__main__":
+    main()
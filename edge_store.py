@@ -0,0 +1,214 @@
+"""Binary, memory-mappable edge store as an alternative to edges.csv / edges2.csv.
+
+A store is a directory of plain ``.npy`` arrays plus a JSON manifest:
+
+    manifest.json   format version, edge and protein counts
+    proteins.npy    interned accession table (fixed-width ASCII)
+    source.npy      int32 index into proteins.npy, one per edge (Protein1)
+    target.npy      int32 index into proteins.npy, one per edge (Protein2)
+    weight.npy      float32 Jaccard similarity, one per edge
+
+``EdgeStore`` opens the arrays with ``mmap_mode="r"``, so opening is instant
+and weight filters are a single vectorised comparison with no parsing.
+Weights are kept at float32 precision, so converting back to CSV prints the
+shortest float32 repr (0.8333333 instead of 0.8333333333333334).
+
+Usage:
+    python edge_store.py from-csv data/edges2.csv data/edges2.store
+    python edge_store.py to-csv data/edges2.store data/edges2_roundtrip.csv
+    python edge_store.py report data/edges2.csv data/edges2.store
+"""
+import argparse
+import csv
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+ID_DTYPE = np.int32
+WEIGHT_DTYPE = np.float32
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+
+class EdgeStore:
+    """Read-only view of an edge store directory."""
+
+    def __init__(self, path, mmap_mode="r"):
+        with open(os.path.join(path, MANIFEST)) as file:
+            self.manifest = json.load(file)
+        if self.manifest.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path} has edge store version {self.manifest.get('version')}, "
+                             f"expected {FORMAT_VERSION}")
+        self.path = path
+        self.edges = self.manifest["edges"]
+        self.proteins = np.load(os.path.join(path, "proteins.npy"), mmap_mode=mmap_mode)
+        self.source = np.load(os.path.join(path, "source.npy"), mmap_mode=mmap_mode)
+        self.target = np.load(os.path.join(path, "target.npy"), mmap_mode=mmap_mode)
+        self.weight = np.load(os.path.join(path, "weight.npy"), mmap_mode=mmap_mode)
+
+    def __len__(self):
+        return self.edges
+
+    def entries(self, ids):
+        """Accession strings for an array of protein ids."""
+        return np.char.decode(self.proteins[ids], "ascii")
+
+    def select(self, min_weight=None, max_weight=None):
+        """Indices of edges with min_weight < weight <= max_weight."""
+        mask = np.ones(len(self), dtype=bool)
+        if min_weight is not None:
+            mask &= self.weight > min_weight
+        if max_weight is not None:
+            mask &= self.weight <= max_weight
+        return np.flatnonzero(mask)
+
+    def to_frame(self, min_weight=None, max_weight=None):
+        """Edges as a Protein1/Protein2/Weight DataFrame, like pd.read_csv(edges2.csv)."""
+        index = self.select(min_weight, max_weight)
+        return pd.DataFrame({
+            "Protein1": self.entries(self.source[index]),
+            "Protein2": self.entries(self.target[index]),
+            "Weight": self.weight[index],
+        })
+
+
+def write_manifest(path, edges, proteins, source_file=None):
+    manifest = {"format": "edge-store", "version": FORMAT_VERSION, "edges": int(edges),
+                "proteins": int(proteins), "source_file": source_file}
+    with open(os.path.join(path, MANIFEST), "w") as file:
+        json.dump(manifest, file, indent=2)
+
+
+def write_store(path, proteins, source, target, weight, source_file=None):
+    """Write in-memory arrays as an edge store."""
+    os.makedirs(path, exist_ok=True)
+    proteins = np.asarray(proteins, dtype=object).astype(str)
+    np.save(os.path.join(path, "proteins.npy"), np.char.encode(proteins, "ascii"))
+    np.save(os.path.join(path, "source.npy"), np.asarray(source, dtype=ID_DTYPE))
+    np.save(os.path.join(path, "target.npy"), np.asarray(target, dtype=ID_DTYPE))
+    np.save(os.path.join(path, "weight.npy"), np.asarray(weight, dtype=WEIGHT_DTYPE))
+    write_manifest(path, len(weight), len(proteins), source_file)
+
+
+def count_rows(csv_path):
+    """Upper bound on the data rows of a CSV file, counted without parsing it.
+
+    Blank lines and quoted newlines are counted too, so the real row count can
+    be lower.
+    """
+    lines = 0
+    last = b"\n"
+    with open(csv_path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 24), b""):
+            lines += block.count(b"\n")
+            last = block[-1:]
+    if last != b"\n":
+        lines += 1
+    return max(lines - 1, 0)
+
+
+def truncate_array(npy_path, length):
+    """Rewrite a .npy file keeping only its first ``length`` rows."""
+    array = np.load(npy_path, mmap_mode="r")
+    np.save(npy_path + ".tmp.npy", array[:length])
+    del array
+    os.replace(npy_path + ".tmp.npy", npy_path)
+
+
+def csv_to_store(csv_path, path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Convert an edge CSV into a store in two streaming passes; return the edge count."""
+    os.makedirs(path, exist_ok=True)
+    total = count_rows(csv_path)
+    source = np.lib.format.open_memmap(os.path.join(path, "source.npy"), mode="w+",
+                                       dtype=ID_DTYPE, shape=(total,))
+    target = np.lib.format.open_memmap(os.path.join(path, "target.npy"), mode="w+",
+                                       dtype=ID_DTYPE, shape=(total,))
+    weight = np.lib.format.open_memmap(os.path.join(path, "weight.npy"), mode="w+",
+                                       dtype=WEIGHT_DTYPE, shape=(total,))
+
+    ids = {}
+    offset = 0
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_size, dtype={"Protein1": str, "Protein2": str}):
+        stop = offset + len(chunk)
+        source[offset:stop] = [ids.setdefault(p, len(ids)) for p in chunk["Protein1"]]
+        target[offset:stop] = [ids.setdefault(p, len(ids)) for p in chunk["Protein2"]]
+        weight[offset:stop] = chunk["Weight"].to_numpy(dtype=WEIGHT_DTYPE)
+        offset = stop
+    source.flush(), target.flush(), weight.flush()
+    del source, target, weight
+    if offset < total:
+        for name in ("source.npy", "target.npy", "weight.npy"):
+            truncate_array(os.path.join(path, name), offset)
+
+    np.save(os.path.join(path, "proteins.npy"), np.char.encode(np.array(list(ids), dtype=str), "ascii"))
+    write_manifest(path, offset, len(ids), os.path.basename(csv_path))
+    return offset
+
+
+def store_to_csv(path, csv_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Write a store back out as a Protein1,Protein2,Weight CSV; return the edge count."""
+    store = EdgeStore(path)
+    proteins = np.char.decode(np.asarray(store.proteins), "ascii").astype(object)
+    with open(csv_path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Protein1", "Protein2", "Weight"])
+        for start in range(0, len(store), chunk_size):
+            stop = start + chunk_size
+            writer.writerows(zip(proteins[store.source[start:stop]],
+                                 proteins[store.target[start:stop]],
+                                 store.weight[start:stop].astype(str)))
+    return len(store)
+
+
+def report(csv_path, path, min_weight=0.9):
+    """Print size and load/filter time of the CSV next to the store."""
+    csv_size = os.path.getsize(csv_path)
+    store_size = sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+    start = time.perf_counter()
+    frame = pd.read_csv(csv_path)
+    selected = int((frame["Weight"] > min_weight).sum())
+    csv_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    store = EdgeStore(path)
+    store_selected = len(store.select(min_weight))
+    store_seconds = time.perf_counter() - start
+
+    print(f"{'':>8} {'size MB':>9} {'load+filter s':>14} {'weight > ' + str(min_weight):>14}")
+    print(f"{'csv':>8} {csv_size / 1e6:>9.1f} {csv_seconds:>14.3f} {selected:>14}")
+    print(f"{'store':>8} {store_size / 1e6:>9.1f} {store_seconds:>14.3f} {store_selected:>14}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert and inspect binary edge stores.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    from_csv = commands.add_parser("from-csv", help="convert an edge CSV into a store")
+    from_csv.add_argument("csv")
+    from_csv.add_argument("store")
+    to_csv = commands.add_parser("to-csv", help="convert a store back into an edge CSV")
+    to_csv.add_argument("store")
+    to_csv.add_argument("csv")
+    compare = commands.add_parser("report", help="compare size and load time with the CSV")
+    compare.add_argument("csv")
+    compare.add_argument("store")
+    compare.add_argument("--min-weight", type=float, default=0.9)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == "from-csv":
+        count = csv_to_store(args.csv, args.store)
+        print(f"Wrote {count} edges to {args.store} in {time.perf_counter() - start:.1f}s")
+    elif args.command == "to-csv":
+        count = store_to_csv(args.store, args.csv)
+        print(f"Wrote {count} edges to {args.csv} in {time.perf_counter() - start:.1f}s")
+    else:
+        report(args.csv, args.store, args.min_weight)
+
+
+if __name__ == "__main__":
+    main()
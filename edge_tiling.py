@@ -0,0 +1,186 @@
+"""Resumable, tiled all-pairs Jaccard edge build.
+
+The old edges2.csv cell only compared proteins inside the same 500-row batch,
+so every pair that straddled two batches was silently dropped. Here the
+protein list is cut into blocks and every (i-block, j-block) tile with
+i <= j is scored once. Diagonal tiles keep only pairs with row < col, so
+every unordered pair is covered exactly once.
+
+Tiles run in row-major order, and each tile's product is bounded by the tile
+size, which is derived from a memory budget. Every finished tile is written to
+its own shard (``tile_<i>_<j>.npz`` with row/col indices and weights) and then
+appended to ``completed_tiles.txt``. A killed run restarted with the same
+arguments skips everything already listed there. ``merge_shards`` turns the
+shards into the usual Protein1,Protein2,Weight CSV in the same row order as
+edge_builder.
+
+Usage:
+    python edge_tiling.py data/cleaned_mongodb.csv data/edge_tiles data/edges2.csv --threshold 0.8 --memory-mb 1024
+"""
+import argparse
+import json
+import math
+import os
+import time
+
+import numpy as np
+from scipy import sparse
+
+from edge_builder import build_incidence, jaccard_block, load_proteins, split_interpro, write_edges
+
+MANIFEST = "manifest.json"
+COMPLETED = "completed_tiles.txt"
+# Worst-case bytes held per candidate pair of a tile: the COO product
+# (row, col, data) plus the int64/float64 arrays derived from it
+BYTES_PER_PAIR = 64
+MIN_TILE_SIZE = 64
+
+
+def tile_size_for_budget(n_proteins, memory_mb):
+    """Largest tile edge whose dense worst case fits in the memory budget."""
+    size = int(math.sqrt(memory_mb * 1024 * 1024 / BYTES_PER_PAIR))
+    return max(MIN_TILE_SIZE, min(size, max(n_proteins, 1)))
+
+
+def iter_tiles(n_proteins, tile_size):
+    """Yield (i, j) block indices with i <= j in row-major order."""
+    blocks = math.ceil(n_proteins / tile_size)
+    for i in range(blocks):
+        for j in range(i, blocks):
+            yield i, j
+
+
+def shard_path(work_dir, i, j):
+    return os.path.join(work_dir, f"tile_{i:05d}_{j:05d}.npz")
+
+
+def open_checkpoint(work_dir, params):
+    """Create or validate the manifest and return the set of finished tiles."""
+    os.makedirs(work_dir, exist_ok=True)
+    manifest_path = os.path.join(work_dir, MANIFEST)
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as file:
+            saved = json.load(file)
+        if saved != params:
+            raise ValueError(f"{work_dir} holds a run with different parameters: {saved}; "
+                             f"use a new work directory or delete it")
+    else:
+        with open(manifest_path, "w") as file:
+            json.dump(params, file, indent=2)
+
+    done = set()
+    completed_path = os.path.join(work_dir, COMPLETED)
+    if os.path.exists(completed_path):
+        with open(completed_path) as file:
+            lines = file.read().split("\n")
+        # The last line has no newline only if a crash tore it: drop it and
+        # terminate it so the next append starts on a fresh line
+        if lines[-1]:
+            with open(completed_path, "a") as file:
+                file.write("\n")
+        for line in lines[:-1]:
+            parts = line.split()
+            if len(parts) == 3:
+                done.add((int(parts[0]), int(parts[1])))
+    return done
+
+
+def mark_done(work_dir, i, j, count):
+    """Append a finished tile to the completed log and flush it to disk."""
+    with open(os.path.join(work_dir, COMPLETED), "a") as file:
+        file.write(f"{i} {j} {count}\n")
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def run_tile(matrix, sizes, tile_size, i, j, threshold):
+    """Score one tile and return its (rows, cols, weights)."""
+    n = matrix.shape[0]
+    row_start, col_start = i * tile_size, j * tile_size
+    return jaccard_block(matrix, sizes, row_start, min(row_start + tile_size, n),
+                         col_start, min(col_start + tile_size, n), threshold)
+
+
+def save_shard(work_dir, i, j, rows, cols, weights):
+    """Write a tile shard atomically so a crash never leaves a half-written file."""
+    path = shard_path(work_dir, i, j)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as file:
+        np.savez(file, rows=rows, cols=cols, weights=weights)
+    os.replace(tmp_path, path)
+
+
+def build_tiles(matrix, work_dir, threshold=0.0, memory_mb=512, tile_size=None):
+    """Score every unfinished tile into work_dir and return the tile size used."""
+    if threshold < 0:
+        raise ValueError("threshold must be >= 0")
+    matrix = sparse.csr_matrix(matrix)
+    n = matrix.shape[0]
+    tile_size = tile_size or tile_size_for_budget(n, memory_mb)
+    params = {"proteins": n, "domains": matrix.shape[1], "nnz": int(matrix.nnz),
+              "threshold": threshold, "tile_size": tile_size}
+    done = open_checkpoint(work_dir, params)
+
+    sizes = np.diff(matrix.indptr).astype(np.int64)
+    tiles = list(iter_tiles(n, tile_size))
+    remaining = [tile for tile in tiles if tile not in done]
+    print(f"{len(tiles)} tiles of {tile_size} proteins, {len(tiles) - len(remaining)} already done")
+    for number, (i, j) in enumerate(remaining, 1):
+        rows, cols, weights = run_tile(matrix, sizes, tile_size, i, j, threshold)
+        save_shard(work_dir, i, j, rows, cols, weights)
+        mark_done(work_dir, i, j, len(weights))
+        print(f"Processed tile ({i}, {j}) - {len(weights)} edges [{number}/{len(remaining)}]")
+    return tile_size
+
+
+def iter_merged_blocks(work_dir, n_proteins, tile_size):
+    """Yield each row block's edges from its shards, sorted by (row, col)."""
+    blocks = math.ceil(n_proteins / tile_size)
+    for i in range(blocks):
+        parts = []
+        for j in range(i, blocks):
+            with np.load(shard_path(work_dir, i, j)) as shard:
+                parts.append((shard["rows"], shard["cols"], shard["weights"]))
+        rows = np.concatenate([p[0] for p in parts])
+        cols = np.concatenate([p[1] for p in parts])
+        weights = np.concatenate([p[2] for p in parts])
+        order = np.lexsort((cols, rows))
+        yield rows[order], cols[order], weights[order]
+
+
+def merge_shards(work_dir, entries, output):
+    """Combine all tile shards into one Protein1,Protein2,Weight CSV."""
+    with open(os.path.join(work_dir, MANIFEST)) as file:
+        params = json.load(file)
+    done = open_checkpoint(work_dir, params)
+    expected = set(iter_tiles(params["proteins"], params["tile_size"]))
+    if expected - done:
+        raise RuntimeError(f"{len(expected - done)} tiles are not finished yet; rerun the build first")
+    return write_edges(output, entries,
+                       iter_merged_blocks(work_dir, params["proteins"], params["tile_size"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumable tiled Jaccard edge build.")
+    parser.add_argument("input", help="raw UniProt TSV or data/cleaned_mongodb.csv")
+    parser.add_argument("work_dir", help="directory for tile shards and the checkpoint manifest")
+    parser.add_argument("output", help="merged edge CSV to write (Protein1,Protein2,Weight)")
+    parser.add_argument("--threshold", type=float, default=0.0,
+                        help="keep pairs with similarity strictly above this value")
+    parser.add_argument("--memory-mb", type=float, default=512,
+                        help="memory budget per tile, used to derive the tile size")
+    parser.add_argument("--tile-size", type=int, default=None,
+                        help="override the tile size derived from --memory-mb")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    entries, interpro = load_proteins(args.input)
+    matrix, _ = build_incidence([split_interpro(v) for v in interpro])
+    build_tiles(matrix, args.work_dir, args.threshold, args.memory_mb, args.tile_size)
+    count = merge_shards(args.work_dir, entries, args.output)
+    print(f"Wrote {count} edges for {len(entries)} proteins to {args.output} "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""Layout and level-of-detail rendering for the neighbourhood graph panel.
+
+draw_graph used to run Kamada-Kawai (all-pairs shortest paths) and draw
+through networkx: one patch per arrow and one text artist per node and per
+edge label. That is fine for a dozen proteins but dominates once the
+``LIMIT 500`` neighbourhood fills up. This module provides:
+
+``compute_layout``
+    Kamada-Kawai for small graphs, and for larger ones a vectorised
+    Fruchterman-Reingold layout in NumPy. Up to ``EXACT_REPULSION_LIMIT``
+    nodes, repulsion is computed over all pairs. Above that, each node is
+    repelled by the centres of mass of a coarse grid of cells (the node
+    itself is taken out of its own cell), so each iteration costs
+    O(n * cells) instead of O(n^2).
+``LayoutCache``
+    Layouts of recent query results, so showing a result again (or zooming)
+    never reruns the layout.
+``GraphRenderer``
+    Draws edges as one ``LineCollection`` and nodes as one scatter. Node
+    labels and edge weight labels are only drawn while the number of nodes
+    / edges inside the current view is below ``NODE_LABEL_LIMIT`` /
+    ``EDGE_LABEL_LIMIT``, so they disappear on large graphs and come back
+    when the user zooms in.
+"""
+from collections import OrderedDict
+
+import numpy as np
+import networkx as nx
+from matplotlib.collections import LineCollection
+
+LAYOUTS = ("auto", "kamada_kawai", "force")
+KAMADA_KAWAI_MAX_NODES = 150
+EXACT_REPULSION_LIMIT = 1000
+MAX_GRID = 16
+DEFAULT_ITERATIONS = 80
+
+NODE_LABEL_LIMIT = 60
+EDGE_LABEL_LIMIT = 40
+NODE_SIZE = 500
+MIN_NODE_SIZE = 20
+MARGIN = 0.1
+DEFAULT_LAYOUT_CACHE_SIZE = 32
+
+
+def graph_arrays(nodes, edges):
+    """Turn (entry, name) nodes and (source, target, weight) edges into arrays.
+
+    Returns (entries, sources, targets, weights); sources and targets index
+    into the sorted ``entries`` list.
+    """
+    entries = sorted({node[0] for node in nodes} | {e[0] for e in edges} | {e[1] for e in edges})
+    index = {entry: i for i, entry in enumerate(entries)}
+    sources = np.fromiter((index[e[0]] for e in edges), dtype=np.int64, count=len(edges))
+    targets = np.fromiter((index[e[1]] for e in edges), dtype=np.int64, count=len(edges))
+    weights = np.fromiter((e[2] for e in edges), dtype=np.float64, count=len(edges))
+    return entries, sources, targets, weights
+
+
+def exact_repulsion(pos, k):
+    delta = pos[:, None, :] - pos[None, :, :]
+    dist2 = np.einsum("ijk,ijk->ij", delta, delta) + 1e-9
+    return np.einsum("ijk,ij->ik", delta, k * k / dist2)
+
+
+def grid_repulsion(pos, k, grid):
+    """Repulsion from the centre of mass of each occupied grid cell."""
+    low = pos.min(axis=0)
+    span = pos.max(axis=0) - low + 1e-9
+    cells = np.minimum(((pos - low) / span * grid).astype(np.int64), grid - 1)
+    cell_ids = cells[:, 0] * grid + cells[:, 1]
+    occupied, own, mass = np.unique(cell_ids, return_inverse=True, return_counts=True)
+    sums = np.zeros((len(occupied), 2))
+    np.add.at(sums, own, pos)
+    centres = sums / mass[:, None]
+
+    delta = pos[:, None, :] - centres[None, :, :]
+    dist2 = np.einsum("ijk,ijk->ij", delta, delta) + 1e-9
+    strength = k * k * mass[None, :] / dist2
+    rows = np.arange(len(pos))
+    strength[rows, own] = 0.0  # the own cell is redone below without the node itself
+    disp = np.einsum("ijk,ij->ik", delta, strength)
+
+    others = mass[own] - 1
+    has_others = others > 0
+    rest = (sums[own][has_others] - pos[has_others]) / others[has_others, None]
+    delta_own = pos[has_others] - rest
+    dist2_own = np.einsum("ij,ij->i", delta_own, delta_own) + 1e-9
+    disp[has_others] += delta_own * (k * k * others[has_others] / dist2_own)[:, None]
+    return disp
+
+
+def force_layout(n, sources, targets, weights=None, iterations=DEFAULT_ITERATIONS, seed=0):
+    """Fruchterman-Reingold positions in [-1, 1] as an (n, 2) array."""
+    if n <= 1:
+        return np.zeros((n, 2))
+    rng = np.random.default_rng(seed)
+    pos = rng.uniform(-1.0, 1.0, size=(n, 2))
+    weights = np.ones(len(sources)) if weights is None else np.asarray(weights, dtype=np.float64)
+    k = np.sqrt(4.0 / n)
+    grid = min(MAX_GRID, max(2, int(np.sqrt(n / 4))))
+    temperature = 0.2
+    cooling = temperature / (iterations + 1)
+    for _ in range(iterations):
+        if n <= EXACT_REPULSION_LIMIT:
+            disp = exact_repulsion(pos, k)
+        else:
+            disp = grid_repulsion(pos, k, grid)
+        delta = pos[sources] - pos[targets]
+        dist = np.sqrt(np.einsum("ij,ij->i", delta, delta)) + 1e-9
+        pull = delta * (dist * weights / k)[:, None]
+        np.add.at(disp, sources, -pull)
+        np.add.at(disp, targets, pull)
+        length = np.sqrt(np.einsum("ij,ij->i", disp, disp)) + 1e-9
+        pos += disp * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= cooling
+    pos -= pos.mean(axis=0)
+    return pos / max(np.abs(pos).max(), 1e-9)
+
+
+def compute_layout(n, sources, targets, weights, method="auto"):
+    """Node positions as an (n, 2) array using one of ``LAYOUTS``."""
+    if method not in LAYOUTS:
+        raise ValueError(f"Unknown layout {method!r}, expected one of {LAYOUTS}")
+    if method == "auto":
+        method = "kamada_kawai" if n <= KAMADA_KAWAI_MAX_NODES else "force"
+    if method == "force":
+        return force_layout(n, sources, targets, weights)
+    G = nx.Graph()
+    G.add_nodes_from(range(n))
+    G.add_weighted_edges_from(zip(sources.tolist(), targets.tolist(), weights.tolist()))
+    pos = nx.kamada_kawai_layout(G) if n > 1 else {i: (0.0, 0.0) for i in range(n)}
+    return np.array([pos[i] for i in range(n)], dtype=np.float64).reshape(n, 2)
+
+
+def graph_key(nodes, edges):
+    """Cache key for a query result: its node entries and weighted edges."""
+    return frozenset(node[0] for node in nodes), frozenset(edges)
+
+
+class LayoutCache:
+    """LRU cache of (entries, positions, sources, targets, weights) per distinct graph."""
+
+    def __init__(self, max_entries=DEFAULT_LAYOUT_CACHE_SIZE, method="auto"):
+        self.max_entries = max_entries
+        self.method = method
+        self.layouts = OrderedDict()
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self.layouts)
+
+    def get(self, nodes, edges):
+        """Graph arrays and node positions, computed once per distinct node/edge set."""
+        key = graph_key(nodes, edges)
+        layout = self.layouts.get(key)
+        if layout is None:
+            self.misses += 1
+            entries, sources, targets, weights = graph_arrays(nodes, edges)
+            positions = compute_layout(len(entries), sources, targets, weights, self.method)
+            layout = entries, positions, sources, targets, weights
+            self.layouts[key] = layout
+            if len(self.layouts) > self.max_entries:
+                self.layouts.popitem(last=False)
+        else:
+            self.hits += 1
+            self.layouts.move_to_end(key)
+        return layout
+
+
+class GraphRenderer:
+    """Draws graphs on one long-lived Axes with batched artists and level-of-detail labels.
+
+    The edge collection and node scatter are created once; ``draw`` swaps
+    their data in place, so repeated searches allocate no new artists
+    apart from the few labels in view.
+    """
+
+    def __init__(self, ax):
+        self.ax = ax
+        self.labels = []
+        self.entries = []
+        self.positions = np.zeros((0, 2))
+        self.sources = self.targets = np.zeros(0, dtype=np.int64)
+        self.weights = np.zeros(0)
+        ax.axis("off")
+        self.edge_lines = ax.add_collection(
+            LineCollection([], colors="gray", alpha=0.7, linewidths=0.8, zorder=1))
+        self.node_points = ax.scatter([], [], s=NODE_SIZE, c="skyblue", alpha=0.8, zorder=2)
+        self.reset_view()
+        # Toolbar pan/zoom and the GUI's zoom both end by setting the y limits
+        ax.callbacks.connect("ylim_changed", lambda _: self.update_labels())
+
+    def reset_view(self):
+        self.ax.set_xlim(-1 - MARGIN, 1 + MARGIN)
+        self.ax.set_ylim(-1 - MARGIN, 1 + MARGIN)
+
+    def draw(self, entries, positions, sources, targets, weights):
+        """Show the given graph, reusing the existing artists, and reset the view."""
+        self.entries, self.positions = entries, positions
+        self.sources, self.targets, self.weights = sources, targets, weights
+        segments = positions[np.stack([sources, targets], axis=1)] if len(sources) else np.zeros((0, 2, 2))
+        self.edge_lines.set_segments(segments)
+        n = len(entries)
+        size = NODE_SIZE if n <= NODE_LABEL_LIMIT else max(MIN_NODE_SIZE, NODE_SIZE * NODE_LABEL_LIMIT / n)
+        self.node_points.set_offsets(positions)
+        self.node_points.set_sizes([size])
+        self.reset_view()  # also refreshes the labels
+
+    def visible_nodes(self):
+        (x0, x1), (y0, y1) = sorted(self.ax.get_xlim()), sorted(self.ax.get_ylim())
+        x, y = self.positions[:, 0], self.positions[:, 1]
+        return (x >= x0) & (x <= x1) & (y >= y0) & (y <= y1)
+
+    def update_labels(self):
+        """Show node and edge labels only when few enough of them are in view."""
+        for label in self.labels:
+            label.remove()
+        self.labels = []
+        visible = self.visible_nodes()
+        shown = np.flatnonzero(visible)
+        if len(shown) <= NODE_LABEL_LIMIT:
+            for i in shown:
+                x, y = self.positions[i]
+                self.labels.append(self.ax.text(x, y, self.entries[i], fontsize=8, ha="center",
+                                                va="center", zorder=3, clip_on=True))
+        edges = np.flatnonzero(visible[self.sources] & visible[self.targets])
+        if len(edges) <= EDGE_LABEL_LIMIT:
+            middles = (self.positions[self.sources[edges]] + self.positions[self.targets[edges]]) / 2
+            for (x, y), weight in zip(middles, self.weights[edges]):
+                self.labels.append(self.ax.text(x, y, f"{weight:.2f}", fontsize=6, ha="center",
+                                                va="center", zorder=3, clip_on=True))
@@ -0,0 +1,169 @@
+"""Bulk loader for the NoSQLProj.MoodleDB collection that query_mongo reads.
+
+Streams data/cleaned_mongodb.csv in batches and converts ``InterPro`` and
+``Domains`` back into real arrays (the CSV holds a stringified list and a
+comma-joined string). Batches go through unordered ``insert_many`` calls on
+a pool of writer threads. Every document also gets the normalised
+``search_keys`` array used by mongo_search.py. The indexes query_mongo needs
+are built after the load, which is much faster than updating them on every
+insert.
+
+``--upsert`` makes reloads idempotent: every document is replaced by its
+``Entry`` (through a unique index created up front), so running the loader
+twice never duplicates proteins. Without it, a rerun into a collection that
+already holds the proteins inserts only the new ones and reports how many
+were skipped as duplicates.
+
+Usage:
+    python mongo_loader.py data/cleaned_mongodb.csv --drop
+    python mongo_loader.py data/cleaned_mongodb.csv --upsert --batch-size 5000 --writers 8
+    python mongo_loader.py data/cleaned_mongodb.csv --mongomock   # no server needed
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+from pymongo import ASCENDING, MongoClient, ReplaceOne
+from pymongo.errors import BulkWriteError
+
+from connections import MONGO_COLLECTION, MONGO_DATABASE, MONGO_URI
+from edge_builder import split_interpro
+from mongo_search import SEARCH_INDEXES, search_keys
+from query_cache import clear_disk_cache
+
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_WRITERS = 4
+DUPLICATE_KEY = 11000
+
+# Indexes used by query_mongo, as (keys, options); the Entry index must stay first
+INDEXES = [
+    ([("Entry", ASCENDING)], {"unique": True, "name": "entry_unique"}),
+    ([("InterPro", ASCENDING)], {"name": "interpro"}),
+] + SEARCH_INDEXES
+
+
+class DuplicateEntriesError(Exception):
+    """Plain inserts hit Entry values that are already in the collection."""
+
+    def __init__(self, duplicates, written):
+        super().__init__(f"{duplicates} documents were skipped because their Entry is already in the "
+                         f"collection; rerun with --upsert to replace them or --drop to start over")
+        self.duplicates = duplicates
+        self.written = written
+
+
+def to_document(row):
+    """Turn one cleaned CSV row into a MoodleDB document with array fields."""
+    document = {key: value for key, value in row.items() if pd.notna(value)}
+    # The trailing ';' of the UniProt field leaves an empty token; drop it here
+    document["InterPro"] = [d for d in split_interpro(row.get("InterPro")) if d]
+    domains = row.get("Domains")
+    document["Domains"] = [d for d in domains.split(",") if d] if isinstance(domains, str) else []
+    document["search_keys"] = search_keys(document)
+    return document
+
+
+def iter_batches(csv_path, batch_size):
+    """Yield lists of documents from the cleaned CSV, batch_size rows at a time."""
+    for chunk in pd.read_csv(csv_path, chunksize=batch_size, dtype=str, keep_default_na=False,
+                             na_values=[""]):
+        yield [to_document(row) for row in chunk.to_dict("records")]
+
+
+def write_batch(collection, documents, upsert):
+    """Write one batch and return (documents written, duplicate Entry values skipped)."""
+    if upsert:
+        requests = [ReplaceOne({"Entry": d["Entry"]}, d, upsert=True) for d in documents]
+        collection.bulk_write(requests, ordered=False)
+        return len(documents), 0
+    try:
+        collection.insert_many(documents, ordered=False)
+    except BulkWriteError as error:
+        # Unordered inserts go on past duplicates; anything else is a real failure
+        errors = error.details.get("writeErrors", [])
+        if any(e.get("code") != DUPLICATE_KEY for e in errors):
+            raise
+        return error.details.get("nInserted", len(documents) - len(errors)), len(errors)
+    return len(documents), 0
+
+
+def create_indexes(collection, indexes=INDEXES):
+    """Create the query indexes; safe to call again on an existing collection."""
+    for keys, options in indexes:
+        collection.create_index(keys, **options)
+
+
+def load(collection, csv_path, batch_size=DEFAULT_BATCH_SIZE, writers=DEFAULT_WRITERS,
+         upsert=False, drop=False):
+    """Load the cleaned CSV into the collection and return (documents, seconds).
+
+    Raises DuplicateEntriesError, after loading the rest, if a plain insert
+    found proteins that were already loaded.
+    """
+    if drop:
+        collection.drop()
+    if upsert:
+        # Upserts look every Entry up, so that index has to exist first
+        create_indexes(collection, INDEXES[:1])
+
+    start = time.perf_counter()
+    written = duplicates = 0
+    pending = set()
+
+    def collect(futures):
+        nonlocal written, duplicates
+        for future in futures:
+            batch_written, batch_duplicates = future.result()
+            written += batch_written
+            duplicates += batch_duplicates
+
+    with ThreadPoolExecutor(max_workers=writers) as pool:
+        for documents in iter_batches(csv_path, batch_size):
+            # Keep at most two batches per writer in memory
+            if len(pending) >= 2 * writers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending.add(pool.submit(write_batch, collection, documents, upsert))
+        collect(pending)
+
+    create_indexes(collection)
+    if duplicates:
+        raise DuplicateEntriesError(duplicates, written)
+    return written, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk load cleaned_mongodb.csv into MongoDB.")
+    parser.add_argument("input", help="data/cleaned_mongodb.csv")
+    parser.add_argument("--uri", default=MONGO_URI)
+    parser.add_argument("--database", default=MONGO_DATABASE)
+    parser.add_argument("--collection", default=MONGO_COLLECTION)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--writers", type=int, default=DEFAULT_WRITERS, help="parallel writer threads")
+    parser.add_argument("--upsert", action="store_true", help="replace documents by Entry (idempotent)")
+    parser.add_argument("--drop", action="store_true", help="drop the collection before loading")
+    parser.add_argument("--mongomock", action="store_true",
+                        help="load into an in-memory mongomock client instead of a server")
+    args = parser.parse_args()
+
+    if args.mongomock:
+        import mongomock
+        client = mongomock.MongoClient()
+    else:
+        client = MongoClient(args.uri)
+    collection = client[args.database][args.collection]
+    try:
+        written, seconds = load(collection, args.input, args.batch_size, args.writers, args.upsert, args.drop)
+    except DuplicateEntriesError as error:
+        print(f"Loaded {error.written} new documents. {error}", file=sys.stderr)
+        sys.exit(1)
+    if not args.mongomock:
+        clear_disk_cache()  # the GUI's cached results predate this load
+    print(f"Loaded {written} documents into {args.database}.{args.collection} in {seconds:.1f}s "
+          f"({written / max(seconds, 1e-9):.0f} docs/sec), {collection.count_documents({})} in collection")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Indexed search planner for the MoodleDB collection.
+
+query_mongo used to send one ``$or`` of unanchored, case-insensitive regexes
+over five fields. No index can serve that, so every search scanned the whole
+collection. ``find_protein`` instead tries cheaper indexed tiers in order and
+stops at the first hit:
+
+``exact``
+    ``Entry`` (as typed or upper-cased), an exact ``Sequence`` or an exact
+    ``Organism``, all indexed. Organism is matched here only: as a prefix key,
+    short queries such as "mus" would hit almost every document.
+``prefix``
+    The normalised (lower-case, single-spaced) query against ``search_keys``,
+    a multikey array of normalised Entry, Entry Name, gene names, protein
+    names and InterPro IDs. An exact key match is tried first, then an
+    anchored ``^prefix`` regex, which MongoDB answers with an index range scan.
+``text``
+    The ``$text`` index over protein, gene and entry names, best score first.
+``scan``
+    The old unanchored regex ``$or``. It only runs when the caller passes
+    ``allow_scan=True``.
+
+``search_keys`` is filled in by mongo_loader.py, which also creates the
+indexes listed in ``SEARCH_INDEXES``. ``find_entries`` is the batch form of
+the exact tier: one ``$in`` query on the ``Entry`` index for many accessions.
+"""
+import re
+
+from pymongo import ASCENDING, HASHED, TEXT
+
+TIERS = ("exact", "prefix", "text", "scan")
+
+SEARCH_INDEXES = [
+    ([("search_keys", ASCENDING)], {"name": "search_keys"}),
+    ([("Sequence", HASHED)], {"name": "sequence_hashed"}),
+    ([("Organism", ASCENDING)], {"name": "organism"}),
+    ([("Protein names", TEXT), ("Gene Names", TEXT), ("Entry Name", TEXT)],
+     {"name": "names_text", "default_language": "none"}),
+]
+
+
+def normalise(text):
+    """Lower-case and collapse whitespace, the form stored in search_keys."""
+    return " ".join(str(text).lower().split())
+
+
+def search_keys(document):
+    """All normalised lookup keys for one MoodleDB document."""
+    keys = [document.get("Entry"), document.get("Entry Name"), document.get("Protein names")]
+    gene_names = document.get("Gene Names")
+    if isinstance(gene_names, str) and gene_names != "Unknown":
+        keys.extend(gene_names.split())
+    keys.extend(document.get("InterPro") or [])
+    return sorted({normalise(key) for key in keys if isinstance(key, str) and key.strip()})
+
+
+def exact_filter(query):
+    return {"$or": [{"Entry": {"$in": list({query, query.upper()})}}, {"Sequence": query},
+                    {"Organism": query}]}
+
+
+def prefix_filters(query):
+    key = normalise(query)
+    return [{"search_keys": key}, {"search_keys": {"$regex": "^" + re.escape(key)}}]
+
+
+def scan_filter(query):
+    """The original query_mongo filter; needs a full collection scan."""
+    return {"$or": [
+        {"Entry": {"$regex": query, "$options": "i"}},
+        {"Entry Name": {"$regex": query, "$options": "i"}},
+        {"Protein names": {"$regex": query, "$options": "i"}},
+        {"Gene Names": {"$regex": query, "$options": "i"}},
+        {"Organism": query},
+        {"Sequence": query},
+        {"InterPro": {"$regex": query, "$options": "i"}}
+    ]}
+
+
+def run_tier(collection, tier, query):
+    """Run a single tier and return the first matching document or None."""
+    if tier == "exact":
+        return collection.find_one(exact_filter(query))
+    if tier == "prefix":
+        for condition in prefix_filters(query):
+            result = collection.find_one(condition)
+            if result:
+                return result
+        return None
+    if tier == "text":
+        cursor = collection.find({"$text": {"$search": query}}, {"score": {"$meta": "textScore"}})
+        return next(iter(cursor.sort([("score", {"$meta": "textScore"})]).limit(1)), None)
+    if tier == "scan":
+        return collection.find_one(scan_filter(query))
+    raise ValueError(f"Unknown tier {tier!r}, expected one of {TIERS}")
+
+
+def find_entries(collection, entries, projection=None):
+    """{Entry: document} for a batch of accessions in one indexed ``$in`` query.
+
+    Documents are returned without ``_id`` unless a projection says otherwise.
+    """
+    cursor = collection.find({"Entry": {"$in": list(entries)}}, projection or {"_id": 0})
+    return {document["Entry"]: document for document in cursor}
+
+
+def find_protein(collection, query, allow_scan=False):
+    """Return (document, tier) for the first tier that matches, or (None, None)."""
+    query = query.strip()
+    if not query:
+        return None, None
+    for tier in TIERS:
+        if tier == "scan" and not allow_scan:
+            break
+        result = run_tier(collection, tier, query)
+        if result:
+            return result, tier
+    return None, None
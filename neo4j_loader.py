@@ -0,0 +1,227 @@
+"""Loader for the Neo4j protein similarity graph used by the GUI.
+
+Builds ``(:Protein)`` nodes with the properties query_neo4j and
+query_neo4j_graph read (entry, entryName, geneName, proteinNames, ec_numbers,
+interPro), connected by weighted ``SIMILAR_TO`` relationships from edges2.csv.
+
+Two paths are offered:
+
+``load``
+    Online load into a running database. A uniqueness constraint on
+    ``Protein.entry`` is created first, so every relationship batch finds its
+    endpoints through the index. Nodes and relationships are then sent as
+    parameterised ``UNWIND $rows`` batches over several concurrent sessions.
+    Both are MERGEd, so reloading without ``--clear`` updates properties and
+    weights in place instead of duplicating relationships.
+    The full-text index used by neo4j_search.py is created after the nodes.
+
+``export``
+    Writes header and data CSV files for ``neo4j-admin database import full``.
+    This is the fastest way to cold-load an empty database.
+
+Usage:
+    python neo4j_loader.py load data/cleaned_mongodb.csv data/edges2.csv --batch-size 10000 --sessions 4
+    python neo4j_loader.py export data/cleaned_mongodb.csv data/edges2.csv data/neo4j_import
+"""
+import argparse
+import csv
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+from neo4j import GraphDatabase
+
+from connections import NEO4J_AUTH, NEO4J_URI
+from edge_builder import split_interpro
+from edge_store import EdgeStore
+from neo4j_search import INDEX_STATEMENTS, LABEL, RELATIONSHIP
+from query_cache import clear_disk_cache
+
+DEFAULT_BATCH_SIZE = 10000
+DEFAULT_SESSIONS = 4
+ARRAY_DELIMITER = ";"
+
+NODE_QUERY = f"""
+UNWIND $rows AS row
+MERGE (p:{LABEL} {{entry: row.entry}})
+SET p.entryName = row.entryName,
+    p.geneName = row.geneName,
+    p.proteinNames = row.proteinNames,
+    p.ec_numbers = row.ec_numbers,
+    p.interPro = row.interPro
+"""
+EDGE_QUERY = f"""
+UNWIND $rows AS row
+MATCH (a:{LABEL} {{entry: row.source}})
+MATCH (b:{LABEL} {{entry: row.target}})
+MERGE (a)-[r:{RELATIONSHIP}]->(b)
+SET r.weight = row.weight
+"""
+CLEAR_QUERY = f"""
+MATCH (p:{LABEL})
+CALL {{ WITH p DETACH DELETE p }} IN TRANSACTIONS OF 10000 ROWS
+"""
+
+
+def split_ec(value):
+    """UniProt lists several EC numbers as '1.2.3.4; 5.6.7.8'."""
+    if not isinstance(value, str) or value == "Not Available":
+        return []
+    return [ec.strip() for ec in value.split(";") if ec.strip()]
+
+
+def iter_node_batches(nodes_csv, batch_size):
+    """Yield lists of node property maps from cleaned_mongodb.csv."""
+    for chunk in pd.read_csv(nodes_csv, chunksize=batch_size, dtype=str, keep_default_na=False):
+        yield [{
+            "entry": row["Entry"],
+            "entryName": row["Entry Name"],
+            "geneName": row["Gene Names"],
+            "proteinNames": row["Protein names"],
+            "ec_numbers": split_ec(row["EC number"]),
+            "interPro": [d for d in split_interpro(row["InterPro"]) if d],
+        } for row in chunk.to_dict("records")]
+
+
+def iter_edge_batches(edges_path, batch_size):
+    """Yield lists of {source, target, weight} from an edge CSV or edge store."""
+    if os.path.isdir(edges_path):
+        store = EdgeStore(edges_path)
+        for start in range(0, len(store), batch_size):
+            stop = start + batch_size
+            yield [{"source": s, "target": t, "weight": w} for s, t, w in zip(
+                store.entries(store.source[start:stop]).tolist(),
+                store.entries(store.target[start:stop]).tolist(),
+                np.asarray(store.weight[start:stop], dtype=np.float64).tolist())]
+        return
+    for chunk in pd.read_csv(edges_path, chunksize=batch_size, dtype={"Protein1": str, "Protein2": str}):
+        yield [{"source": s, "target": t, "weight": w} for s, t, w in zip(
+            chunk["Protein1"], chunk["Protein2"], chunk["Weight"].astype(float))]
+
+
+def run_batch(driver, query, rows):
+    """Write one batch in its own session with a retried write transaction."""
+    with driver.session() as session:
+        session.execute_write(lambda tx: tx.run(query, rows=rows).consume())
+    return len(rows)
+
+
+def run_batches(driver, query, batches, sessions):
+    """Send batches over concurrent sessions; return (rows, seconds)."""
+    start = time.perf_counter()
+    written = 0
+    pending = set()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        for rows in batches:
+            if len(pending) >= 2 * sessions:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                written += sum(future.result() for future in done)
+            pending.add(pool.submit(run_batch, driver, query, rows))
+        written += sum(future.result() for future in pending)
+    return written, time.perf_counter() - start
+
+
+def load(driver, nodes_csv, edges_path, batch_size=DEFAULT_BATCH_SIZE, sessions=DEFAULT_SESSIONS,
+         clear=False):
+    """Load nodes then relationships; return {"nodes": (n, s), "relationships": (n, s)}."""
+    with driver.session() as session:
+        if clear:
+            session.run(CLEAR_QUERY).consume()
+        session.run(INDEX_STATEMENTS[0]).consume()
+    results = {"nodes": run_batches(driver, NODE_QUERY, iter_node_batches(nodes_csv, batch_size), sessions)}
+    create_indexes(driver)
+    # Concurrent relationship batches can lock the same nodes; execute_write
+    # retries those transient deadlocks
+    results["relationships"] = run_batches(driver, EDGE_QUERY, iter_edge_batches(edges_path, batch_size),
+                                           sessions)
+    return results
+
+
+def create_indexes(driver):
+    """Create the entry constraint and full-text index; safe to run again."""
+    with driver.session() as session:
+        for statement in INDEX_STATEMENTS:
+            session.run(statement).consume()
+
+
+def export(nodes_csv, edges_path, out_dir, batch_size=DEFAULT_BATCH_SIZE):
+    """Write neo4j-admin import files; return {"nodes": (n, s), "relationships": (n, s)}."""
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, "nodes_header.csv"), "w", newline="") as file:
+        csv.writer(file).writerow(["entry:ID(Protein)", "entryName", "geneName", "proteinNames",
+                                   "ec_numbers:string[]", "interPro:string[]", ":LABEL"])
+    with open(os.path.join(out_dir, "relationships_header.csv"), "w", newline="") as file:
+        csv.writer(file).writerow([":START_ID(Protein)", ":END_ID(Protein)", "weight:double", ":TYPE"])
+
+    start = time.perf_counter()
+    nodes = 0
+    with open(os.path.join(out_dir, "nodes.csv"), "w", newline="") as file:
+        writer = csv.writer(file)
+        for rows in iter_node_batches(nodes_csv, batch_size):
+            writer.writerows([r["entry"], r["entryName"], r["geneName"], r["proteinNames"],
+                              ARRAY_DELIMITER.join(r["ec_numbers"]), ARRAY_DELIMITER.join(r["interPro"]),
+                              LABEL] for r in rows)
+            nodes += len(rows)
+    node_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    relationships = 0
+    with open(os.path.join(out_dir, "relationships.csv"), "w", newline="") as file:
+        writer = csv.writer(file)
+        for rows in iter_edge_batches(edges_path, batch_size):
+            writer.writerows([r["source"], r["target"], r["weight"], RELATIONSHIP] for r in rows)
+            relationships += len(rows)
+    return {"nodes": (nodes, node_seconds), "relationships": (relationships, time.perf_counter() - start)}
+
+
+def import_command(out_dir, database="neo4j"):
+    """The neo4j-admin command that loads the exported files into an empty database."""
+    path = os.path.abspath(out_dir)
+    return (f"neo4j-admin database import full {database} --overwrite-destination "
+            f"--array-delimiter='{ARRAY_DELIMITER}' "
+            f"--nodes={path}/nodes_header.csv,{path}/nodes.csv "
+            f"--relationships={path}/relationships_header.csv,{path}/relationships.csv")
+
+
+def print_throughput(results):
+    for kind, (count, seconds) in results.items():
+        print(f"{kind:>14}: {count} in {seconds:.1f}s ({count / max(seconds, 1e-9):.0f}/sec)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load the protein similarity graph into Neo4j.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    online = commands.add_parser("load", help="batched UNWIND load into a running database")
+    online.add_argument("nodes", help="data/cleaned_mongodb.csv")
+    online.add_argument("edges", help="data/edges2.csv or an edge store directory")
+    online.add_argument("--uri", default=NEO4J_URI)
+    online.add_argument("--user", default=NEO4J_AUTH[0])
+    online.add_argument("--password", default=NEO4J_AUTH[1])
+    online.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    online.add_argument("--sessions", type=int, default=DEFAULT_SESSIONS, help="concurrent sessions")
+    online.add_argument("--clear", action="store_true", help="delete existing Protein nodes first")
+    offline = commands.add_parser("export", help="write neo4j-admin import files")
+    offline.add_argument("nodes", help="data/cleaned_mongodb.csv")
+    offline.add_argument("edges", help="data/edges2.csv or an edge store directory")
+    offline.add_argument("out_dir", help="directory for the import CSV files")
+    offline.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    if args.command == "load":
+        driver = GraphDatabase.driver(args.uri, auth=(args.user, args.password),
+                                      max_connection_pool_size=max(args.sessions, 1) + 1)
+        try:
+            print_throughput(load(driver, args.nodes, args.edges, args.batch_size, args.sessions, args.clear))
+            clear_disk_cache()  # the GUI's cached results predate this load
+        finally:
+            driver.close()
+    else:
+        print_throughput(export(args.nodes, args.edges, args.out_dir, args.batch_size))
+        print("Import with:\n  " + import_command(args.out_dir))
+        print("Then create the search indexes with:\n  " + ";\n  ".join(INDEX_STATEMENTS) + ";")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Indexed node lookup for the Neo4j protein graph.
+
+The GUI used to match every node in the graph against four ``=~ '(?i).*q.*'``
+regexes, with no label, so Neo4j scanned all nodes and compiled a regex per
+node on every search. Lookups now go through two indexes on ``:Protein``
+nodes:
+
+1. the uniqueness constraint (a range index) on ``entry`` for an exact
+   accession match,
+2. the ``protein_names`` full-text index over ``entryName``, ``geneName`` and
+   ``proteinNames``. Each search term is matched as a whole word (boosted) or
+   as a prefix, and the best Lucene score wins.
+
+neo4j_loader.py creates both indexes (``INDEX_STATEMENTS``). ``find_nodes``
+looks up a whole batch of accessions through the entry index in one
+``UNWIND $ids`` query.
+
+``fetch_neighbourhood`` replaces the old neighbourhood query, which collected
+every neighbour, matched all edges among them and cut the result at an
+unordered ``LIMIT 500``. The new query keeps only the ``top_k`` strongest
+neighbours above ``min_weight`` per expanded protein, for up to ``MAX_HOPS``
+hops. It returns the edges among them strongest first, one page at a time,
+with a keyset cursor (weight, source, target) for the next page.
+"""
+import re
+
+LABEL = "Protein"
+RELATIONSHIP = "SIMILAR_TO"
+FULLTEXT_INDEX = "protein_names"
+
+INDEX_STATEMENTS = [
+    f"CREATE CONSTRAINT protein_entry IF NOT EXISTS FOR (p:{LABEL}) REQUIRE p.entry IS UNIQUE",
+    f"CREATE FULLTEXT INDEX {FULLTEXT_INDEX} IF NOT EXISTS FOR (p:{LABEL}) "
+    f"ON EACH [p.entryName, p.geneName, p.proteinNames]",
+]
+
+EXACT_QUERY = f"""
+MATCH (p:{LABEL})
+WHERE p.entry IN $entries
+RETURN p, 1.0 AS score
+LIMIT 1
+"""
+FULLTEXT_QUERY = f"""
+CALL db.index.fulltext.queryNodes('{FULLTEXT_INDEX}', $search) YIELD node, score
+RETURN node AS p, score
+ORDER BY score DESC
+LIMIT 1
+"""
+
+# Batch lookup: one round trip for a whole list of accessions, optionally
+# with each protein's top-k neighbours
+BATCH_QUERY = f"""
+UNWIND $ids AS id
+MATCH (p:{LABEL} {{entry: id}})
+RETURN id, properties(p) AS p
+"""
+BATCH_NEIGHBOURS_QUERY = f"""
+UNWIND $ids AS id
+MATCH (p:{LABEL} {{entry: id}})
+CALL {{
+    WITH p
+    MATCH (p)-[r:{RELATIONSHIP}]-(b:{LABEL})
+    WHERE r.weight > $min_weight
+    WITH b, r ORDER BY r.weight DESC, b.entry LIMIT $top_k
+    RETURN collect({{entry: b.entry, weight: r.weight}}) AS neighbours
+}}
+RETURN id, properties(p) AS p, neighbours
+"""
+
+DEFAULT_MIN_WEIGHT = 0.0
+DEFAULT_TOP_K = 50
+DEFAULT_PAGE_SIZE = 500
+DEFAULT_FETCH_SIZE = 100
+MAX_HOPS = 2
+
+# One hop: the top-k strongest neighbours of every frontier protein join the
+# members and the new ones become the next frontier
+EXPAND_HOP = f"""
+UNWIND frontier AS a
+CALL {{
+    WITH a
+    MATCH (a)-[r:{RELATIONSHIP}]-(b:{LABEL})
+    WHERE r.weight > $min_weight
+    RETURN b ORDER BY r.weight DESC, b.entry LIMIT $top_k
+}}
+WITH members, collect(DISTINCT b) AS ring
+WITH members + [b IN ring WHERE NOT b IN members] AS members,
+     [b IN ring WHERE NOT b IN members] AS frontier
+"""
+# Edges among the members, strongest first, after the keyset cursor. The
+# directed pattern returns each stored relationship once.
+MEMBER_EDGES = f"""
+UNWIND members AS a
+MATCH (a)-[r:{RELATIONSHIP}]->(c:{LABEL})
+WHERE c IN members AND r.weight > $min_weight
+  AND ($after_weight IS NULL OR r.weight < $after_weight
+       OR (r.weight = $after_weight AND (a.entry > $after_source
+           OR (a.entry = $after_source AND c.entry > $after_target))))
+RETURN a.entry AS source, a.entryName AS source_name, c.entry AS target,
+       c.entryName AS target_name, r.weight AS weight
+ORDER BY weight DESC, source, target
+LIMIT $page_size
+"""
+
+LUCENE_SPECIAL = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+
+
+def lucene_query(text):
+    """Build a Lucene query matching each term as a word (boosted) or a prefix."""
+    terms = [LUCENE_SPECIAL.sub(r"\\\1", term) for term in text.lower().split()]
+    return " ".join(f"{term}^2 {term}*" for term in terms if term)
+
+
+def find_node(session, query):
+    """Return (node, tier, score) for an exact entry or best full-text match.
+
+    ``tier`` is "exact" or "fulltext"; (None, None, None) if nothing matches.
+    """
+    query = query.strip()
+    if not query:
+        return None, None, None
+    record = session.run(EXACT_QUERY, entries=list({query, query.upper()})).single()
+    if record:
+        return record["p"], "exact", record["score"]
+    search = lucene_query(query)
+    if search:
+        record = session.run(FULLTEXT_QUERY, search=search).single()
+        if record:
+            return record["p"], "fulltext", record["score"]
+    return None, None, None
+
+
+def find_nodes(session, entries, neighbours=0, min_weight=DEFAULT_MIN_WEIGHT):
+    """{entry: node properties} for a batch of accessions in one ``UNWIND $ids`` query.
+
+    With ``neighbours`` > 0, each node also gets a "neighbours" list of its
+    strongest {entry, weight} neighbours above ``min_weight``.
+    """
+    if neighbours > 0:
+        result = session.run(BATCH_NEIGHBOURS_QUERY, ids=list(entries), top_k=neighbours, min_weight=min_weight)
+        return {record["id"]: {**record["p"], "neighbours": record["neighbours"]} for record in result}
+    return {record["id"]: record["p"] for record in session.run(BATCH_QUERY, ids=list(entries))}
+
+
+def neighbourhood_query(max_hops=1):
+    """Cypher for one page of edges in the top-k neighbourhood of ``$entry``.
+
+    Parameters: entry, min_weight, top_k, page_size and the cursor fields
+    after_weight, after_source, after_target (all null for the first page).
+    """
+    if not 1 <= max_hops <= MAX_HOPS:
+        raise ValueError(f"max_hops must be between 1 and {MAX_HOPS}, got {max_hops}")
+    start = f"MATCH (n:{LABEL} {{entry: $entry}})\nWITH [n] AS members, [n] AS frontier"
+    return "\n".join([start] + [EXPAND_HOP.strip()] * max_hops + [MEMBER_EDGES.strip()])
+
+
+def fetch_neighbourhood(session, entry, min_weight=DEFAULT_MIN_WEIGHT, top_k=DEFAULT_TOP_K, max_hops=1,
+                        page_size=DEFAULT_PAGE_SIZE, cursor=None, batch_size=DEFAULT_FETCH_SIZE,
+                        on_batch=None):
+    """Fetch one page of edges around ``entry``, consuming records as they stream in.
+
+    Returns (nodes, edges, next_cursor) with nodes as (entry, entryName) and
+    edges as (source, target, weight), strongest first. Pass next_cursor back
+    for the following page; it is None after the last one. ``on_batch(nodes,
+    edges)`` is called with the edges received so far every ``batch_size``
+    records. Open the session with ``fetch_size`` to match.
+    """
+    after_weight, after_source, after_target = cursor or (None, None, None)
+    result = session.run(neighbourhood_query(max_hops), entry=entry, min_weight=min_weight, top_k=top_k,
+                         page_size=page_size, after_weight=after_weight, after_source=after_source,
+                         after_target=after_target)
+    nodes, edges = set(), []
+    for record in result:
+        nodes.add((record["source"], record["source_name"] or "Unknown"))
+        nodes.add((record["target"], record["target_name"] or "Unknown"))
+        edges.append((record["source"], record["target"], record["weight"]))
+        if on_batch is not None and len(edges) % batch_size == 0:
+            on_batch(set(nodes), list(edges))
+    next_cursor = None
+    if len(edges) == page_size:
+        source, target, weight = edges[-1]
+        next_cursor = (weight, source, target)
+    return nodes, edges, next_cursor
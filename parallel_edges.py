@@ -0,0 +1,180 @@
+"""Multi-core Jaccard edge build over shared-memory incidence data.
+
+The protein x InterPro incidence matrix (its indptr, indices and data arrays)
+is copied once into ``multiprocessing.shared_memory``. Workers attach to it by
+name and wrap the shared buffers in a CSR matrix without copying them, so the
+matrix is neither pickled per task nor duplicated per worker. The work is the
+same (i-block, j-block) tiling as edge_tiling.py. Tiles are queued from most
+to least expensive (the cost comes from per-block InterPro counts) and handed
+out one at a time, which keeps all workers busy until the end.
+
+Every worker appends its tiles to its own binary partition
+(``part-<pid>.bin`` of row/col/weight records). The merge step then writes
+either one sorted Protein1,Protein2,Weight CSV or one CSV per partition.
+
+Usage:
+    python parallel_edges.py data/cleaned_mongodb.csv data/edges2.csv --threshold 0.8 --workers 32
+"""
+import argparse
+import glob
+import math
+import os
+import time
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+from scipy import sparse
+
+from edge_builder import build_incidence, load_proteins, split_interpro, write_edges
+from edge_tiling import iter_tiles, run_tile, tile_size_for_budget
+
+EDGE_RECORD = np.dtype([("row", "<i8"), ("col", "<i8"), ("weight", "<f8")])
+
+# Per-worker state, set by attach_worker
+_matrix = None
+_sizes = None
+_segments = []
+_partition = None
+
+
+def share_arrays(arrays):
+    """Copy arrays into new shared memory segments and return (segments, specs)."""
+    segments, specs = [], []
+    for array in arrays:
+        segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[:] = array
+        segments.append(segment)
+        specs.append((segment.name, array.shape, array.dtype.str))
+    return segments, specs
+
+
+def attach_worker(specs, shape, partition_dir):
+    """Pool initializer: map the shared CSR arrays and open this worker's partition."""
+    global _matrix, _sizes, _segments, _partition
+    arrays = []
+    for name, array_shape, dtype in specs:
+        segment = shared_memory.SharedMemory(name=name)
+        _segments.append(segment)
+        arrays.append(np.ndarray(array_shape, dtype=dtype, buffer=segment.buf))
+    indptr, indices, data = arrays
+    _matrix = sparse.csr_matrix((data, indices, indptr), shape=shape, copy=False)
+    _sizes = np.diff(indptr).astype(np.int64)
+    _partition = open(os.path.join(partition_dir, f"part-{os.getpid()}.bin"), "ab")
+
+
+def score_tile(task):
+    """Worker task: score one tile and append it to this worker's partition."""
+    i, j, tile_size, threshold = task
+    rows, cols, weights = run_tile(_matrix, _sizes, tile_size, i, j, threshold)
+    records = np.empty(len(weights), dtype=EDGE_RECORD)
+    records["row"], records["col"], records["weight"] = rows, cols, weights
+    records.tofile(_partition)
+    _partition.flush()
+    return i, j, len(weights)
+
+
+def tile_costs(matrix, tile_size):
+    """Estimate the work of every tile from per-block InterPro frequencies."""
+    blocks = math.ceil(matrix.shape[0] / tile_size)
+    membership = sparse.csr_matrix(
+        (np.ones(matrix.shape[0]), (np.arange(matrix.shape[0]) // tile_size, np.arange(matrix.shape[0]))),
+        shape=(blocks, matrix.shape[0]),
+    )
+    counts = membership @ matrix.astype(np.float64)
+    return (counts @ counts.T).toarray()
+
+
+def balanced_tile_size(n_proteins, workers):
+    """Tile size that still gives every worker several tiles to balance."""
+    # b blocks give b * (b + 1) / 2 tiles; aim for about four per worker
+    blocks = math.ceil(math.sqrt(8 * workers))
+    return max(1, math.ceil(n_proteins / blocks))
+
+
+def build_partitions(matrix, partition_dir, threshold=0.0, workers=None, memory_mb=256, tile_size=None):
+    """Score all tiles on a process pool and return the edge count."""
+    if threshold < 0:
+        raise ValueError("threshold must be >= 0")
+    matrix = sparse.csr_matrix(matrix)
+    workers = workers or os.cpu_count()
+    n = matrix.shape[0]
+    tile_size = tile_size or min(tile_size_for_budget(n, memory_mb), balanced_tile_size(n, workers))
+    os.makedirs(partition_dir, exist_ok=True)
+    for stale in glob.glob(os.path.join(partition_dir, "part-*")):
+        os.remove(stale)
+
+    costs = tile_costs(matrix, tile_size)
+    tasks = sorted(iter_tiles(n, tile_size), key=lambda tile: -costs[tile])
+    tasks = [(i, j, tile_size, threshold) for i, j in tasks]
+
+    # scipy copies indptr and indices into one common dtype, so share them in it already
+    index_dtype = np.result_type(matrix.indptr, matrix.indices)
+    segments, specs = share_arrays([matrix.indptr.astype(index_dtype, copy=False),
+                                    matrix.indices.astype(index_dtype, copy=False), matrix.data])
+    try:
+        with Pool(workers, initializer=attach_worker,
+                  initargs=(specs, matrix.shape, partition_dir)) as pool:
+            return sum(count for _, _, count in pool.imap_unordered(score_tile, tasks))
+    finally:
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+
+
+def read_partitions(partition_dir):
+    """Return the paths of all worker partitions in partition_dir."""
+    return sorted(glob.glob(os.path.join(partition_dir, "part-*.bin")))
+
+
+def merge_partitions(partition_dir, entries, output):
+    """Sort every partition's records by (row, col) into one edge CSV."""
+    parts = [np.fromfile(path, dtype=EDGE_RECORD) for path in read_partitions(partition_dir)]
+    records = np.concatenate(parts) if parts else np.empty(0, dtype=EDGE_RECORD)
+    records = records[np.lexsort((records["col"], records["row"]))]
+    return write_edges(output, entries, [(records["row"], records["col"], records["weight"])])
+
+
+def export_partitions(partition_dir, entries):
+    """Write each worker partition as its own edge CSV next to the .bin file."""
+    paths = []
+    for path in read_partitions(partition_dir):
+        records = np.fromfile(path, dtype=EDGE_RECORD)
+        csv_path = path[:-len(".bin")] + ".csv"
+        write_edges(csv_path, entries, [(records["row"], records["col"], records["weight"])])
+        paths.append(csv_path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-core Jaccard edge build.")
+    parser.add_argument("input", help="raw UniProt TSV or data/cleaned_mongodb.csv")
+    parser.add_argument("output", help="merged edge CSV, or a directory with --partitioned")
+    parser.add_argument("--threshold", type=float, default=0.0,
+                        help="keep pairs with similarity strictly above this value")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--memory-mb", type=float, default=256, help="memory budget per tile and worker")
+    parser.add_argument("--tile-size", type=int, default=None, help="override the derived tile size")
+    parser.add_argument("--partition-dir", default=None,
+                        help="where workers write their partitions (default: <output>.parts)")
+    parser.add_argument("--partitioned", action="store_true",
+                        help="keep one edge CSV per worker instead of merging into a single file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    entries, interpro = load_proteins(args.input)
+    matrix, _ = build_incidence([split_interpro(v) for v in interpro])
+    partition_dir = args.partition_dir or (args.output if args.partitioned else args.output + ".parts")
+    count = build_partitions(matrix, partition_dir, args.threshold, args.workers,
+                             args.memory_mb, args.tile_size)
+    built = time.perf_counter() - start
+    if args.partitioned:
+        paths = export_partitions(partition_dir, entries)
+        print(f"Wrote {count} edges in {len(paths)} partitions under {partition_dir}")
+    else:
+        merge_partitions(partition_dir, entries, args.output)
+        print(f"Wrote {count} edges for {len(entries)} proteins to {args.output}")
+    print(f"Scored in {built:.1f}s, total {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
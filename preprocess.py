@@ -0,0 +1,121 @@
+"""Streaming preprocessing of the UniProt TSV into the cleaned data files.
+
+This does the same cleaning as dataset_prep.ipynb, but reads the TSV in
+chunks instead of loading the whole file:
+
+* Gene Names missing -> "Unknown", EC number missing -> "Not Available"
+* rows without InterPro are dropped
+* ``Domains`` is the comma-joined InterPro field and ``InterPro`` its list
+* only the first row of every ``Entry`` is kept
+
+All three outputs (cleaned_mongodb.csv, nodes.csv and ec_num.csv) are
+appended chunk by chunk in one pass. The only state that grows with the input
+is the set of seen entries, held as a sorted array of 64-bit hashes
+(8 bytes per protein).
+
+Usage:
+    python preprocess.py data/moodle_file.tsv --out-dir data
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+CLEANED_COLUMNS = ['Entry', 'Entry Name', 'Protein names', 'Gene Names', 'Organism', 'Sequence',
+                   'EC number', 'InterPro', 'Domains']
+NODE_COLUMNS = ['Entry', 'Entry Name', 'Protein names', 'Gene Names', 'InterPro']
+EC_COLUMNS = ['Entry', 'EC number']
+OUTPUTS = {
+    "cleaned_mongodb.csv": CLEANED_COLUMNS,
+    "nodes.csv": NODE_COLUMNS,
+    "ec_num.csv": EC_COLUMNS,
+}
+DEFAULT_CHUNK_SIZE = 50000
+
+
+class SeenEntries:
+    """Compact set of already written Entry accessions, stored as sorted hashes."""
+
+    def __init__(self):
+        self.hashes = np.empty(0, dtype=np.uint64)
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def keep_new(self, entries):
+        """Return a mask of entries seen for the first time, and remember them."""
+        hashes = pd.util.hash_pandas_object(entries, index=False).to_numpy()
+        first = np.zeros(len(hashes), dtype=bool)
+        first[np.unique(hashes, return_index=True)[1]] = True
+
+        positions = np.searchsorted(self.hashes, hashes)
+        positions[positions == len(self.hashes)] = 0
+        already_seen = (self.hashes[positions] == hashes) if len(self.hashes) else np.zeros_like(first)
+
+        new = first & ~already_seen
+        self.hashes = np.union1d(self.hashes, hashes[new])
+        return new
+
+
+def clean_chunk(chunk):
+    """Apply the notebook's cleaning rules to one chunk of the raw TSV."""
+    chunk = chunk.copy()
+    chunk['Gene Names'] = chunk['Gene Names'].fillna("Unknown")
+    chunk['EC number'] = chunk['EC number'].fillna("Not Available")
+    chunk = chunk.dropna(subset=['InterPro'])
+    chunk['Domains'] = chunk['InterPro'].apply(lambda x: ','.join(x.split(';')))
+    chunk['InterPro'] = chunk['InterPro'].apply(lambda x: x.split(';'))
+    return chunk
+
+
+def preprocess(tsv_path, out_dir, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Stream the TSV once and write all outputs; return (rows_read, rows_written)."""
+    os.makedirs(out_dir, exist_ok=True)
+    seen = SeenEntries()
+    rows_read = rows_written = 0
+    first = True
+    for chunk in pd.read_csv(tsv_path, sep="\t", chunksize=chunk_size):
+        rows_read += len(chunk)
+        chunk = clean_chunk(chunk)
+        chunk = chunk[seen.keep_new(chunk['Entry'])]
+        for name, columns in OUTPUTS.items():
+            chunk[columns].to_csv(os.path.join(out_dir, name), mode="w" if first else "a",
+                                  header=first, index=False)
+        rows_written += len(chunk)
+        first = False
+        print(f"Processed {rows_read} rows, kept {rows_written}")
+    return rows_read, rows_written
+
+
+def peak_memory_mb():
+    """Peak resident set size in MB, or None where the resource module is missing (Windows).
+
+    The benchmark scripts import this too, so ``resource`` is only used here.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clean the UniProt TSV into cleaned_mongodb.csv, "
+                                                 "nodes.csv and ec_num.csv in one streaming pass.")
+    parser.add_argument("input", help="raw UniProt TSV, e.g. data/moodle_file.tsv")
+    parser.add_argument("--out-dir", default="data", help="directory for the output CSV files")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="TSV rows per chunk")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows_read, rows_written = preprocess(args.input, args.out_dir, args.chunk_size)
+    peak_mb = peak_memory_mb()
+    peak = f"{peak_mb:.0f} MB" if peak_mb is not None else "n/a"
+    print(f"Completed: {rows_read} rows in, {rows_written} proteins out "
+          f"in {time.perf_counter() - start:.1f}s, peak memory {peak}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Query core shared by the Tk GUI and the command-line tools.
+
+The lookups behind the GUI's three panels live here so they can be imported
+without opening a window:
+
+``query_mongo`` / ``query_neo4j``
+    Resolve one query (accession, name or gene) and return the panel text.
+``query_neo4j_graph``
+    The (nodes, edges) neighbourhood drawn in the graph panel, from Neo4j or
+    the memory-mapped CSR graph (``GRAPH_BACKEND``).
+``lookup_batch``
+    Merged records for a list of accessions: one ``$in`` query on MongoDB
+    and one ``UNWIND $ids`` query on Neo4j per batch (see batch_lookup.py).
+
+All of them use the pooled clients from connections.py.
+"""
+import os
+
+import timing
+from connections import get_mongo_collection, get_neo4j_driver
+from csr_graph import CSRGraph
+from degree_stats import format_degree, mongo_names, neo4j_names
+from mongo_search import find_entries, find_protein
+from neo4j_search import fetch_neighbourhood, find_node, find_nodes
+from search_index import SearchIndex
+
+# Set to True to fall back to a full-collection regex scan when no index matches
+MONGO_SCAN_FALLBACK = False
+
+
+def query_mongo(query):
+    """Query MongoDB for the given property."""
+    try:
+        collection = get_mongo_collection()  # Shared, pooled client (see connections.py)
+
+        # Exact Entry, then indexed prefix, then text search (see mongo_search.py)
+        with timing.span("mongo.find"):
+            result, _ = find_protein(collection, query, allow_scan=MONGO_SCAN_FALLBACK)
+
+        if result:
+            # Format and return the result
+            return (f"MongoDB Result:\n"
+                    f"Entry: {result.get('Entry', '')}\n"
+                    f"Entry Name: {result.get('Entry Name', '')}\n"
+                    f"Protein Names: {result.get('Protein names', '')}\n"
+                    f"Gene Names: {result.get('Gene Names', '')}\n"
+                    f"Organism: {result.get('Organism', '')}\n"
+                    f"EC Number: {result.get('EC number', '')}\n"
+                    f"InterPro: {result.get('InterPro', '')}\n"
+                    f"{format_degree(result, mongo_names)}").rstrip()
+        else:
+            return "MongoDB Result: No data found for the given query."
+    except Exception as e:
+        return f"MongoDB Result: Connection failed - {e}"
+
+
+def display_list(value):
+    """List properties (ec_numbers, interPro) as '; '-separated text."""
+    if isinstance(value, (list, tuple)):
+        return "; ".join(map(str, value))
+    return value or ""
+
+
+def query_neo4j(query):
+    """Query Neo4j for the given property."""
+    try:
+        with get_neo4j_driver().session() as session:
+            # Exact entry lookup first, then the full-text index (see neo4j_search.py)
+            with timing.span("neo4j.find"):
+                node, tier, score = find_node(session, query)
+            if node:
+                match = "exact entry" if tier == "exact" else f"full-text, score {score:.2f}"
+                # Format and return the result
+                return (f"Neo4j Result ({match}):\n"
+                        f"Entry: {node.get('entry', '')}\n"
+                        f"Entry Name: {node.get('entryName', '')}\n"
+                        f"Protein Name: {node.get('proteinNames', '')}\n"
+                        f"Gene Name: {node.get('geneName', '')}\n"
+                        f"EC Numbers: {display_list(node.get('ec_numbers'))}\n"
+                        f"InterPro: {display_list(node.get('interPro'))}\n"
+                        f"{format_degree(node, neo4j_names)}").rstrip()
+            else:
+                return "Neo4j Result: No data found for the given query."
+    except Exception as e:
+        return f"Neo4j Result: Connection failed - {e}"
+
+
+# Neighbourhood shown in the graph panel (see neo4j_search.fetch_neighbourhood)
+GRAPH_MIN_WEIGHT = 0.0
+GRAPH_TOP_K = 50
+GRAPH_MAX_HOPS = 1
+GRAPH_PAGE_SIZE = 500
+NEO4J_FETCH_SIZE = 100  # records per network round trip, also the preview batch
+# "neo4j", or "csr" for the memory-mapped graph built by csr_graph.py (works offline)
+GRAPH_BACKEND = "neo4j"
+CSR_GRAPH_PATH = "data/edges2.csr"
+SEARCH_INDEX_SNAPSHOT = "data/search_index.npz"
+csr_graph = None
+search_index = None
+
+
+def get_csr_graph():
+    """Open the embedded CSR graph on first use (memory-mapped, so this is instant)."""
+    global csr_graph
+    if csr_graph is None:
+        csr_graph = CSRGraph(CSR_GRAPH_PATH)
+    return csr_graph
+
+
+def get_search_index():
+    """Load the type-ahead index snapshot on first use; None if it was never built."""
+    global search_index
+    if search_index is None and os.path.exists(SEARCH_INDEX_SNAPSHOT):
+        search_index = SearchIndex.load(SEARCH_INDEX_SNAPSHOT)
+    return search_index
+
+
+def resolve_csr_node(graph, query):
+    """CSR node id of the one protein the query names, or None.
+
+    An accession is looked up directly. Other text is resolved like the GUI
+    does: through the search index snapshot, then MongoDB's tiered lookup.
+    """
+    node = graph.node_id(query)
+    if node is not None:
+        return node
+    index = get_search_index()
+    entry = index.resolve(query) if index is not None else None
+    if entry is None:
+        with timing.span("graph.resolve"):
+            result, _ = find_protein(get_mongo_collection(), query, allow_scan=MONGO_SCAN_FALLBACK)
+        entry = result.get("Entry") if result else None
+    return graph.node_id(entry) if entry else None
+
+
+def query_neo4j_graph(query, on_first_batch=None):
+    """Query Neo4j for graph data; on_first_batch((nodes, edges)) gets an early partial result."""
+    try:
+        if GRAPH_BACKEND == "csr":
+            # Embedded graph, no round trip once the text is resolved to one of its nodes
+            graph = get_csr_graph()
+            node = resolve_csr_node(graph, query)
+            if node is None:
+                print(f"Graph query unresolved: {query!r} names no protein in {CSR_GRAPH_PATH}")
+                return set(), []
+            with timing.span("graph.csr"):
+                return graph.ego_network(graph.entry(node), GRAPH_MIN_WEIGHT, GRAPH_TOP_K, GRAPH_MAX_HOPS,
+                                         GRAPH_PAGE_SIZE)
+        with get_neo4j_driver().session(fetch_size=NEO4J_FETCH_SIZE) as session:
+            # Resolve the query to one protein through the indexes, then stream
+            # the edges of its top-k neighbourhood, strongest first
+            with timing.span("graph.find"):
+                node, _, _ = find_node(session, query)
+            if node is None:
+                return set(), []
+            previews = []
+
+            def preview(nodes, edges):
+                # Only the first batch is drawn early; the rest arrives with the full result
+                if on_first_batch is not None and not previews:
+                    previews.append(True)
+                    on_first_batch((nodes, edges))
+
+            with timing.span("graph.neighbourhood"):
+                nodes, edges, _ = fetch_neighbourhood(
+                    session, node["entry"], min_weight=GRAPH_MIN_WEIGHT, top_k=GRAPH_TOP_K,
+                    max_hops=GRAPH_MAX_HOPS, page_size=GRAPH_PAGE_SIZE, batch_size=NEO4J_FETCH_SIZE,
+                    on_batch=preview)
+            return nodes, edges
+    except Exception as e:
+        print(f"Neo4j graph query failed: {e}")
+        return set(), []
+
+
+BACKEND_NAMES = ("mongo", "neo4j")
+
+
+def lookup_batch(entries, backends=BACKEND_NAMES, neighbours=0, collection=None, driver=None):
+    """One merged record per accession: {"entry", "found", "mongo", "neo4j"}.
+
+    Each backend gets a single query for the whole batch. ``neighbours`` > 0
+    adds each protein's top neighbours from Neo4j. Records keep the input
+    order, including duplicates.
+    """
+    unique = list(dict.fromkeys(entries))
+    results = {}
+    if "mongo" in backends:
+        with timing.span("batch.mongo"):
+            results["mongo"] = find_entries(collection if collection is not None else get_mongo_collection(),
+                                            unique)
+    if "neo4j" in backends:
+        with timing.span("batch.neo4j"), (driver or get_neo4j_driver()).session() as session:
+            results["neo4j"] = find_nodes(session, unique, neighbours, GRAPH_MIN_WEIGHT)
+    records = []
+    for entry in entries:
+        record = {"entry": entry, "found": any(entry in found for found in results.values())}
+        record.update((backend, found.get(entry)) for backend, found in results.items())
+        records.append(record)
+    return records
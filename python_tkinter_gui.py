@@ -1,20 +1,56 @@
 import tkinter as tk
-from tkinter import Text
-from pymongo import MongoClient
-from neo4j import GraphDatabase
+from tkinter import Text, ttk
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from connections import close_all, warm_up
+from dataset_stats import DEFAULT_SNAPSHOT, format_statistics, load_snapshot, refresh
+from graph_layout import GraphRenderer, LayoutCache
+from protein_query import query_mongo, query_neo4j, query_neo4j_graph
+from query_cache import DEFAULT_DISK_PATH, QueryCache
+from search_index import SearchIndex
+import timing
 #import re
-import networkx as nx
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.backends.backend_tkagg import NavigationToolbar2Tk
 #import scipy as sp
-import random
 
 
-# MongoDB and Neo4j connection details
-MONGO_URI = "mongodb://localhost:27017"
-NEO4J_URI = "bolt://localhost:7687"
-NEO4J_AUTH = ("neo4j", "12341234")
+# Local type-ahead index (see search_index.py), loaded from the snapshot when present
+SEARCH_INDEX_CSV = "data/cleaned_mongodb.csv"
+SEARCH_INDEX_SNAPSHOT = "data/search_index.npz"
+SUGGESTION_LIMIT = 8
+search_index = None
+suggestion_entries = []
+
+# Backend calls run on a worker pool and hand their results back to the Tk thread
+# through a queue, which poll_results drains with root.after
+QUERY_WORKERS = 6
+RESULT_POLL_MS = 20
+PANEL_NAMES = {"mongo": "MongoDB", "neo4j": "Neo4j", "graph": "graph"}
+query_pool = ThreadPoolExecutor(max_workers=QUERY_WORKERS, thread_name_prefix="query")
+query_results = queue.Queue()
+query_futures = []
+pending_panels = set()
+query_generation = 0
+query_started = 0.0
+poll_job = None
+search_trace = None  # per-stage timings of the current search (see timing.py)
+
+# Recent results per backend (see query_cache.py), kept on disk across restarts
+QUERY_CACHE_SIZE = 256
+QUERY_CACHE_TTL = 15 * 60  # seconds
+query_cache = QueryCache(QUERY_CACHE_SIZE, QUERY_CACHE_TTL, disk_path=DEFAULT_DISK_PATH)
+
+# Statistics panel snapshot (see dataset_stats.py), refreshed in the background
+# when the node or edge file changed since it was written
+STATS_NODES_CSV = "data/cleaned_mongodb.csv"
+STATS_EDGES = "data/edges2.csv"
+dataset_statistics = load_snapshot(DEFAULT_SNAPSHOT)
 
 def select_all(event):
     """Enable Ctrl+A to select all text in the entry box."""
@@ -22,156 +58,91 @@ def select_all(event):
     event.widget.icursor(tk.END)
     return "break"
 
-def query_mongo(query):
-    """Query MongoDB for the given property."""
+def load_search_index():
+    """Load the type-ahead index in the background; suggestions stay off if it is missing."""
+    global search_index
     try:
-        client = MongoClient(MONGO_URI)
-        db = client["NoSQLProj"]  # Replace with your MongoDB database name
-        collection = db["MoodleDB"]  # Replace with your MongoDB collection name
-        
-        # Query the MongoDB collection
-        result = collection.find_one({"$or": [
-            {"Entry": {"$regex": query, "$options": "i"}},
-            {"Entry Name": {"$regex": query, "$options": "i"}},
-            {"Protein names": {"$regex": query, "$options": "i"}},
-            {"Gene Names": {"$regex": query, "$options": "i"}},
-            {"Organism": query},
-            {"Sequence": query},
-            {"InterPro": {"$regex": query, "$options": "i"}}
-        ]})
-        
-        if result:
-            # Format and return the result
-            return (f"MongoDB Result:\n"
-                    f"Entry: {result.get('Entry', '')}\n"
-                    f"Entry Name: {result.get('Entry Name', '')}\n"
-                    f"Protein Names: {result.get('Protein names', '')}\n"
-                    f"Gene Names: {result.get('Gene Names', '')}\n"
-                    f"Organism: {result.get('Organism', '')}\n"
-                    f"EC Number: {result.get('EC number', '')}\n"
-                    f"InterPro: {result.get('InterPro', '')}")
-        else:
-            return "MongoDB Result: No data found for the given query."
+        if os.path.exists(SEARCH_INDEX_SNAPSHOT):
+            search_index = SearchIndex.load(SEARCH_INDEX_SNAPSHOT)
+        elif os.path.exists(SEARCH_INDEX_CSV):
+            search_index = SearchIndex.from_csv(SEARCH_INDEX_CSV)
     except Exception as e:
-        return f"MongoDB Result: Connection failed - {e}"
+        print(f"Search index unavailable - {e}")
+
+def update_suggestions(event=None):
+    """Show suggestions for the text typed so far."""
+    if event is not None and event.keysym in ("Return", "Down", "Escape"):
+        return
+    text = query_entry.get().strip()
+    matches = search_index.suggest(text, SUGGESTION_LIMIT) if search_index and len(text) >= 2 else []
+    suggestion_list.delete(0, tk.END)
+    suggestion_entries[:] = [entry for _, entry in matches]
+    for label, _ in matches:
+        suggestion_list.insert(tk.END, label)
+    if matches:
+        suggestion_list.config(height=len(matches))
+        suggestion_list.grid()
+    else:
+        suggestion_list.grid_remove()
+
+def choose_suggestion(event=None):
+    """Replace the query with the selected suggestion's Entry and run it."""
+    selection = suggestion_list.curselection()
+    if not selection:
+        return
+    query_entry.delete(0, tk.END)
+    query_entry.insert(0, suggestion_entries[selection[0]])
+    suggestion_list.grid_remove()
+    query_entry.focus_set()
+    execute_query()
+
+def focus_suggestions(event=None):
+    """Move from the entry box into the suggestion list with the Down key."""
+    if suggestion_entries:
+        suggestion_list.focus_set()
+        suggestion_list.selection_clear(0, tk.END)
+        suggestion_list.selection_set(0)
+        suggestion_list.activate(0)
 
-def query_neo4j(query):
-    """Query Neo4j for the given property."""
-    try:
-        driver = GraphDatabase.driver(NEO4J_URI, auth=NEO4J_AUTH)
-        with driver.session() as session:
-            # Query the Neo4j database
-            result = session.run(
-                """
-                MATCH (n)
-                WHERE n.entry =~ '(?i).*' + $query + '.*' 
-                      OR n.entryName =~ '(?i).*' + $query + '.*' 
-                      OR n.geneName =~ '(?i).*' + $query + '.*' 
-                      OR n.proteinNames =~ '(?i).*' + $query + '.*'
-                RETURN n
-                """, parameters={"query": query}  # Properly pass query parameter
-            )
-            record = result.single()
-            if record:
-                node = record["n"]
-                # Format and return the result
-                return (f"Neo4j Result:\n"
-                        f"Entry: {node.get('entry', '')}\n"
-                        f"Entry Name: {node.get('entryName', '')}\n"
-                        f"Protein Name: {node.get('proteinNames', '')}\n"
-                        f"Gene Name: {node.get('geneName', '')}\n"
-                        f"EC Numbers: {node.get('ec_numbers', '')}\n"
-                        f"InterPro: {node.get('interPro', '')}")
-            else:
-                return "Neo4j Result: No data found for the given query."
-    except Exception as e:
-        return f"Neo4j Result: Connection failed - {e}"
-    
 # Global variables for zoom and graph data
 zoom_factor = 1.0
 current_nodes, current_edges = set(), []
+# Layouts of recent query results, so redraws never rerun the layout
+GRAPH_LAYOUT = "auto"  # "auto", "kamada_kawai" or "force" (see graph_layout.py)
+LAYOUT_CACHE_SIZE = 32
+layout_cache = LayoutCache(LAYOUT_CACHE_SIZE, GRAPH_LAYOUT)
+
+# Wheel steps are summed and applied once per frame
+ZOOM_FRAME_MS = 16
+pending_zoom_steps = 0
+zoom_job = None
+
+def refresh_statistics():
+    """Recompute the parts of the statistics snapshot whose input file changed, then repaint."""
+    global dataset_statistics
+    if not (os.path.exists(STATS_NODES_CSV) and os.path.exists(STATS_EDGES)):
+        return
+    try:
+        dataset_statistics, _ = refresh(STATS_NODES_CSV, STATS_EDGES, DEFAULT_SNAPSHOT)
+    except Exception as e:
+        print(f"Dataset statistics unavailable - {e}")
+        return
+    root.after(0, update_statistics)  # repaint the panel on the Tk thread
 
 def update_statistics():
-    """Update the statistics section with 5 random statements."""
-    random_statements = [
-        "Average interactions per protein with similarity > 0.8: 9.64",
-        "Proteins which have the most number of relationships with similarity > 0.8: 293",
-        "Protein with highest interactions with similarity > 0.8: K7T918, K7U6K6",
-        "5 Most frequent EC number: 2.7.11.1 - 675, 2.3.2.27 - 459, 3.4.19.12 - 251, 3.6.4.13 - 213, 2.7.10.1 - 186",
-        "Top organism in dataset: Mus musculus (Mouse)",
-        "Proteins with no interactions (Similarity < 0.02): 4",
-        "Proteins which have no relationships(Jacardian similarity=0): 0",
-        "Mean similarity > 0.8: 0.97"
-    ]
-    
-    # Randomly select 5 statements
-    selected_stats = random.sample(random_statements, 10)
-    
+    """Show the dataset statistics from the snapshot."""
+    if dataset_statistics is None:
+        lines = ["Dataset statistics are not computed yet.",
+                 f"Run: python dataset_stats.py {STATS_NODES_CSV} {STATS_EDGES}"]
+    else:
+        lines = format_statistics(dataset_statistics)
+
     # Update the statistics text widget
     stats_result.config(state="normal")
     stats_result.delete(1.0, tk.END)
-    stats_result.insert(tk.END, "\n".join(selected_stats))
+    stats_result.insert(tk.END, "\n".join(lines))
     stats_result.config(state="disabled")
 
-def query_neo4j_graph(query):
-    """Query Neo4j for graph data."""
-    try:
-        driver = GraphDatabase.driver(NEO4J_URI, auth=NEO4J_AUTH)
-        with driver.session() as session:
-            # Fetch nodes and relationships for the graph
-            # result = session.run(
-            #     """
-            #     MATCH (n)-[r]-(m)
-            #     WHERE n.entry =~ '(?i).*' + $query + '.*' 
-            #           OR n.entryName =~ '(?i).*' + $query + '.*' 
-            #           OR n.proteinNames =~ '(?i).*' + $query + '.*'
-            #           OR n.geneName =~ '(?i).*' + $query + '.*'
-            #     RETURN n, r, m LIMIT 50
-            #     """, parameters={"query": query}
-            # )
-            result = session.run(
-                # """
-                # MATCH (n) 
-                # WHERE n.entry = $query
-                # WITH n
-                # MATCH (n)-[r1]-(b)
-                # WITH n, r1, b
-                # MATCH (b)-[r2]-(c)
-                # RETURN DISTINCT n, r1, b, r2, c LIMIT 30
-                # """, parameters={"query": query}
-                """
-                MATCH (n) 
-                WHERE n.entry = $query
-                WITH n
-                MATCH (n)-[r1]-(b)
-                WITH n, COLLECT(b) AS neighbors
-                UNWIND neighbors AS b
-                MATCH (b)-[r]-(c)
-                WHERE c IN neighbors OR c = n
-                RETURN DISTINCT n, r, b, c LIMIT 500
-                """, parameters={"query": query}
-            )
-            nodes, edges = set(), []
-            for record in result:
-                n = record["n"]
-                # m = record["m"]
-                b = record["b"]
-                c = record["c"]
-                r = record["r"]
-                # r1 = record["r1"]
-                # r2 = record["r2"]
-                nodes.add((n["entry"], n["entryName"]))
-                #nodes.add((m["entry"], m["entryName"]))
-                nodes.add((b["entry"], b.get("entryName", "Unknown")))
-                nodes.add((c["entry"], c.get("entryName", "Unknown")))
-                edges.append((b["entry"], c["entry"], r.get("weight", 1)))  # From b to c
-                #edges.append((n["entry"], m["entry"], r["weight"] if "weight" in r else 1))
-                # edges.append((n["entry"], b["entry"], r1.get("weight", 1)))  # From n to b
-                # edges.append((b["entry"], c["entry"], r2.get("weight", 1)))  # From b to c
-            return nodes, edges
-    except Exception as e:
-        print(f"Neo4j graph query failed: {e}")
-        return set(), []
 '''
 def draw_graph(nodes, edges):
     
@@ -288,101 +259,191 @@ def draw_graph(nodes, edges):
     canvas.draw()
 '''
 
-def on_mousewheel(event):
-    global zoom_factor
-    if event.delta > 0:
-        zoom_factor += 0.1  # Zoom in
-    elif event.delta < 0:
-        zoom_factor = max(0.1, zoom_factor - 0.1)  # Zoom out
-    draw_graph(current_nodes, current_edges)
-
-
-def draw_graph(nodes, edges):
-    """Draw the graph using NetworkX and Matplotlib with better layout and navigation."""
-    global graph_canvas, graph_toolbar, zoom_factor
-
-    # Clear existing graph and toolbar
-    for widget in right_frame.winfo_children():
-        if isinstance(widget, FigureCanvasTkAgg) or isinstance(widget, NavigationToolbar2Tk):
-            widget.destroy()
-
-    # Create a NetworkX graph
-    G = nx.DiGraph()
-    for node in nodes:
-        G.add_node(node[0], label=node[1])
-    for edge in edges:
-        G.add_edge(edge[0], edge[1], weight=edge[2])
+def apply_zoom(idle=True):
+    """Zoom by narrowing the axis limits around the current view centre, then redraw.
+
+    Zoom steps redraw when Tk is idle; a new result (idle=False) is rendered
+    right away so its render time can be measured.
+    """
+    (x0, x1), (y0, y1) = graph_limits
+    half_width = (x1 - x0) / 2 / zoom_factor
+    half_height = (y1 - y0) / 2 / zoom_factor
+    cx, cy = sum(graph_axes.get_xlim()) / 2, sum(graph_axes.get_ylim()) / 2  # keeps any toolbar pan
+    graph_axes.set_xlim(cx - half_width, cx + half_width)
+    graph_axes.set_ylim(cy - half_height, cy + half_height)
+    if idle:
+        graph_canvas.draw_idle()
+    else:
+        with timing.span("draw.canvas"):
+            graph_canvas.draw()
 
-    # Create a Matplotlib figure
-    fig, ax = plt.subplots(figsize=(8 * zoom_factor, 6 * zoom_factor))
-    pos = nx.kamada_kawai_layout(G)  # Use Kamada-Kawai layout for better organization
 
-    # Draw the graph
-    nx.draw_networkx_nodes(G, pos, ax=ax, node_size=500, node_color="skyblue", alpha=0.8)
-    nx.draw_networkx_edges(G, pos, ax=ax, arrowstyle="->", arrowsize=10, edge_color="gray", alpha=0.7)
-    nx.draw_networkx_labels(G, pos, ax=ax, labels={n: n for n in G.nodes}, font_size=8)
-    edge_labels = nx.get_edge_attributes(G, "weight")
-    nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, ax=ax, font_size=6)
+def on_mousewheel(event):
+    """Collect wheel steps; flush_zoom applies them at most once per frame."""
+    global pending_zoom_steps, zoom_job
+    # Windows/macOS report delta, X11 sends Button-4 (up) and Button-5 (down)
+    if event.num == 4 or event.delta > 0:
+        pending_zoom_steps += 1
+    elif event.num == 5 or event.delta < 0:
+        pending_zoom_steps -= 1
+    if zoom_job is None:
+        zoom_job = root.after(ZOOM_FRAME_MS, flush_zoom)
 
-    ax.axis("off")  # Turn off the axis for a cleaner look
 
-    # Embed the Matplotlib figure in tkinter
-    canvas = FigureCanvasTkAgg(fig, master=right_frame)
-    graph_canvas = canvas
-    canvas_widget = canvas.get_tk_widget()
-    canvas_widget.grid(row=1, column=0, sticky="nsew")
-    canvas_widget.bind("<MouseWheel>", on_mousewheel)  # For Windows
-    canvas_widget.bind("<Button-4>", on_mousewheel)    # For Linux
-    canvas_widget.bind("<Button-5>", on_mousewheel)    # For Linux
+def flush_zoom():
+    global zoom_factor, pending_zoom_steps, zoom_job
+    zoom_factor = max(0.1, zoom_factor + 0.1 * pending_zoom_steps)
+    pending_zoom_steps = 0
+    zoom_job = None
+    apply_zoom()
 
-    canvas.draw()
 
-    # Add Matplotlib toolbar for navigation
-    toolbar_frame = tk.Frame(right_frame)
-    toolbar_frame.grid(row=2, column=0, sticky="ew")
-    graph_toolbar = NavigationToolbar2Tk(canvas, toolbar_frame)
-    graph_toolbar.update()
+def draw_graph(nodes, edges):
+    """Show a query result on the persistent figure, keeping the zoom level (see graph_layout.py)."""
+    with timing.span("draw.layout"):
+        layout = layout_cache.get(nodes, edges)
+    with timing.span("draw.artists"):
+        graph_renderer.draw(*layout)
+    graph_toolbar.update()  # the toolbar's Home view is now this graph
+    apply_zoom(idle=False)
 
 
 def zoom_in():
     """Zoom in the graph."""
     global zoom_factor
     zoom_factor += 0.2
-    draw_graph(current_nodes, current_edges)
+    apply_zoom()
 
 def zoom_out():
     """Zoom out the graph."""
     global zoom_factor
     zoom_factor = max(0.2, zoom_factor - 0.2)
-    draw_graph(current_nodes, current_edges)
+    apply_zoom()
+
+
+# Panel, lookup and whether its result may be cached. Failed lookups and empty
+# graphs are not cached, so they are retried next time
+BACKENDS = (
+    ("mongo", query_mongo, lambda text: "Connection failed" not in text),
+    ("neo4j", query_neo4j, lambda text: "Connection failed" not in text),
+    ("graph", query_neo4j_graph, lambda graph: bool(graph[0])),
+)
+
+
+def show_text(widget, text):
+    """Replace the contents of a read-only result panel."""
+    widget.config(state="normal")
+    widget.delete(1.0, tk.END)
+    widget.insert(tk.END, text)
+    widget.config(state="disabled")
+
+
+def poll_results():
+    """Show every backend result that has arrived; keep polling while any are pending."""
+    global current_nodes, current_edges, poll_job
+    while True:
+        try:
+            generation, panel, future = query_results.get_nowait()
+        except queue.Empty:
+            break
+        if generation != query_generation:
+            continue  # a newer search replaced this one
+        if panel == "graph_preview":
+            # First streamed batch of the graph; "future" is the (nodes, edges) payload
+            if "graph" in pending_panels:
+                current_nodes, current_edges = future
+                with timing.use_trace(search_trace):
+                    draw_graph(current_nodes, current_edges)
+            continue
+        if future.cancelled():
+            continue
+        pending_panels.discard(panel)
+        if panel == "mongo":
+            show_text(mongo_result, future.result())
+        elif panel == "neo4j":
+            show_text(neo4j_result, future.result())
+        else:
+            current_nodes, current_edges = future.result()
+            with timing.use_trace(search_trace):
+                draw_graph(current_nodes, current_edges)
+
+    elapsed = time.perf_counter() - query_started
+    if pending_panels:
+        waiting = ", ".join(PANEL_NAMES[panel] for panel in sorted(pending_panels))
+        progress_label.config(text=f"Waiting for {waiting}... ({elapsed:.1f}s)")
+        poll_job = root.after(RESULT_POLL_MS, poll_results)
+    else:
+        progress_bar.stop()
+        cache = query_cache.stats()
+        progress_label.config(text=f"Done in {elapsed:.2f}s (cache: {cache['hits']} hits, "
+                                   f"{cache['misses']} misses)")
+        poll_job = None
+        if timing.is_enabled():
+            status_bar.config(text=search_trace.finish().summary())
+            query_pool.submit(timing.export, search_trace)  # file writes stay off the Tk thread
 
 
 def execute_query():
-    """Execute the query on MongoDB and Neo4j and update the UI."""
+    """Start the MongoDB, Neo4j and graph queries concurrently without blocking the window.
+
+    Each panel is filled in by poll_results as soon as its own result arrives.
+    Results still in flight from an older search are discarded.
+    """
+    global query_generation, query_started, poll_job, search_trace
     query = query_entry.get().strip()
     if not query:
         return
-    
-    # Query MongoDB
-    mongo_result_text = query_mongo(query)
-    mongo_result.config(state="normal")
-    mongo_result.delete(1.0, tk.END)
-    mongo_result.insert(tk.END, mongo_result_text)
-    mongo_result.config(state="disabled")
-    
-    # Query Neo4j
-    neo4j_result_text = query_neo4j(query)
-    neo4j_result.config(state="normal")
-    neo4j_result.delete(1.0, tk.END)
-    neo4j_result.insert(tk.END, neo4j_result_text)
-    neo4j_result.config(state="disabled")
-
+    suggestion_list.grid_remove()
+
+    search_trace = timing.Trace(query)
+
+    # Text naming exactly one protein becomes its Entry, so both databases get an exact
+    # lookup; ambiguous text is searched as typed
+    if search_index is not None:
+        with timing.use_trace(search_trace), timing.span("resolve"):
+            query = search_index.resolve(query) or query
+
+    # Drop the previous search: cancel calls that have not started and ignore the rest
+    query_generation += 1
+    for future in query_futures:
+        future.cancel()
+    query_futures.clear()
+    pending_panels.clear()
+    query_started = time.perf_counter()
+
+    for panel, function, cacheable in BACKENDS:
+        if panel == "graph":
+            function = partial(function, on_first_batch=lambda graph, generation=query_generation:
+                               query_results.put((generation, "graph_preview", graph)))
+        # Each panel's total (cache lookup included) and its inner spans go into this search's trace
+        run = timing.traced(search_trace, panel, query_cache.get_or_run)
+        future = query_pool.submit(run, panel, query, function, cacheable)
+        future.add_done_callback(
+            lambda done, panel=panel, generation=query_generation: query_results.put((generation, panel, done)))
+        query_futures.append(future)
+        pending_panels.add(panel)
     update_statistics()
 
-    # Query Neo4j for graph data
-    global current_nodes, current_edges
-    current_nodes, current_edges = query_neo4j_graph(query)
-    draw_graph(current_nodes, current_edges)
+    progress_bar.start()
+    progress_label.config(text=f"Searching for {query}...")
+    if poll_job is None:
+        poll_job = root.after(RESULT_POLL_MS, poll_results)
+
+
+def clear_query_cache(event=None):
+    """Forget cached results, e.g. after the databases were reloaded (bound to F5)."""
+    query_cache.invalidate()
+    progress_label.config(text="Query cache cleared")
+
+
+def on_close():
+    """Release the database connections and close the window."""
+    if poll_job is not None:
+        root.after_cancel(poll_job)
+    query_pool.shutdown(wait=False, cancel_futures=True)
+    query_cache.save()
+    close_all()
+    root.destroy()
 
 
 # Create the main window
@@ -422,6 +483,25 @@ query_entry.bind("<Control-a>", select_all)  # Enable Ctrl+A to select all
 search_button = tk.Button(query_frame, text="Search", command=execute_query)
 search_button.grid(row=0, column=1, padx=5)
 
+# As-you-type suggestions from the local search index (hidden until there are matches)
+suggestion_list = tk.Listbox(query_frame, height=SUGGESTION_LIMIT, activestyle="none")
+suggestion_list.grid(row=1, column=0, columnspan=2, sticky="ew")
+suggestion_list.grid_remove()
+suggestion_list.bind("<Double-Button-1>", choose_suggestion)
+suggestion_list.bind("<Return>", choose_suggestion)
+suggestion_list.bind("<Escape>", lambda event: suggestion_list.grid_remove())
+
+# Progress of the current search
+progress_bar = ttk.Progressbar(query_frame, mode="indeterminate", length=80)
+progress_bar.grid(row=2, column=1, padx=5, pady=2)
+progress_label = tk.Label(query_frame, text="", anchor="w")
+progress_label.grid(row=2, column=0, sticky="ew")
+
+query_entry.bind("<KeyRelease>", update_suggestions)
+query_entry.bind("<Return>", lambda event: execute_query())
+query_entry.bind("<Down>", focus_suggestions)
+query_entry.bind("<Escape>", lambda event: suggestion_list.grid_remove())
+
 # Add MongoDB result section
 mongo_label = tk.Label(left_frame, text="MongoDB Result:")
 mongo_label.grid(row=1, column=0, sticky="w", padx=5)
@@ -442,14 +522,30 @@ stats_label.grid(row=3, column=0, sticky="w", padx=5)
 
 stats_result = Text(left_frame, wrap="word", height=10, state="disabled", width=50)  # Adjust width
 stats_result.grid(row=3, column=0, sticky="nsew", padx=5, pady=5)
+update_statistics()  # the snapshot is loaded already, so this is instant
 
 # Add graph display section on the right
 graph_label = tk.Label(right_frame, text="Neo4J Graph Display for the Query:")
 graph_label.grid(row=0, column=0, sticky="w", padx=5, pady=5)
 
-# Add a canvas for displaying the graph (placeholder)
-graph_canvas = tk.Canvas(right_frame, bg="white", bd=2, relief=tk.SUNKEN, width=400, height=400)  # Adjust width/height
-graph_canvas.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
+# One long-lived figure, canvas and toolbar; draw_graph only swaps the artists' data
+graph_figure = Figure(figsize=(8, 6))
+graph_axes = graph_figure.add_subplot()
+graph_renderer = GraphRenderer(graph_axes)
+graph_limits = (graph_axes.get_xlim(), graph_axes.get_ylim())  # the unzoomed view
+
+graph_canvas = FigureCanvasTkAgg(graph_figure, master=right_frame)
+canvas_widget = graph_canvas.get_tk_widget()
+canvas_widget.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
+canvas_widget.bind("<MouseWheel>", on_mousewheel)  # For Windows
+canvas_widget.bind("<Button-4>", on_mousewheel)    # For Linux
+canvas_widget.bind("<Button-5>", on_mousewheel)    # For Linux
+
+# Add Matplotlib toolbar for navigation
+toolbar_frame = tk.Frame(right_frame)
+toolbar_frame.grid(row=3, column=0, sticky="ew")
+graph_toolbar = NavigationToolbar2Tk(graph_canvas, toolbar_frame)
+graph_toolbar.update()
 
 # Add zoom buttons
 zoom_in_button = tk.Button(right_frame, text="+", font=("Arial", 12), width=2)
@@ -461,5 +557,17 @@ zoom_out_button.grid(row=2, column=0, sticky="w", padx=10, pady=5)
 zoom_in_button.config(command=zoom_in)
 zoom_out_button.config(command=zoom_out)
 
+# Per-stage timings of the last search (see timing.py)
+status_bar = tk.Label(root, text="", anchor="w", bd=1, relief=tk.SUNKEN)
+status_bar.grid(row=1, column=0, columnspan=2, sticky="ew")
+
+root.protocol("WM_DELETE_WINDOW", on_close)
+root.bind("<F5>", clear_query_cache)
+
+if __name__ == "__main__":
+    # Open the database connections in the background so the window shows up right away
+    threading.Thread(target=warm_up, daemon=True).start()
+    threading.Thread(target=load_search_index, daemon=True).start()
+    threading.Thread(target=refresh_statistics, daemon=True).start()
 
-root.mainloop()
+    root.mainloop()
@@ -0,0 +1,136 @@
+"""Result cache for the GUI's MongoDB, Neo4j and graph lookups.
+
+Entries are keyed by ``(backend, normalised query)`` and hold whatever the
+lookup returned: the formatted text of query_mongo / query_neo4j or the
+``(nodes, edges)`` payload of query_neo4j_graph. The cache is bounded in two
+ways:
+
+* ``max_entries``: least recently used entries are evicted first,
+* ``ttl``: entries older than this many seconds are treated as misses.
+
+With ``disk_path`` set, the cache is loaded from a pickle at startup and
+written back by ``save()`` (the GUI calls it on close), so a restarted GUI
+answers recent searches without touching the databases. The loaders call
+``clear_disk_cache()`` after a reload, and ``invalidate()`` drops
+in-memory entries.
+
+All methods are thread-safe; the GUI calls them from its query workers.
+"""
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from mongo_search import normalise
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TTL = 15 * 60
+DEFAULT_DISK_PATH = "data/query_cache.pkl"
+MISSING = object()
+
+
+class QueryCache:
+    """LRU cache with a TTL and an optional pickle file behind it."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL, disk_path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_path = disk_path
+        self.entries = OrderedDict()    # (backend, key) -> (stored_at, value), oldest first
+        self.lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+        if disk_path and os.path.exists(disk_path):
+            self.load()
+
+    def get(self, backend, query):
+        """Return the cached value, or MISSING if absent or expired."""
+        key = (backend, normalise(query))
+        with self.lock:
+            item = self.entries.get(key)
+            if item is not None and time.time() - item[0] > self.ttl:
+                del self.entries[key]
+                self.expirations += 1
+                item = None
+            if item is None:
+                self.misses += 1
+                return MISSING
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def put(self, backend, query, value):
+        key = (backend, normalise(query))
+        with self.lock:
+            self.entries[key] = (time.time(), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_run(self, backend, query, function, cacheable=lambda value: True):
+        """Return the cached value or run ``function(query)`` and cache it.
+
+        Results for which ``cacheable`` is false (failures, empty graphs) are
+        returned but not stored.
+        """
+        value = self.get(backend, query)
+        if value is MISSING:
+            value = function(query)
+            if cacheable(value):
+                self.put(backend, query, value)
+        return value
+
+    def invalidate(self, backend=None):
+        """Drop every entry, or only those of one backend."""
+        with self.lock:
+            if backend is None:
+                self.entries.clear()
+            else:
+                for key in [key for key in self.entries if key[0] == backend]:
+                    del self.entries[key]
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses,
+                    "hit_rate": self.hits / lookups if lookups else 0.0,
+                    "evictions": self.evictions, "expirations": self.expirations}
+
+    def load(self):
+        """Read unexpired entries from ``disk_path``; a damaged file is ignored."""
+        try:
+            with open(self.disk_path, "rb") as f:
+                entries = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            print(f"Ignoring query cache {self.disk_path} - {e}")
+            return
+        now = time.time()
+        with self.lock:
+            for key, (stored_at, value) in entries.items():
+                if now - stored_at <= self.ttl:
+                    self.entries[key] = (stored_at, value)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def save(self):
+        """Write the entries to ``disk_path`` atomically (no-op without a disk tier)."""
+        if not self.disk_path:
+            return
+        with self.lock:
+            entries = OrderedDict(self.entries)
+        directory = os.path.dirname(self.disk_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.disk_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.disk_path)
+
+
+def clear_disk_cache(path=DEFAULT_DISK_PATH):
+    """Remove the on-disk cache so a restarted GUI does not serve data from before a reload."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,204 @@
+"""In-process type-ahead index over accessions, entry, gene and protein names.
+
+Built once at GUI startup from data/cleaned_mongodb.csv (or loaded from a
+prebuilt snapshot). It answers suggestions locally while the user types, and
+``resolve`` turns the typed text into a canonical ``Entry`` before any
+database is queried, but only when the text names exactly one protein.
+
+Every protein contributes normalised keys (lower-case, single-spaced, as in
+mongo_search.normalise): its Entry, Entry Name, each gene name and its
+protein names. The index holds:
+
+* a sorted key list, searched with ``bisect`` for prefix matches,
+* a trigram index (trigram -> sorted key ids) for substring matches: the two
+  rarest trigrams of the query are intersected and each candidate is then
+  checked with ``in``.
+
+Usage:
+    python search_index.py build data/cleaned_mongodb.csv data/search_index.npz
+    python search_index.py query data/search_index.npz kinase
+"""
+import argparse
+import bisect
+import sys
+import time
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from mongo_search import normalise
+
+COLUMNS = ["Entry", "Entry Name", "Gene Names", "Protein names"]
+DEFAULT_LIMIT = 10
+LABEL_WIDTH = 60
+
+
+def join_strings(strings):
+    """Pack strings without newlines into a uint8 array for the snapshot."""
+    return np.frombuffer("\n".join(strings).encode("utf-8"), dtype=np.uint8)
+
+
+def split_strings(array):
+    return bytes(array).decode("utf-8").split("\n") if len(array) else []
+
+
+class SearchIndex:
+    """Prefix and substring lookup from typed text to proteins."""
+
+    def __init__(self, keys, key_rows, entries, labels, trigrams, offsets, postings):
+        self.keys = keys                # sorted list of normalised keys
+        self.key_rows = key_rows        # int32 protein row for every key
+        self.entries = entries          # Entry accession per protein row
+        self.labels = labels            # suggestion text per protein row
+        self.offsets = offsets          # postings[offsets[i]:offsets[i + 1]] belong to trigrams[i]
+        self.postings = postings        # int32 key ids, sorted within each trigram
+        self.trigrams = trigrams
+        self.trigram_ids = {trigram: i for i, trigram in enumerate(trigrams)}
+
+    @classmethod
+    def build(cls, entries, entry_names, gene_names, protein_names):
+        """Build the index from per-protein column values."""
+        pairs = set()
+        labels = []
+        for row, (entry, entry_name, genes, proteins) in enumerate(
+                zip(entries, entry_names, gene_names, protein_names)):
+            values = [entry, entry_name, proteins]
+            if genes and genes != "Unknown":
+                values.extend(genes.split())
+            pairs.update((normalise(value), row) for value in values if value)
+            labels.append(f"{entry}  {entry_name}  {proteins}"[:LABEL_WIDTH])
+        pairs = sorted(pairs)
+        keys = [key for key, _ in pairs]
+        key_rows = np.fromiter((row for _, row in pairs), dtype=np.int32, count=len(pairs))
+
+        grams = defaultdict(list)
+        for key_id, key in enumerate(keys):
+            for trigram in {key[i:i + 3] for i in range(len(key) - 2)}:
+                grams[trigram].append(key_id)
+        trigrams = sorted(grams)
+        lengths = np.fromiter((len(grams[t]) for t in trigrams), dtype=np.int64, count=len(trigrams))
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        postings = np.fromiter((key_id for t in trigrams for key_id in grams[t]), dtype=np.int32,
+                               count=int(offsets[-1]))
+        return cls(keys, key_rows, list(entries), labels, trigrams, offsets, postings)
+
+    @classmethod
+    def from_csv(cls, path):
+        """Build the index from cleaned_mongodb.csv."""
+        df = pd.read_csv(path, usecols=COLUMNS, dtype=str, keep_default_na=False)
+        return cls.build(df["Entry"], df["Entry Name"], df["Gene Names"], df["Protein names"])
+
+    @classmethod
+    def load(cls, path):
+        """Load a snapshot written by save()."""
+        with np.load(path) as data:
+            return cls(split_strings(data["keys"]), data["key_rows"], split_strings(data["entries"]),
+                       split_strings(data["labels"]), split_strings(data["trigrams"]),
+                       data["offsets"], data["postings"])
+
+    def save(self, path):
+        """Write a compact snapshot that loads much faster than a rebuild."""
+        np.savez(path, keys=join_strings(self.keys), key_rows=self.key_rows,
+                 entries=join_strings(self.entries), labels=join_strings(self.labels),
+                 trigrams=join_strings(self.trigrams), offsets=self.offsets, postings=self.postings)
+
+    def memory_bytes(self):
+        """Approximate footprint of the strings, lists and arrays held by the index."""
+        strings = [self.keys, self.entries, self.labels, self.trigrams]
+        size = sum(sys.getsizeof(values) + sum(map(sys.getsizeof, values)) for values in strings)
+        size += sys.getsizeof(self.trigram_ids)
+        return size + self.key_rows.nbytes + self.offsets.nbytes + self.postings.nbytes
+
+    def prefix_rows(self, key, limit):
+        """Protein rows with a key starting with ``key``, exact matches first."""
+        rows = {}
+        start = bisect.bisect_left(self.keys, key)
+        for key_id in range(start, len(self.keys)):
+            if not self.keys[key_id].startswith(key) or len(rows) >= limit:
+                break
+            rows[int(self.key_rows[key_id])] = None
+        return list(rows)
+
+    def substring_rows(self, key, limit, rows=None):
+        """Protein rows with a key containing ``key`` (at least three characters).
+
+        Rows already in ``rows`` (a dict used as an ordered set) are kept first.
+        """
+        ids = [self.trigram_ids.get(key[i:i + 3]) for i in range(len(key) - 2)]
+        if None in ids:
+            return list(rows or ())
+        lists = sorted((self.postings[self.offsets[i]:self.offsets[i + 1]] for i in set(ids)), key=len)
+        candidates = lists[0] if len(lists) == 1 else np.intersect1d(lists[0], lists[1], assume_unique=True)
+        rows = dict.fromkeys(rows or ())
+        for key_id in candidates:
+            if len(rows) >= limit:
+                break
+            if key in self.keys[key_id]:
+                rows[int(self.key_rows[key_id])] = None
+        return list(rows)
+
+    def search(self, text, limit=DEFAULT_LIMIT):
+        """Distinct protein rows for the text: prefix matches, then substring matches."""
+        key = normalise(text)
+        if not key:
+            return []
+        rows = self.prefix_rows(key, limit)
+        if len(rows) < limit and len(key) >= 3:
+            rows = self.substring_rows(key, limit, rows)
+        return rows
+
+    def suggest(self, text, limit=DEFAULT_LIMIT):
+        """List of (label, Entry) suggestions for the text typed so far."""
+        return [(self.labels[row], self.entries[row]) for row in self.search(text, limit)]
+
+    def resolve(self, text):
+        """Canonical Entry for the text, or None unless it names exactly one protein.
+
+        An exact key decides on its own; otherwise every key starting with the
+        text must belong to the same protein. Ambiguous text is left to the
+        database search.
+        """
+        key = normalise(text)
+        if not key:
+            return None
+        start = bisect.bisect_left(self.keys, key)
+        stop = bisect.bisect_right(self.keys, key, lo=start)
+        rows = self.key_rows[start:stop].tolist() if stop > start else self.prefix_rows(key, 2)
+        entries = {self.entries[row] for row in rows}
+        return entries.pop() if len(entries) == 1 else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the type-ahead search index.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="build a snapshot from cleaned_mongodb.csv")
+    build.add_argument("csv")
+    build.add_argument("snapshot")
+    query = commands.add_parser("query", help="print suggestions from a snapshot")
+    query.add_argument("snapshot")
+    query.add_argument("text")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        index = SearchIndex.from_csv(args.csv)
+        build_seconds = time.perf_counter() - start
+        index.save(args.snapshot)
+        start = time.perf_counter()
+        SearchIndex.load(args.snapshot)
+        print(f"{len(index.entries)} proteins, {len(index.keys)} keys, {len(index.trigrams)} trigrams")
+        print(f"Build {build_seconds:.2f}s, snapshot load {time.perf_counter() - start:.2f}s, "
+              f"memory {index.memory_bytes() / 1e6:.1f} MB")
+    else:
+        index = SearchIndex.load(args.snapshot)
+        start = time.perf_counter()
+        suggestions = index.suggest(args.text)
+        elapsed = (time.perf_counter() - start) * 1000
+        for label, _ in suggestions:
+            print(label)
+        print(f"{len(suggestions)} suggestions in {elapsed:.3f} ms, resolves to {index.resolve(args.text)}")
+
+
+if __name__ == "__main__":
+    main()
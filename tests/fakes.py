@@ -0,0 +1,56 @@
+"""Stand-ins for the Neo4j driver that record the Cypher they are sent."""
+import threading
+
+
+class FakeResult:
+    def __init__(self, records=()):
+        self.records = list(records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def consume(self):
+        return None
+
+    def single(self):
+        return self.records[0] if self.records else None
+
+
+class FakeSession:
+    """Records (query, parameters) of every run; ``responder`` supplies the records returned."""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, parameters=None, **kwargs):
+        parameters = {**(parameters or {}), **kwargs}
+        with self.driver.lock:
+            self.driver.calls.append((query, parameters))
+        return FakeResult(self.driver.responder(query, parameters))
+
+    def execute_write(self, work):
+        return work(self)
+
+    execute_read = execute_write
+
+    def close(self):
+        pass
+
+
+class FakeDriver:
+    def __init__(self, responder=lambda query, parameters: ()):
+        self.calls = []
+        self.lock = threading.Lock()
+        self.responder = responder
+
+    def session(self, **config):
+        return FakeSession(self)
+
+    def close(self):
+        pass
@@ -0,0 +1,50 @@
+"""Brute-force reference implementations the optimised code is checked against."""
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_interpro
+from edge_builder import build_edges, split_interpro
+
+
+def jaccard(a, b):
+    a, b = set(a), set(b)
+    union = a | b
+    return len(a & b) / len(union) if union else 0.0
+
+
+def jaccard_edges(token_lists, threshold):
+    """{(i, j): weight} for every pair i < j with Jaccard > threshold."""
+    edges = {}
+    for i in range(len(token_lists)):
+        for j in range(i + 1, len(token_lists)):
+            weight = jaccard(token_lists[i], token_lists[j])
+            if weight > threshold:
+                edges[(i, j)] = weight
+    return edges
+
+
+def sample_proteins(n_proteins=200, seed=0):
+    """(entries, raw InterPro fields) with families of similar proteins and a few missing fields."""
+    entries, interpro = synthetic_interpro(n_proteins, seed)
+    for i in range(0, n_proteins, 37):
+        interpro[i] = None
+    return entries, interpro
+
+
+def sample_token_lists(n_proteins=200, seed=0):
+    return [split_interpro(value) for value in sample_proteins(n_proteins, seed)[1]]
+
+
+def write_sample_edges(path, threshold=0.5, n_proteins=200, seed=0):
+    """Write the sample's edge CSV with the exact builder and return the path."""
+    entries, interpro = sample_proteins(n_proteins, seed)
+    build_edges(entries, interpro, str(path), threshold)
+    return str(path)
+
+
+def reference_degrees(frame, threshold):
+    """(degree, strength) per protein from both ends of every edge above the threshold."""
+    above = frame[frame["Weight"] > threshold]
+    ends = pd.concat([above[["Protein1", "Weight"]].set_axis(["Entry", "Weight"], axis=1),
+                      above[["Protein2", "Weight"]].set_axis(["Entry", "Weight"], axis=1)])
+    grouped = ends.groupby("Entry")["Weight"]
+    return grouped.size().to_dict(), grouped.sum().to_dict()
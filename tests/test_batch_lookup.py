@@ -0,0 +1,78 @@
+import io
+import threading
+import time
+
+import mongomock
+
+import protein_query
+from batch_lookup import batched, read_accessions, run_batches
+from fakes import FakeDriver
+from neo4j_search import BATCH_NEIGHBOURS_QUERY, BATCH_QUERY
+
+
+def test_read_accessions(tmp_path, monkeypatch):
+    path = tmp_path / "accessions.txt"
+    path.write_text("# header comment\np12345, Q67890;A0A000\n\n  o11111   # trailing comment\n")
+    monkeypatch.setattr("sys.stdin", io.StringIO("x1\tx2\n"))
+    assert list(read_accessions([str(path), "-"])) == ["P12345", "Q67890", "A0A000", "O11111", "X1", "X2"]
+
+
+def test_batched():
+    assert list(batched(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(batched(range(6), 3)) == [[0, 1, 2], [3, 4, 5]]
+    assert list(batched([], 3)) == []
+
+
+def test_run_batches_keeps_input_order():
+    # Earlier batches finish last, so completion order is the reverse of input order
+    def lookup(batch):
+        time.sleep(0.01 * (10 - batch[0]))
+        return [item * 10 for item in batch]
+
+    results = list(run_batches(([i] for i in range(10)), lookup, workers=4))
+    assert results == [[i * 10] for i in range(10)]
+
+
+def test_run_batches_bounds_batches_in_flight():
+    pulled = []
+    lock = threading.Lock()
+
+    def batches():
+        for i in range(20):
+            with lock:
+                pulled.append(i)
+            yield [i]
+
+    # The batch read just before a result is yielded is at most 2 * workers ahead of it
+    for batch in run_batches(batches(), lambda batch: batch, workers=2):
+        assert len(pulled) - batch[0] <= 2 * 2 + 1
+
+
+def test_lookup_batch_merges_backends():
+    collection = mongomock.MongoClient()["test"]["MoodleDB"]
+    collection.insert_many([{"Entry": "P1", "Entry Name": "ONE_MOUSE"}, {"Entry": "P2", "Entry Name": "TWO_MOUSE"}])
+
+    def respond(query, params):
+        assert query == BATCH_QUERY
+        return [{"id": i, "p": {"entry": i}} for i in params["ids"] if i in ("P2", "P3")]
+
+    driver = FakeDriver(respond)
+    records = protein_query.lookup_batch(["P1", "P2", "P3", "P4", "P1"], collection=collection, driver=driver)
+    assert [record["entry"] for record in records] == ["P1", "P2", "P3", "P4", "P1"]
+    assert [record["found"] for record in records] == [True, True, True, False, True]
+    assert records[0]["mongo"] == {"Entry": "P1", "Entry Name": "ONE_MOUSE"} and records[0]["neo4j"] is None
+    assert records[1]["neo4j"] == {"entry": "P2"}
+    assert records[2]["mongo"] is None
+    assert len(driver.calls) == 1
+    assert driver.calls[0][1]["ids"] == ["P1", "P2", "P3", "P4"]  # duplicates are queried once
+
+
+def test_lookup_batch_single_backend_with_neighbours():
+    driver = FakeDriver(lambda query, params: [{"id": "P1", "p": {"entry": "P1"},
+                                                "neighbours": [{"entry": "P2", "weight": 0.9}]}])
+    records = protein_query.lookup_batch(["P1"], backends=("neo4j",), neighbours=5, driver=driver)
+    assert records == [{"entry": "P1", "found": True,
+                        "neo4j": {"entry": "P1", "neighbours": [{"entry": "P2", "weight": 0.9}]}}]
+    query, params = driver.calls[0]
+    assert query == BATCH_NEIGHBOURS_QUERY
+    assert params["top_k"] == 5 and params["min_weight"] == protein_query.GRAPH_MIN_WEIGHT
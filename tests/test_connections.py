@@ -0,0 +1,68 @@
+import threading
+
+import pytest
+
+import connections
+
+
+class FakeClient:
+    created = []
+
+    def __init__(self, *args, **kwargs):
+        self.args, self.kwargs = args, kwargs
+        self.closed = False
+        FakeClient.created.append(self)
+
+    def __getitem__(self, name):
+        return {"MoodleDB": (self, name)}
+
+    @property
+    def admin(self):
+        return self
+
+    def command(self, name):
+        raise ConnectionError("mongo down")
+
+    def verify_connectivity(self):
+        return None
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_clients(monkeypatch):
+    FakeClient.created = []
+    monkeypatch.setattr(connections, "MongoClient", FakeClient)
+    monkeypatch.setattr(connections.GraphDatabase, "driver", FakeClient)
+    connections.close_all()
+    yield FakeClient.created
+    connections.close_all()
+
+
+def test_clients_are_created_once_across_threads(fake_clients):
+    clients = []
+    threads = [threading.Thread(target=lambda: clients.append(connections.get_mongo_client())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(client) for client in clients}) == 1
+    assert connections.get_neo4j_driver() is connections.get_neo4j_driver()
+    assert len(fake_clients) == 2
+
+    mongo, neo4j = fake_clients
+    assert mongo.kwargs["maxPoolSize"] == connections.MONGO_MAX_POOL_SIZE
+    assert neo4j.kwargs["max_connection_pool_size"] == connections.NEO4J_MAX_POOL_SIZE
+
+
+def test_close_all_releases_and_recreates(fake_clients):
+    first = connections.get_mongo_client()
+    connections.get_neo4j_driver()
+    connections.close_all()
+    assert all(client.closed for client in fake_clients)
+    assert connections.get_mongo_client() is not first
+
+
+def test_health_check_reports_each_backend(fake_clients):
+    assert connections.health_check() == {"mongo": "mongo down", "neo4j": None}
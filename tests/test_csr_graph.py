@@ -0,0 +1,115 @@
+from collections import defaultdict
+
+import mongomock
+import numpy as np
+import pandas as pd
+import pytest
+
+import protein_query
+from csr_graph import CSRGraph, build_graph
+from mongo_search import search_keys
+from reference import write_sample_edges
+from search_index import SearchIndex
+
+
+def reference_ego_network(edges, centre, min_weight, top_k, hops, max_edges):
+    """Ego network by walking a plain adjacency dict, in CSRGraph.ego_network's order."""
+    adjacency = defaultdict(list)
+    for a, b, w in edges:
+        adjacency[a].append((w, b))
+        adjacency[b].append((w, a))
+    for neighbours in adjacency.values():
+        neighbours.sort(key=lambda item: (-item[0], item[1]))
+
+    members = frontier = {centre}
+    for _ in range(hops):
+        ring = {b for a in frontier for w, b in adjacency[a][:top_k] if w > min_weight}
+        frontier = ring - members
+        members = members | frontier
+    inside = sorted(((w, min(a, b), max(a, b)) for a, b, w in edges
+                     if a in members and b in members and w > min_weight),
+                    key=lambda edge: (-edge[0], edge[1], edge[2]))
+    return [(a, b, w) for w, a, b in inside[:max_edges]]
+
+
+@pytest.fixture(scope="module")
+def sample_graph(tmp_path_factory):
+    tmp_path = tmp_path_factory.mktemp("csr")
+    edges_path = write_sample_edges(tmp_path / "edges.csv")
+    names = pd.DataFrame({"Entry": pd.read_csv(edges_path)["Protein1"].unique()})
+    names["Entry Name"] = names["Entry"] + "_MOUSE"
+    names.to_csv(tmp_path / "nodes.csv", index=False)
+    build_graph(edges_path, str(tmp_path / "edges.csr"), str(tmp_path / "nodes.csv"))
+
+    frame = pd.read_csv(edges_path)
+    edges = list(zip(frame["Protein1"], frame["Protein2"], frame["Weight"].tolist()))
+    return CSRGraph(str(tmp_path / "edges.csr")), edges, dict(zip(names["Entry"], names["Entry Name"]))
+
+
+@pytest.mark.parametrize("min_weight,top_k,hops,max_edges", [
+    (0.0, None, 1, None), (0.6, None, 1, None), (0.5, 3, 1, None), (0.5, 3, 2, None), (0.7, 5, 2, 10),
+])
+def test_ego_network_matches_reference(sample_graph, min_weight, top_k, hops, max_edges):
+    graph, edges, names = sample_graph
+    for centre in sorted({a for a, _, _ in edges})[::7]:
+        nodes, found = graph.ego_network(centre, min_weight, top_k, hops, max_edges)
+        expected = reference_ego_network(edges, centre, min_weight, top_k, hops, max_edges)
+        assert [(a, b) for a, b, _ in found] == [(a, b) for a, b, _ in expected]
+        assert np.allclose([w for _, _, w in found], [w for _, _, w in expected])
+        shown = {entry for a, b, _ in expected for entry in (a, b)}
+        assert nodes == {(entry, names.get(entry, "Unknown")) for entry in shown}
+
+
+def test_unknown_entry(sample_graph):
+    graph, _, _ = sample_graph
+    assert graph.ego_network("NOPE") == (set(), [])
+
+
+def test_edge_count_matches_csv(sample_graph):
+    graph, edges, _ = sample_graph
+    assert graph.manifest["edges"] == len(edges)
+    assert int(graph.indptr[-1]) == 2 * len(edges)
+
+
+@pytest.fixture
+def csr_backend(sample_graph, tmp_path, monkeypatch):
+    graph, edges, names = sample_graph
+    monkeypatch.setattr(protein_query, "GRAPH_BACKEND", "csr")
+    monkeypatch.setattr(protein_query, "csr_graph", graph)
+    monkeypatch.setattr(protein_query, "search_index", None)
+    monkeypatch.setattr(protein_query, "SEARCH_INDEX_SNAPSHOT", str(tmp_path / "search_index.npz"))
+    collection = mongomock.MongoClient()["test"]["MoodleDB"]
+    monkeypatch.setattr(protein_query, "get_mongo_collection", lambda: collection)
+    centre = edges[0][0]
+    return graph, collection, centre
+
+
+def test_graph_query_by_accession(csr_backend):
+    graph, _, centre = csr_backend
+    expected = graph.ego_network(centre, protein_query.GRAPH_MIN_WEIGHT, protein_query.GRAPH_TOP_K,
+                                 protein_query.GRAPH_MAX_HOPS, protein_query.GRAPH_PAGE_SIZE)
+    assert expected[1]
+    assert protein_query.query_neo4j_graph(centre.lower()) == expected
+
+
+def test_graph_query_resolves_text_with_the_search_index(csr_backend, monkeypatch):
+    graph, _, centre = csr_backend
+    SearchIndex.build([centre], ["ALPHA_MOUSE"], ["Alp1"], ["Alpha kinase"]).save(
+        protein_query.SEARCH_INDEX_SNAPSHOT)
+    monkeypatch.setattr(protein_query, "get_mongo_collection", None)  # must not be needed
+    assert protein_query.query_neo4j_graph("alpha kinase") == protein_query.query_neo4j_graph(centre)
+
+
+def test_graph_query_resolves_text_with_mongo(csr_backend):
+    graph, collection, centre = csr_backend
+    document = {"Entry": centre, "Entry Name": "ALPHA_MOUSE", "Protein names": "Alpha kinase"}
+    collection.insert_one({**document, "search_keys": search_keys(document)})
+    nodes, edges = protein_query.query_neo4j_graph("alpha_mouse")
+    assert edges and (nodes, edges) == protein_query.query_neo4j_graph(centre)
+
+
+def test_graph_query_reports_unresolved_text(csr_backend, monkeypatch, capsys):
+    # mongomock has no $text operator, so the MongoDB miss is stubbed
+    monkeypatch.setattr(protein_query, "find_protein", lambda collection, query, allow_scan: (None, None))
+    assert protein_query.query_neo4j_graph("no such protein") == (set(), [])
+    assert "unresolved" in capsys.readouterr().out
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import dataset_stats
+from benchmarks.synthetic import synthetic_proteins
+from reference import reference_degrees, write_sample_edges
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    synthetic_proteins(200).to_csv(tmp_path / "nodes.csv", index=False)
+    edges_path = write_sample_edges(tmp_path / "edges.csv", threshold=0.3)
+    return str(tmp_path / "nodes.csv"), edges_path, str(tmp_path / "dataset_stats.json")
+
+
+def test_dataset_stats_refresh(inputs):
+    nodes_csv, edges_path, snapshot_path = inputs
+    frame = pd.read_csv(edges_path)
+
+    snapshot, recomputed = dataset_stats.refresh(nodes_csv, edges_path, snapshot_path, chunk_size=50)
+    assert recomputed == ["nodes", "edges"]
+    degree, _ = reference_degrees(frame, -1.0)
+    assert snapshot["nodes"]["proteins"] == 200
+    assert snapshot["edges"]["edges"] == len(frame)
+    assert snapshot["edges"]["connected_proteins"] == len(degree)
+    assert snapshot["edges"]["max_degree"] == max(degree.values())
+    assert np.isclose(snapshot["edges"]["mean_weight"], frame["Weight"].mean())
+    assert sum(snapshot["edges"]["histogram"]["counts"]) == len(frame)
+    assert snapshot["summary"]["isolated_proteins"] == 200 - len(degree)
+    assert np.isclose(snapshot["summary"]["average_degree"], sum(degree.values()) / 200)
+
+    assert dataset_stats.refresh(nodes_csv, edges_path, snapshot_path)[1] == []
+    assert dataset_stats.load_snapshot(snapshot_path) == snapshot
+
+
+def test_refresh_recomputes_only_the_changed_input(inputs):
+    nodes_csv, edges_path, snapshot_path = inputs
+    first, _ = dataset_stats.refresh(nodes_csv, edges_path, snapshot_path)
+    frame = pd.read_csv(edges_path)
+    frame.iloc[: len(frame) // 2].to_csv(edges_path, index=False)
+
+    snapshot, recomputed = dataset_stats.refresh(nodes_csv, edges_path, snapshot_path)
+    assert recomputed == ["edges"]
+    assert snapshot["nodes"] == first["nodes"]
+    assert snapshot["edges"]["edges"] == len(frame) // 2
+    assert dataset_stats.refresh(nodes_csv, edges_path, snapshot_path, force=True)[1] == ["nodes", "edges"]
+
+
+def test_missing_or_stale_snapshot(inputs, tmp_path):
+    nodes_csv, edges_path, snapshot_path = inputs
+    assert dataset_stats.load_snapshot(snapshot_path) is None
+    (tmp_path / "dataset_stats.json").write_text('{"version": 0}')
+    assert dataset_stats.load_snapshot(snapshot_path) is None
+    assert dataset_stats.refresh(nodes_csv, edges_path, snapshot_path)[1] == ["nodes", "edges"]
+
+
+def test_format_statistics(inputs):
+    snapshot, _ = dataset_stats.refresh(*inputs)
+    lines = dataset_stats.format_statistics(snapshot)
+    assert lines[0] == (f"Proteins: 200, relationships with similarity > {snapshot['threshold']}: "
+                        f"{snapshot['edges']['edges']}")
+    assert any(line.startswith("5 Most frequent EC number: ") for line in lines)
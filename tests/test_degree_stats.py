@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from degree_stats import compute
+from reference import reference_degrees, write_sample_edges
+
+THRESHOLDS = (0.5, 0.8)
+
+
+@pytest.mark.parametrize("chunk_size", [1_000_000, 17])
+def test_compute_matches_pandas(tmp_path, chunk_size):
+    edges_path = write_sample_edges(tmp_path / "edges.csv", threshold=0.3)
+    frame = pd.read_csv(edges_path)
+    stats = compute(edges_path, THRESHOLDS, chunk_size)
+
+    proteins = stats.proteins.tolist()
+    assert sorted(proteins) == sorted(set(frame["Protein1"]) | set(frame["Protein2"]))
+    for threshold in THRESHOLDS:
+        degree, strength = reference_degrees(frame, threshold)
+        assert stats.degree[threshold].tolist() == [degree.get(p, 0) for p in proteins]
+        assert np.allclose(stats.strength[threshold], [strength.get(p, 0.0) for p in proteins], atol=1e-5)
+
+    # The recorded neighbour is one of the protein's strongest edges
+    best = pd.concat([frame.groupby("Protein1")["Weight"].max(), frame.groupby("Protein2")["Weight"].max()])
+    best = best.groupby(level=0).max()
+    pairs = set(zip(frame["Protein1"], frame["Protein2"]))
+    for i, protein in enumerate(proteins):
+        neighbour = proteins[stats.neighbour[i]]
+        assert (protein, neighbour) in pairs or (neighbour, protein) in pairs
+        assert np.isclose(stats.weight[i], best[protein], atol=1e-6)
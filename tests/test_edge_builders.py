@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from edge_builder import build_edges
+from reference import jaccard_edges, sample_proteins, sample_token_lists
+from similarity_join import prefix_join
+
+THRESHOLDS = (0.0, 0.5, 0.8)
+
+
+def assert_same_edges(found, expected):
+    assert set(found) == set(expected)
+    assert np.allclose([found[pair] for pair in expected], list(expected.values()))
+
+
+@pytest.mark.parametrize("threshold", THRESHOLDS)
+def test_prefix_join_matches_brute_force(threshold):
+    token_lists = sample_token_lists()
+    rows, cols, weights = prefix_join(token_lists, threshold)
+    assert (rows < cols).all()
+    assert list(zip(rows.tolist(), cols.tolist())) == sorted(zip(rows.tolist(), cols.tolist()))
+    assert_same_edges(dict(zip(zip(rows.tolist(), cols.tolist()), weights.tolist())),
+                      jaccard_edges(token_lists, threshold))
+
+
+# LSH is tuned for high thresholds; at 0.0 most low-similarity pairs are never candidates
+BUILDS = ([("sparse", {"block_size": 64}, t) for t in THRESHOLDS] + [("prefix", {}, t) for t in THRESHOLDS]
+          + [("minhash", {"verify": True}, t) for t in THRESHOLDS if t >= 0.5])
+
+
+@pytest.mark.parametrize("method,options,threshold", BUILDS)
+def test_build_edges_matches_brute_force(tmp_path, method, options, threshold):
+    entries, interpro = sample_proteins()
+    path = tmp_path / "edges.csv"
+    count = build_edges(entries, interpro, str(path), threshold, method=method, **options)
+
+    edges = pd.read_csv(path)
+    assert len(edges) == count
+    index = {entry: i for i, entry in enumerate(entries)}
+    found = {(index[a], index[b]): w for a, b, w in edges.itertuples(index=False)}
+    expected = jaccard_edges(sample_token_lists(), threshold)
+    if method == "minhash":
+        # LSH can miss pairs; verified weights must still be exact and never below the threshold
+        assert set(found) <= set(expected)
+        assert len(found) >= 0.9 * len(expected)
+        expected = {pair: expected[pair] for pair in found}
+    assert_same_edges(found, expected)
+
+
+def test_negative_threshold_rejected():
+    with pytest.raises(ValueError):
+        prefix_join([["IPR1"]], -0.1)
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from edge_store import EdgeStore, csv_to_store, store_to_csv
+
+
+def test_round_trip(tmp_path):
+    edges = pd.DataFrame({"Protein1": ["P1", "P1", "P2", "Q9"],
+                          "Protein2": ["P2", "P3", "P3", "P1"],
+                          "Weight": [0.8333333, 1.0, 0.9, 0.85]})
+    edges.to_csv(tmp_path / "edges.csv", index=False)
+
+    assert csv_to_store(tmp_path / "edges.csv", tmp_path / "edges.store", chunk_size=3) == 4
+    assert store_to_csv(tmp_path / "edges.store", tmp_path / "roundtrip.csv", chunk_size=3) == 4
+    roundtrip = pd.read_csv(tmp_path / "roundtrip.csv")
+    pd.testing.assert_frame_equal(roundtrip[["Protein1", "Protein2"]], edges[["Protein1", "Protein2"]])
+    assert np.allclose(roundtrip["Weight"], edges["Weight"])
+
+    store = EdgeStore(tmp_path / "edges.store")
+    frame = store.to_frame(min_weight=0.85)
+    assert frame["Protein1"].tolist() == ["P1", "P2"]
+    assert frame["Protein2"].tolist() == ["P3", "P3"]
+
+
+def test_blank_lines_do_not_add_rows(tmp_path):
+    (tmp_path / "edges.csv").write_text("Protein1,Protein2,Weight\nP1,P2,0.9\n\nP2,P3,1.0\n\n\n")
+
+    assert csv_to_store(tmp_path / "edges.csv", tmp_path / "edges.store") == 2
+    store = EdgeStore(tmp_path / "edges.store")
+    assert len(store) == len(store.source) == len(store.target) == len(store.weight) == 2
+    assert len(np.load(tmp_path / "edges.store" / "weight.npy")) == 2
+    assert store.to_frame()["Protein1"].tolist() == ["P1", "P2"]
+
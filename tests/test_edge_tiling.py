@@ -0,0 +1,75 @@
+import os
+
+import pandas as pd
+import pytest
+
+import edge_tiling
+from edge_builder import build_incidence
+from edge_tiling import COMPLETED, build_tiles, iter_tiles, merge_shards
+from reference import jaccard_edges, sample_proteins, sample_token_lists
+
+THRESHOLD = 0.5
+TILE_SIZE = 64
+
+
+def read_edges(path, entries):
+    index = {entry: i for i, entry in enumerate(entries)}
+    frame = pd.read_csv(path)
+    return [(index[a], index[b], w) for a, b, w in frame.itertuples(index=False)]
+
+
+def assert_matches_reference(edges, threshold=THRESHOLD):
+    expected = jaccard_edges(sample_token_lists(), threshold)
+    # merge_shards writes rows in (row, col) order, like edge_builder
+    assert [(i, j) for i, j, _ in edges] == sorted(expected)
+    assert all(abs(w - expected[(i, j)]) < 1e-9 for i, j, w in edges)
+
+
+@pytest.mark.parametrize("threshold", [0.0, THRESHOLD])
+def test_tiled_build_matches_brute_force(tmp_path, threshold):
+    entries, _ = sample_proteins()
+    matrix, _ = build_incidence(sample_token_lists())
+    build_tiles(matrix, str(tmp_path / "tiles"), threshold, tile_size=TILE_SIZE)
+    merge_shards(str(tmp_path / "tiles"), entries, str(tmp_path / "edges.csv"))
+    assert_matches_reference(read_edges(tmp_path / "edges.csv", entries), threshold)
+
+
+def test_resume_scores_only_unfinished_tiles(tmp_path, monkeypatch):
+    entries, _ = sample_proteins()
+    matrix, _ = build_incidence(sample_token_lists())
+    work_dir = str(tmp_path / "tiles")
+    build_tiles(matrix, work_dir, THRESHOLD, tile_size=TILE_SIZE)
+    tiles = list(iter_tiles(matrix.shape[0], TILE_SIZE))
+
+    # Simulate a crash: the last two tiles never finished and the log ends in a torn line
+    completed = os.path.join(work_dir, COMPLETED)
+    with open(completed) as file:
+        lines = file.read().splitlines()
+    with open(completed, "w") as file:
+        file.write("\n".join(lines[:-2]) + "\n" + lines[-2][:2])
+    for i, j in tiles[-2:]:
+        os.remove(edge_tiling.shard_path(work_dir, i, j))
+
+    with pytest.raises(RuntimeError):
+        merge_shards(work_dir, entries, str(tmp_path / "edges.csv"))
+
+    scored = []
+    run_tile = edge_tiling.run_tile
+
+    def counting_run_tile(matrix, sizes, tile_size, i, j, threshold):
+        scored.append((i, j))
+        return run_tile(matrix, sizes, tile_size, i, j, threshold)
+
+    monkeypatch.setattr(edge_tiling, "run_tile", counting_run_tile)
+    build_tiles(matrix, work_dir, THRESHOLD, tile_size=TILE_SIZE)
+    assert scored == tiles[-2:]
+
+    merge_shards(work_dir, entries, str(tmp_path / "edges.csv"))
+    assert_matches_reference(read_edges(tmp_path / "edges.csv", entries))
+
+
+def test_checkpoint_rejects_different_parameters(tmp_path):
+    matrix, _ = build_incidence(sample_token_lists())
+    build_tiles(matrix, str(tmp_path), THRESHOLD, tile_size=TILE_SIZE)
+    with pytest.raises(ValueError):
+        build_tiles(matrix, str(tmp_path), 0.8, tile_size=TILE_SIZE)
@@ -0,0 +1,116 @@
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+import graph_layout
+from graph_layout import (EDGE_LABEL_LIMIT, NODE_LABEL_LIMIT, GraphRenderer, compute_layout,
+                          exact_repulsion, force_layout, graph_arrays, grid_repulsion)
+
+
+def ring(n):
+    sources = np.arange(n)
+    targets = (sources + 1) % n
+    return sources, targets, np.linspace(0.5, 1.0, n)
+
+
+def test_graph_arrays():
+    nodes = [("P3", "three"), ("P1", "one")]
+    edges = [("P1", "P2", 0.5), ("P3", "P1", 0.9)]
+    entries, sources, targets, weights = graph_arrays(nodes, edges)
+    assert entries == ["P1", "P2", "P3"]
+    assert sources.tolist() == [0, 2]
+    assert targets.tolist() == [1, 0]
+    assert weights.tolist() == [0.5, 0.9]
+
+
+@pytest.mark.parametrize("method", ["auto", "kamada_kawai", "force"])
+@pytest.mark.parametrize("n", [0, 1, 2, 30])
+def test_compute_layout_shape(method, n):
+    sources, targets, weights = ring(n) if n > 1 else (np.zeros(0, dtype=np.int64),) * 2 + (np.zeros(0),)
+    positions = compute_layout(n, sources, targets, weights, method)
+    assert positions.shape == (n, 2)
+    assert np.isfinite(positions).all()
+    if n > 1 and method == "force":
+        assert np.abs(positions).max() == pytest.approx(1.0)
+
+
+def test_compute_layout_unknown_method():
+    with pytest.raises(ValueError):
+        compute_layout(3, *ring(3), method="spring")
+
+
+def test_grid_repulsion_approximates_exact():
+    pos = np.random.default_rng(0).uniform(-1, 1, size=(400, 2))
+    k = np.sqrt(4.0 / len(pos))
+    exact = exact_repulsion(pos, k)
+    grid = grid_repulsion(pos, k, 8)
+    cosine = np.einsum("ij,ij->i", exact, grid) / (
+        np.linalg.norm(exact, axis=1) * np.linalg.norm(grid, axis=1))
+    assert np.median(cosine) > 0.9
+
+
+def test_force_layout_switches_to_grid(monkeypatch):
+    calls = []
+    monkeypatch.setattr(graph_layout, "grid_repulsion",
+                        lambda pos, k, grid: calls.append(grid) or exact_repulsion(pos, k))
+    force_layout(50, *ring(50), iterations=3)
+    assert calls == []
+    monkeypatch.setattr(graph_layout, "EXACT_REPULSION_LIMIT", 10)
+    force_layout(50, *ring(50), iterations=3)
+    assert len(calls) == 3
+
+
+def draw(renderer, n):
+    sources, targets, weights = ring(n)
+    positions = np.random.default_rng(1).uniform(-1, 1, size=(n, 2))
+    renderer.draw([f"P{i}" for i in range(n)], positions, sources, targets, weights)
+    return positions
+
+
+def label_counts(renderer):
+    texts = [label.get_text() for label in renderer.labels]
+    nodes = sum(text.startswith("P") for text in texts)
+    return nodes, len(texts) - nodes
+
+
+@pytest.fixture
+def renderer():
+    figure, ax = plt.subplots()
+    yield GraphRenderer(ax)
+    plt.close(figure)
+
+
+def test_labels_for_small_graph(renderer):
+    draw(renderer, 10)
+    assert label_counts(renderer) == (10, 10)
+
+
+def test_labels_hidden_on_large_graph_until_zoomed(renderer):
+    n = 4 * NODE_LABEL_LIMIT
+    draw(renderer, n)
+    assert label_counts(renderer) == (0, 0)
+
+    renderer.ax.set_xlim(-0.2, 0.2)
+    renderer.ax.set_ylim(-0.2, 0.2)
+    visible = renderer.visible_nodes()
+    assert 0 < visible.sum() <= NODE_LABEL_LIMIT
+    nodes, edges = label_counts(renderer)
+    assert nodes == visible.sum()
+    in_view = (visible[renderer.sources] & visible[renderer.targets]).sum()
+    assert edges == (in_view if in_view <= EDGE_LABEL_LIMIT else 0)
+
+    renderer.reset_view()
+    assert label_counts(renderer) == (0, 0)
+
+
+def test_redraws_reuse_artists(renderer):
+    edge_lines, node_points = renderer.edge_lines, renderer.node_points
+    for n in (10, 4 * NODE_LABEL_LIMIT, 10):
+        draw(renderer, n)
+        assert renderer.edge_lines is edge_lines
+        assert renderer.node_points is node_points
+        assert list(renderer.ax.collections) == [edge_lines, node_points]
+    assert len(renderer.ax.texts) == len(renderer.labels) == 20
@@ -0,0 +1,59 @@
+import numpy as np
+
+import graph_layout
+from graph_layout import LayoutCache
+
+NODES = [("P1", "one"), ("P2", "two"), ("P3", "three")]
+EDGES = [("P1", "P2", 0.5), ("P2", "P3", 0.75)]
+
+
+def counting_layout(monkeypatch):
+    calls = []
+
+    def compute_layout(n, sources, targets, weights, method="auto"):
+        calls.append(method)
+        return np.zeros((n, 2))
+
+    monkeypatch.setattr(graph_layout, "compute_layout", compute_layout)
+    return calls
+
+
+def test_hit_reuses_the_layout(monkeypatch):
+    calls = counting_layout(monkeypatch)
+    cache = LayoutCache(method="force")
+    first = cache.get(NODES, EDGES)
+    assert cache.get(list(reversed(NODES)), list(reversed(EDGES))) is first
+    assert calls == ["force"]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    entries, positions, sources, targets, weights = first
+    assert entries == ["P1", "P2", "P3"]
+    assert positions.shape == (3, 2)
+    assert weights.tolist() == [0.5, 0.75]
+
+
+def test_changed_edges_miss(monkeypatch):
+    calls = counting_layout(monkeypatch)
+    cache = LayoutCache()
+    cache.get(NODES, EDGES)
+    cache.get(NODES, EDGES[:1])
+    cache.get(NODES, [("P1", "P2", 0.5), ("P2", "P3", 0.8)])
+    assert len(calls) == 3
+    assert (cache.hits, cache.misses) == (0, 3)
+
+
+def test_lru_eviction(monkeypatch):
+    calls = counting_layout(monkeypatch)
+    cache = LayoutCache(max_entries=2)
+    graphs = [[("P1", "P2", w)] for w in (0.1, 0.2, 0.3)]
+    cache.get(NODES, graphs[0])
+    cache.get(NODES, graphs[1])
+    cache.get(NODES, graphs[0])
+    cache.get(NODES, graphs[2])
+    assert len(cache) == 2
+    assert len(calls) == 3
+
+    cache.get(NODES, graphs[0])
+    assert len(calls) == 3
+    cache.get(NODES, graphs[1])
+    assert len(calls) == 4
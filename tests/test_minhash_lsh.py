@@ -0,0 +1,31 @@
+import numpy as np
+from scipy import sparse
+
+from edge_builder import build_incidence
+from minhash_lsh import minhash_join
+from reference import jaccard_edges, sample_token_lists
+
+
+def test_empty_rows_produce_no_candidates():
+    token_lists = [["IPR1", "IPR2"], [], ["IPR1", "IPR2"], [], []]
+    matrix, _ = build_incidence(token_lists)
+    rows, cols, weights = minhash_join(matrix, 0.5)
+    assert list(zip(rows.tolist(), cols.tolist())) == [(0, 2)]
+
+
+def test_all_empty_matrix():
+    rows, cols, weights = minhash_join(sparse.csr_matrix((4, 3), dtype=np.int8), 0.0)
+    assert len(rows) == len(cols) == len(weights) == 0
+
+
+def test_verified_edges_match_brute_force():
+    token_lists = sample_token_lists(300, seed=1)
+    matrix, _ = build_incidence(token_lists)
+    exact = jaccard_edges(token_lists, 0.8)
+
+    rows, cols, weights = minhash_join(matrix, 0.8, verify=True)
+    found = {(r, c): w for r, c, w in zip(rows.tolist(), cols.tolist(), weights.tolist())}
+    # verify removes every false positive and restores the exact weights
+    assert set(found) <= set(exact)
+    assert all(np.isclose(found[pair], exact[pair]) for pair in found)
+    assert len(found) >= 0.95 * len(exact)
@@ -0,0 +1,20 @@
+import mongomock
+import pytest
+
+from benchmarks.synthetic import synthetic_proteins
+from mongo_loader import DuplicateEntriesError, load
+
+
+def test_rerun_reports_duplicates(tmp_path):
+    csv_path = tmp_path / "cleaned_mongodb.csv"
+    synthetic_proteins(30).to_csv(csv_path, index=False)
+    collection = mongomock.MongoClient()["test"]["MoodleDB"]
+    assert load(collection, csv_path, batch_size=7, writers=2)[0] == 30
+
+    with pytest.raises(DuplicateEntriesError) as error:
+        load(collection, csv_path, batch_size=7, writers=2)
+    assert (error.value.duplicates, error.value.written) == (30, 0)
+    assert "--upsert" in str(error.value)
+
+    assert load(collection, csv_path, batch_size=7, writers=2, upsert=True)[0] == 30
+    assert collection.count_documents({}) == 30
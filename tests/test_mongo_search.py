@@ -0,0 +1,35 @@
+import mongomock
+import pytest
+
+from benchmarks.synthetic import synthetic_proteins
+from mongo_loader import load
+from mongo_search import find_protein, run_tier, search_keys
+
+
+@pytest.fixture
+def collection(tmp_path):
+    csv_path = tmp_path / "cleaned_mongodb.csv"
+    synthetic_proteins(20).to_csv(csv_path, index=False)
+    collection = mongomock.MongoClient()["test"]["MoodleDB"]
+    load(collection, csv_path, writers=1)
+    return collection
+
+
+def test_organism_found_in_exact_tier(collection):
+    document, tier = find_protein(collection, "Rattus norvegicus (Rat)")
+    assert tier == "exact"
+    assert document["Organism"] == "Rattus norvegicus (Rat)"
+
+
+@pytest.mark.parametrize("query", ["m", "mus", "homo", "rattus"])
+def test_organism_prefixes_do_not_match(collection, query):
+    # Nearly every document's organism starts like this; a hit would be an arbitrary protein.
+    # (The text tier that runs next needs $meta sorting, which mongomock lacks.)
+    assert run_tier(collection, "exact", query) is None
+    assert run_tier(collection, "prefix", query) is None
+
+
+def test_search_keys_leave_out_organism():
+    keys = search_keys({"Entry": "P1", "Entry Name": "A_MOUSE", "Protein names": "Kinase  A",
+                        "Gene Names": "Kin1 K1", "Organism": "Mus musculus (Mouse)", "InterPro": ["IPR1"]})
+    assert keys == ["a_mouse", "ipr1", "k1", "kin1", "kinase a", "p1"]
@@ -0,0 +1,91 @@
+import csv
+
+import pytest
+
+from benchmarks.synthetic import synthetic_proteins
+from edge_builder import build_edges
+from edge_store import csv_to_store
+from fakes import FakeDriver
+from neo4j_loader import (CLEAR_QUERY, EDGE_QUERY, NODE_QUERY, export, iter_edge_batches, iter_node_batches,
+                          load, split_ec)
+from neo4j_search import INDEX_STATEMENTS
+
+
+@pytest.fixture
+def sample_files(tmp_path):
+    nodes = synthetic_proteins(40)
+    nodes.to_csv(tmp_path / "nodes.csv", index=False)
+    edges_path = str(tmp_path / "edges.csv")
+    build_edges(nodes["Entry"].tolist(), nodes["InterPro"].tolist(), edges_path, 0.5)
+    return nodes, str(tmp_path / "nodes.csv"), edges_path
+
+
+def test_split_ec():
+    assert split_ec("1.2.3.4; 5.6.7.8;") == ["1.2.3.4", "5.6.7.8"]
+    assert split_ec("Not Available") == []
+    assert split_ec(float("nan")) == []
+
+
+def test_node_batches(sample_files):
+    nodes, nodes_csv, _ = sample_files
+    batches = list(iter_node_batches(nodes_csv, 15))
+    assert [len(batch) for batch in batches] == [15, 15, 10]
+    row = batches[0][0]
+    assert row["entry"] == nodes["Entry"][0]
+    assert row["entryName"] == nodes["Entry Name"][0]
+    assert row["interPro"] and "" not in row["interPro"]
+    assert all(isinstance(r["ec_numbers"], list) for batch in batches for r in batch)
+
+
+def test_edge_batches_from_csv_and_store_agree(sample_files, tmp_path):
+    _, _, edges_path = sample_files
+    csv_to_store(edges_path, str(tmp_path / "edges.store"))
+    from_csv = [row for batch in iter_edge_batches(edges_path, 7) for row in batch]
+    from_store = [row for batch in iter_edge_batches(str(tmp_path / "edges.store"), 7) for row in batch]
+    assert [(r["source"], r["target"]) for r in from_csv] == [(r["source"], r["target"]) for r in from_store]
+    assert all(abs(a["weight"] - b["weight"]) < 1e-6 for a, b in zip(from_csv, from_store))
+
+
+@pytest.mark.parametrize("clear", [False, True])
+def test_load_sends_parameterised_batches(sample_files, clear):
+    _, nodes_csv, edges_path = sample_files
+    driver = FakeDriver()
+    results = load(driver, nodes_csv, edges_path, batch_size=15, sessions=2, clear=clear)
+
+    queries = [query for query, _ in driver.calls]
+    setup = [CLEAR_QUERY, INDEX_STATEMENTS[0]] if clear else [INDEX_STATEMENTS[0]]
+    assert queries[:len(setup)] == setup
+    # All nodes are written and indexed before the first relationship batch
+    first_edge = queries.index(EDGE_QUERY)
+    assert set(queries[len(setup):first_edge]) == {NODE_QUERY, *INDEX_STATEMENTS}
+    assert set(queries[first_edge:]) == {EDGE_QUERY}
+
+    node_rows = [row for query, params in driver.calls if query == NODE_QUERY for row in params["rows"]]
+    edge_rows = [row for query, params in driver.calls if query == EDGE_QUERY for row in params["rows"]]
+    assert results["nodes"][0] == len(node_rows) == 40
+    assert results["relationships"][0] == len(edge_rows) == sum(1 for _ in open(edges_path)) - 1
+    assert all(len(params["rows"]) <= 15 for query, params in driver.calls if "rows" in params)
+
+
+def test_relationships_are_merged():
+    # A reload without --clear must update weights rather than add parallel relationships
+    assert "MERGE (a)-[r:" in EDGE_QUERY and "SET r.weight = row.weight" in EDGE_QUERY
+    assert "CREATE" not in EDGE_QUERY
+
+
+def test_export_writes_import_files(sample_files, tmp_path):
+    nodes, nodes_csv, edges_path = sample_files
+    results = export(nodes_csv, edges_path, str(tmp_path / "import"), batch_size=15)
+
+    with open(tmp_path / "import" / "nodes_header.csv") as file:
+        header = next(csv.reader(file))
+    with open(tmp_path / "import" / "nodes.csv") as file:
+        rows = list(csv.reader(file))
+    assert results["nodes"][0] == len(rows) == len(nodes)
+    assert all(len(row) == len(header) for row in rows)
+    assert rows[0][0] == nodes["Entry"][0] and rows[0][-1] == "Protein"
+
+    with open(tmp_path / "import" / "relationships.csv") as file:
+        relationships = list(csv.reader(file))
+    assert results["relationships"][0] == len(relationships)
+    assert {row[-1] for row in relationships} == {"SIMILAR_TO"}
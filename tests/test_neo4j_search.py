@@ -0,0 +1,107 @@
+import pytest
+
+from fakes import FakeDriver
+from neo4j_search import (BATCH_NEIGHBOURS_QUERY, BATCH_QUERY, EXACT_QUERY, EXPAND_HOP, FULLTEXT_QUERY, MAX_HOPS,
+                          fetch_neighbourhood, find_node, find_nodes, lucene_query, neighbourhood_query)
+
+
+def test_lucene_query_escapes_and_boosts():
+    assert lucene_query("  Kin1 ") == "kin1^2 kin1*"
+    assert lucene_query("zinc finger") == "zinc^2 zinc* finger^2 finger*"
+    assert lucene_query("Cyp2c29 (mouse)") == r"cyp2c29^2 cyp2c29* \(mouse\)^2 \(mouse\)*"
+    assert lucene_query("   ") == ""
+
+
+def test_find_node_tries_the_entry_index_first():
+    driver = FakeDriver(lambda query, params: [{"p": {"entry": "P12345"}, "score": 1.0}]
+                        if query == EXACT_QUERY else [])
+    node, tier, score = find_node(driver.session(), " p12345 ")
+    assert (node, tier, score) == ({"entry": "P12345"}, "exact", 1.0)
+    assert len(driver.calls) == 1
+    assert sorted(driver.calls[0][1]["entries"]) == ["P12345", "p12345"]
+
+
+def test_find_node_falls_back_to_full_text():
+    driver = FakeDriver(lambda query, params: [{"p": {"entry": "Q1"}, "score": 3.5}]
+                        if query == FULLTEXT_QUERY else [])
+    assert find_node(driver.session(), "kinase") == ({"entry": "Q1"}, "fulltext", 3.5)
+    assert [query for query, _ in driver.calls] == [EXACT_QUERY, FULLTEXT_QUERY]
+    assert driver.calls[1][1] == {"search": "kinase^2 kinase*"}
+
+
+def test_find_node_misses():
+    driver = FakeDriver()
+    assert find_node(driver.session(), "nothing") == (None, None, None)
+    assert find_node(driver.session(), "  ") == (None, None, None)
+    assert len(driver.calls) == 2
+
+
+def test_find_nodes_batches_in_one_query():
+    def respond(query, params):
+        return [{"id": i, "p": {"entry": i}, "neighbours": [{"entry": "X", "weight": 0.9}]}
+                for i in params["ids"] if i != "MISSING"]
+
+    driver = FakeDriver(respond)
+    assert find_nodes(driver.session(), ["A", "MISSING", "B"]) == {"A": {"entry": "A"}, "B": {"entry": "B"}}
+    with_neighbours = find_nodes(driver.session(), ["A"], neighbours=5, min_weight=0.5)
+    assert with_neighbours == {"A": {"entry": "A", "neighbours": [{"entry": "X", "weight": 0.9}]}}
+    assert driver.calls[0] == (BATCH_QUERY, {"ids": ["A", "MISSING", "B"]})
+    assert driver.calls[1] == (BATCH_NEIGHBOURS_QUERY, {"ids": ["A"], "top_k": 5, "min_weight": 0.5})
+
+
+def test_neighbourhood_query_repeats_the_hop():
+    for hops in range(1, MAX_HOPS + 1):
+        assert neighbourhood_query(hops).count(EXPAND_HOP.strip()) == hops
+    for hops in (0, MAX_HOPS + 1):
+        with pytest.raises(ValueError):
+            neighbourhood_query(hops)
+
+
+# Strongest first, ties broken by source then target, as MEMBER_EDGES orders them
+EDGES = [("A", "B", 0.9), ("A", "C", 0.8), ("B", "C", 0.8), ("C", "D", 0.7), ("A", "D", 0.6)]
+
+
+def page(query, params):
+    """Answer MEMBER_EDGES from EDGES, honouring the keyset cursor and page size."""
+    after = params["after_weight"], params["after_source"], params["after_target"]
+    rows = [(source, target, weight) for source, target, weight in EDGES
+            if after[0] is None or (-weight, source, target) > (-after[0], after[1], after[2])]
+    return [{"source": source, "source_name": None if source == "D" else source.lower(),
+             "target": target, "target_name": None if target == "D" else target.lower(), "weight": weight}
+            for source, target, weight in rows[:params["page_size"]]]
+
+
+def test_fetch_neighbourhood_pages_with_a_keyset_cursor():
+    driver = FakeDriver(page)
+    session = driver.session()
+    nodes, edges, cursor = fetch_neighbourhood(session, "A", min_weight=0.5, top_k=5, max_hops=2, page_size=2)
+    assert edges == EDGES[:2]
+    assert nodes == {("A", "a"), ("B", "b"), ("C", "c")}
+    assert cursor == (0.8, "A", "C")
+    query, params = driver.calls[0]
+    assert query == neighbourhood_query(2)
+    assert params == {"entry": "A", "min_weight": 0.5, "top_k": 5, "page_size": 2,
+                      "after_weight": None, "after_source": None, "after_target": None}
+
+    pages = [edges]
+    while cursor is not None:
+        nodes, edges, cursor = fetch_neighbourhood(session, "A", page_size=2, cursor=cursor)
+        pages.append(edges)
+    assert pages == [EDGES[:2], EDGES[2:4], EDGES[4:]]
+    assert ("D", "Unknown") in nodes
+    assert driver.calls[1][1]["after_weight"] == 0.8
+    assert (driver.calls[1][1]["after_source"], driver.calls[1][1]["after_target"]) == ("A", "C")
+
+
+def test_fetch_neighbourhood_last_full_page_needs_one_more_round_trip():
+    driver = FakeDriver(page)
+    _, edges, cursor = fetch_neighbourhood(driver.session(), "A", page_size=len(EDGES))
+    assert edges == EDGES and cursor == (0.6, "A", "D")
+    assert fetch_neighbourhood(driver.session(), "A", page_size=len(EDGES), cursor=cursor) == (set(), [], None)
+
+
+def test_fetch_neighbourhood_reports_batches():
+    batches = []
+    fetch_neighbourhood(FakeDriver(page).session(), "A", page_size=10, batch_size=2,
+                        on_batch=lambda nodes, edges: batches.append((len(nodes), edges)))
+    assert batches == [(3, EDGES[:2]), (4, EDGES[:4])]
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import parallel_edges
+from edge_builder import build_incidence
+from parallel_edges import attach_worker, build_partitions, export_partitions, merge_partitions, share_arrays
+from reference import jaccard_edges, sample_proteins, sample_token_lists
+
+
+def read_edges(paths, entries):
+    index = {entry: i for i, entry in enumerate(entries)}
+    frame = pd.concat([pd.read_csv(path) for path in paths])
+    return [(index[a], index[b], w) for a, b, w in frame.itertuples(index=False)]
+
+
+@pytest.mark.parametrize("threshold", [0.0, 0.8])
+def test_parallel_build_matches_brute_force(tmp_path, threshold):
+    entries, _ = sample_proteins()
+    matrix, _ = build_incidence(sample_token_lists())
+    partition_dir = str(tmp_path / "parts")
+    count = build_partitions(matrix, partition_dir, threshold, workers=2, tile_size=50)
+    expected = jaccard_edges(sample_token_lists(), threshold)
+    assert count == len(expected)
+
+    assert merge_partitions(partition_dir, entries, str(tmp_path / "edges.csv")) == count
+    edges = read_edges([tmp_path / "edges.csv"], entries)
+    assert [(i, j) for i, j, _ in edges] == sorted(expected)
+    assert np.allclose([w for _, _, w in edges], [expected[pair] for pair in sorted(expected)])
+
+    # Per-worker partitions hold the same edges between them
+    partitioned = read_edges(export_partitions(partition_dir, entries), entries)
+    assert sorted((i, j) for i, j, _ in partitioned) == sorted(expected)
+
+
+def test_worker_matrix_is_a_view_of_shared_memory(tmp_path, monkeypatch):
+    matrix, _ = build_incidence(sample_token_lists())
+    arrays = [matrix.indptr, matrix.indices, matrix.data]
+    segments, specs = share_arrays(arrays)
+    monkeypatch.setattr(parallel_edges, "_segments", [])
+    try:
+        attach_worker(specs, matrix.shape, str(tmp_path))
+        worker = parallel_edges._matrix
+        for array, segment in zip((worker.indptr, worker.indices, worker.data), parallel_edges._segments):
+            assert np.shares_memory(array, np.ndarray(segment.size, dtype=np.uint8, buffer=segment.buf))
+        assert (worker != matrix).nnz == 0
+    finally:
+        parallel_edges._partition.close()
+        del worker
+        parallel_edges._matrix = None
+        for segment in parallel_edges._segments + segments:
+            segment.close()
+        for segment in segments:
+            segment.unlink()
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from preprocess import OUTPUTS, SeenEntries, preprocess
+
+RAW = pd.DataFrame({
+    "Entry": ["P1", "P2", "P2", "P3", "P4", "P1", "P5", "P6", "P4"],
+    "Entry Name": ["A_MOUSE", "B_MOUSE", "B_MOUSE", "C_MOUSE", "D_MOUSE", "A2_MOUSE", "E_MOUSE", "F_MOUSE", "D2"],
+    "Protein names": ["Kinase", "Ligase", "Ligase", "Channel", "Receptor", "Kinase 2", "Protease", "Pump", "R2"],
+    "Gene Names": ["Kin1 K1", None, None, "Chan", "Rec", "Kin1", "Prot", None, "Rec2"],
+    "Organism": ["Mus musculus (Mouse)"] * 9,
+    "Sequence": ["MKV", "MLL", "MLL", "MAA", "MGG", "MKV", "MCC", "MDD", "MGH"],
+    "EC number": ["2.7.11.1", None, None, None, "1.1.1.1; 2.2.2.2", "2.7.11.1", None, "3.6.3.1", None],
+    "InterPro": ["IPR000719;IPR011009;", "IPR001841;", "IPR001841;", None, "IPR000276;", "IPR000719;",
+                 "IPR001254;IPR009003;", None, "IPR000276;IPR017452;"],
+    "Length": [3, 3, 3, 3, 3, 3, 3, 3, 3],
+})
+
+
+def notebook_outputs(df):
+    """The cleaning cells of dataset_prep.ipynb, run on the whole frame."""
+    df = df.drop_duplicates()
+    df['Gene Names'] = df['Gene Names'].fillna("Unknown")
+    df['EC number'] = df['EC number'].fillna("Not Available")
+    df = df.dropna(subset=['InterPro'])
+    df['Domains'] = df['InterPro'].apply(lambda x: ','.join(x.split(';')) if isinstance(x, str) else '')
+    df['InterPro'] = df['InterPro'].apply(lambda x: x.split(';') if isinstance(x, str) else [])
+    df = df.drop_duplicates(subset=["Entry"]).reset_index(drop=True)
+    return {name: df[columns] for name, columns in OUTPUTS.items()}
+
+
+@pytest.mark.parametrize("chunk_size", [2, 3, 100])
+def test_outputs_match_notebook(tmp_path, chunk_size):
+    RAW.to_csv(tmp_path / "raw.tsv", sep="\t", index=False)
+    rows_read, rows_written = preprocess(str(tmp_path / "raw.tsv"), str(tmp_path / "out"), chunk_size)
+
+    expected = notebook_outputs(RAW.copy())
+    assert (rows_read, rows_written) == (len(RAW), len(expected["nodes.csv"]))
+    for name, frame in expected.items():
+        frame.to_csv(tmp_path / f"notebook_{name}", index=False)
+        assert (tmp_path / "out" / name).read_text() == (tmp_path / f"notebook_{name}").read_text()
+
+
+def test_seen_entries_keeps_first_occurrence():
+    seen = SeenEntries()
+    assert seen.keep_new(pd.Series(["A", "B", "A"])).tolist() == [True, True, False]
+    assert seen.keep_new(pd.Series(["B", "C", "C"])).tolist() == [False, True, False]
+    assert len(seen) == 3
+    assert seen.hashes.dtype == np.uint64
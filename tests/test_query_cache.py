@@ -0,0 +1,89 @@
+import query_cache
+from query_cache import MISSING, QueryCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_expiry(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(query_cache.time, "time", clock)
+    cache = QueryCache(ttl=60)
+    cache.put("mongo", "P12345", "result")
+
+    clock.now += 60
+    assert cache.get("mongo", "p12345 ") == "result"
+    clock.now += 1
+    assert cache.get("mongo", "P12345") is MISSING
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_eviction():
+    cache = QueryCache(max_entries=2)
+    cache.put("mongo", "a", 1)
+    cache.put("mongo", "b", 2)
+    assert cache.get("mongo", "a") == 1   # b is now the least recently used
+    cache.put("mongo", "c", 3)
+
+    assert cache.get("mongo", "b") is MISSING
+    assert (cache.get("mongo", "a"), cache.get("mongo", "c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate():
+    cache = QueryCache()
+    cache.put("mongo", "a", 1)
+    cache.put("neo4j", "a", 2)
+    cache.invalidate("mongo")
+    assert cache.get("mongo", "a") is MISSING
+    assert cache.get("neo4j", "a") == 2
+    cache.invalidate()
+    assert cache.get("neo4j", "a") is MISSING
+
+
+def test_get_or_run_skips_uncacheable_results():
+    cache = QueryCache()
+    calls = []
+
+    def lookup(query):
+        calls.append(query)
+        return (set(), [])
+
+    for _ in range(2):
+        assert cache.get_or_run("graph", "a", lookup, cacheable=lambda value: bool(value[1])) == (set(), [])
+    assert calls == ["a", "a"]
+    cache.get_or_run("mongo", "b", lookup)
+    cache.get_or_run("mongo", "b", lookup)
+    assert calls == ["a", "a", "b"]
+
+
+def test_disk_round_trip(tmp_path, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(query_cache.time, "time", clock)
+    path = str(tmp_path / "cache" / "query_cache.pkl")
+    cache = QueryCache(ttl=60, disk_path=path)
+    cache.put("mongo", "old", 1)
+    clock.now += 30
+    cache.put("mongo", "new", 2)
+    cache.save()
+
+    clock.now += 40   # "old" is now 70 s old, past the TTL
+    restored = QueryCache(ttl=60, disk_path=path)
+    assert restored.get("mongo", "old") is MISSING
+    assert restored.get("mongo", "new") == 2
+
+    query_cache.clear_disk_cache(path)
+    query_cache.clear_disk_cache(path)
+    assert QueryCache(disk_path=path).stats()["entries"] == 0
+
+
+def test_damaged_disk_file_is_ignored(tmp_path):
+    path = tmp_path / "query_cache.pkl"
+    path.write_bytes(b"not a pickle")
+    assert QueryCache(disk_path=str(path)).stats()["entries"] == 0
@@ -0,0 +1,60 @@
+import pytest
+
+from search_index import SearchIndex
+
+PROTEINS = [
+    ("P10001", "KIN1_MOUSE", "Kin1 Kin1a", "Serine kinase 1"),
+    ("P10002", "KIN2_MOUSE", "Kin2", "Serine kinase 2"),
+    ("P20001", "LIG_MOUSE", "Unknown", "Ubiquitin ligase"),
+    ("P30001", "CHAN_MOUSE", "Shared", "Potassium channel"),
+    ("P30002", "CHAN2_MOUSE", "Shared", "Sodium channel"),
+]
+
+
+@pytest.fixture
+def index():
+    return SearchIndex.build(*zip(*PROTEINS))
+
+
+def entries(index, rows):
+    return [index.entries[row] for row in rows]
+
+
+def test_prefix_then_substring_search(index):
+    assert entries(index, index.search("kin")) == ["P10001", "P10002"]
+    assert entries(index, index.search("channel")) == ["P30001", "P30002"]
+    assert entries(index, index.search("ligase")) == ["P20001"]
+    assert entries(index, index.search("quitin")) == ["P20001"]
+    assert index.search("unknown") == []   # placeholder gene names are not indexed
+    assert index.search("  ") == []
+
+
+def test_suggest_returns_labels_and_entries(index):
+    assert index.suggest("lig") == [("P20001  LIG_MOUSE  Ubiquitin ligase", "P20001")]
+    assert len(index.suggest("kin", limit=1)) == 1
+
+
+@pytest.mark.parametrize("text,entry", [
+    ("p10002", "P10002"),          # exact accession
+    ("KIN1_mouse", "P10001"),      # exact entry name
+    ("kin1", "P10001"),            # exact gene name, although "kin1a" also starts with it
+    ("kin1a", "P10001"),
+    ("ubiq", "P20001"),            # a prefix that only one protein has
+    ("Potassium  CHANNEL", "P30001"),
+])
+def test_resolve_unambiguous_text(index, text, entry):
+    assert index.resolve(text) == entry
+
+
+@pytest.mark.parametrize("text", ["kin", "serine kinase", "shared", "chan", "channel", "nothing", ""])
+def test_resolve_leaves_ambiguous_text_alone(index, text):
+    assert index.resolve(text) is None
+
+
+def test_snapshot_round_trip(index, tmp_path):
+    index.save(tmp_path / "search_index.npz")
+    loaded = SearchIndex.load(tmp_path / "search_index.npz")
+    assert loaded.keys == index.keys and loaded.entries == index.entries
+    for text in ("kin", "channel", "quitin", "kin1"):
+        assert loaded.search(text) == index.search(text)
+        assert loaded.resolve(text) == index.resolve(text)
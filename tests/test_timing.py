@@ -0,0 +1,18 @@
+import timing
+
+
+def test_export_rotates_log(tmp_path, monkeypatch):
+    # Only this test's stage, not the spans other tests recorded
+    monkeypatch.setattr(timing, "_samples", {})
+    monkeypatch.setattr(timing, "_totals", {})
+    log_path = str(tmp_path / "timings.jsonl")
+    timing.set_enabled(True)
+    timing.record("stage", 0.01)
+    for _ in range(5):
+        timing.export(log_path=log_path, metrics_path=None, max_log_bytes=200)
+
+    # A log is rolled over once it reaches the cap, so it ends at most one line past it
+    line_bytes = len((tmp_path / "timings.jsonl").read_text().splitlines()[0]) + 1
+    assert (tmp_path / "timings.jsonl").stat().st_size < 200
+    assert 200 <= (tmp_path / "timings.jsonl.1").stat().st_size < 200 + line_bytes
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["timings.jsonl", "timings.jsonl.1"]
@@ -0,0 +1,212 @@
+"""Timing spans for the GUI's search and drawing hot paths.
+
+``span(name)`` is a context manager that measures one stage:
+
+    with timing.span("mongo.find"):
+        result, _ = find_protein(collection, query)
+
+Every finished span goes into a rolling window of the last ``WINDOW``
+durations per stage, for p50/p95/p99. If a ``Trace`` is active on the
+current thread (``use_trace``, or ``traced`` for functions handed to a
+worker pool), the span is also added to that trace. A trace collects the
+per-stage times of one search for the status bar.
+
+``export`` appends one JSON line per search (that search's stages plus the
+rolling percentiles) and rewrites a Prometheus text-format file with one
+summary per stage, for node_exporter's textfile collector or any scraper.
+Once the JSON log reaches ``MAX_LOG_BYTES`` it is renamed to ``<path>.1``,
+replacing the previous one, so at most two logs are kept.
+
+With ``set_enabled(False)`` (or ``PROTEIN_GUI_TIMING=0`` in the
+environment), ``span`` returns one shared no-op object. The cost of a
+disabled span is then a function call and a global lookup.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+WINDOW = 1000
+QUANTILES = (0.5, 0.95, 0.99)
+METRIC = "protein_gui_stage_seconds"
+DEFAULT_LOG_PATH = "data/timings.jsonl"
+DEFAULT_METRICS_PATH = "data/timings.prom"
+MAX_LOG_BYTES = 10_000_000
+
+_enabled = os.environ.get("PROTEIN_GUI_TIMING", "1") != "0"
+_local = threading.local()
+_lock = threading.Lock()
+_samples = {}  # stage -> deque of recent durations
+_totals = {}   # stage -> [count, sum] since start, for the Prometheus counters
+
+
+def set_enabled(enabled):
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def is_enabled():
+    return _enabled
+
+
+def record(name, seconds):
+    """Add one duration to the rolling window of a stage."""
+    with _lock:
+        window = _samples.get(name)
+        if window is None:
+            window = _samples[name] = deque(maxlen=WINDOW)
+            _totals[name] = [0, 0.0]
+        window.append(seconds)
+        totals = _totals[name]
+        totals[0] += 1
+        totals[1] += seconds
+
+
+class Trace:
+    """Stage timings of one search, added to from any thread."""
+
+    def __init__(self, label=""):
+        self.label = label
+        self.started = time.perf_counter()
+        self.elapsed = None
+        self.stages = {}
+        self._lock = threading.Lock()
+
+    def add(self, name, seconds):
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def finish(self):
+        self.elapsed = time.perf_counter() - self.started
+        return self
+
+    def summary(self):
+        """One status-bar line, e.g. "mongo 12 ms | graph.layout 40 ms | total 95 ms"."""
+        with self._lock:
+            parts = [f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.stages.items()]
+        if self.elapsed is not None:
+            parts.append(f"total {self.elapsed * 1000:.0f} ms")
+        return " | ".join(parts)
+
+
+class Span:
+    __slots__ = ("name", "trace", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.trace = getattr(_local, "trace", None)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.start
+        record(self.name, seconds)
+        if self.trace is not None:
+            self.trace.add(self.name, seconds)
+        return False
+
+
+class NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+
+def span(name):
+    """Context manager timing one stage; a shared no-op while timing is disabled."""
+    return Span(name) if _enabled else NULL_SPAN
+
+
+class use_trace:
+    """Make ``trace`` the current thread's trace inside a with block."""
+
+    def __init__(self, trace):
+        self.trace = trace
+
+    def __enter__(self):
+        self.previous = getattr(_local, "trace", None)
+        _local.trace = self.trace
+        return self.trace
+
+    def __exit__(self, *exc):
+        _local.trace = self.previous
+        return False
+
+
+def traced(trace, name, function):
+    """Wrap ``function`` to run under ``trace`` on whatever thread calls it, timed as ``name``."""
+    def run(*args, **kwargs):
+        with use_trace(trace), span(name):
+            return function(*args, **kwargs)
+    return run
+
+
+def percentiles():
+    """{stage: {"count", "p50", "p95", "p99"}} over each stage's rolling window."""
+    with _lock:
+        windows = {name: np.fromiter(window, dtype=np.float64) for name, window in _samples.items()}
+    result = {}
+    for name, values in sorted(windows.items()):
+        quantiles = np.quantile(values, QUANTILES)
+        result[name] = {"count": len(values),
+                        **{f"p{round(q * 100)}": float(v) for q, v in zip(QUANTILES, quantiles)}}
+    return result
+
+
+def prometheus_text():
+    """Rolling quantiles and lifetime count/sum per stage in the Prometheus text format."""
+    rolling = percentiles()
+    with _lock:
+        totals = {name: tuple(values) for name, values in _totals.items()}
+    lines = [f"# HELP {METRIC} Duration of GUI search and drawing stages "
+             f"(quantiles over the last {WINDOW} samples).",
+             f"# TYPE {METRIC} summary"]
+    for name, stats in rolling.items():
+        for q in QUANTILES:
+            lines.append(f'{METRIC}{{stage="{name}",quantile="{q}"}} {stats[f"p{round(q * 100)}"]:.6f}')
+        count, total = totals[name]
+        lines.append(f'{METRIC}_sum{{stage="{name}"}} {total:.6f}')
+        lines.append(f'{METRIC}_count{{stage="{name}"}} {count}')
+    return "\n".join(lines) + "\n"
+
+
+def rotate(log_path, max_bytes=MAX_LOG_BYTES):
+    """Move a log of ``max_bytes`` or more aside to ``<log_path>.1``."""
+    try:
+        if os.path.getsize(log_path) >= max_bytes:
+            os.replace(log_path, log_path + ".1")
+    except OSError:
+        pass
+
+
+def export(trace=None, log_path=DEFAULT_LOG_PATH, metrics_path=DEFAULT_METRICS_PATH,
+           max_log_bytes=MAX_LOG_BYTES):
+    """Append a JSON line for ``trace`` and rewrite the Prometheus file; no-op while disabled."""
+    if not _enabled:
+        return
+    for path in filter(None, (log_path, metrics_path)):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if log_path:
+        line = {"time": time.time(), "rolling": percentiles()}
+        if trace is not None:
+            line.update(label=trace.label, total=trace.elapsed, stages=trace.stages)
+        rotate(log_path, max_log_bytes)
+        with open(log_path, "a") as file:
+            file.write(json.dumps(line) + "\n")
+    if metrics_path:
+        # Write then rename, so a scraper never reads a half-written file
+        with open(metrics_path + ".tmp", "w") as file:
+            file.write(prometheus_text())
+        os.replace(metrics_path + ".tmp", metrics_path)